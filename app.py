@@ -1,22 +1,39 @@
 """
 Flask Web Application for Student Database Management System
 """
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, Response, render_template, request, jsonify, send_file, session
 from flask_cors import CORS
 from config.database import db
-from models.student import Student
+from models.student import Student, DuplicateRollNoError
 from models.marks import Marks
-from utils.export import export_to_excel, export_to_pdf
+from models.version import data_version
+from models.events import change_feed, format_sse
+from models.patch import StudentPatch
+from models.stats import ClassStats
+from utils.export_jobs import export_jobs, ExportQueueFull, NO_DATA
+from utils.importer import read_import_file, validate_import_frame, detect_format
+from operations.bulk_ops import bulk_import, DEFAULT_BATCH_SIZE
+from utils import metrics
+from utils.http_cache import conditional
 import os
-from datetime import datetime
+import time
 from functools import wraps
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 CORS(app)
+metrics.init_app(app)
 
-# Ensure exports directory exists
-os.makedirs("exports", exist_ok=True)
+# Keyset pagination limits for list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Seconds between keep-alive comments on idle event streams, the reconnect
+# delay (milliseconds) suggested to EventSource clients, and how often an
+# idle stream checks the data version for writes made by other processes
+EVENTS_HEARTBEAT_SECONDS = 15
+EVENTS_RETRY_MS = 3000
+EVENTS_POLL_SECONDS = 1
 
 
 def login_required(f):
@@ -29,6 +46,14 @@ def login_required(f):
     return decorated_function
 
 
+def page_args():
+    """Read keyset pagination arguments (limit, after) from the query string"""
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    after = request.args.get('after', type=int)
+    return limit, after
+
+
 @app.route('/')
 def index():
     """Home page"""
@@ -39,27 +64,41 @@ def index():
 def check_connection():
     """Check database connection"""
     if db.is_connected():
-        return jsonify({'success': True, 'message': 'Connected to Supabase'})
+        return jsonify({'success': True, 'message': f'Connected to {db.backend_name} database',
+                        'backend': db.backend_name})
     return jsonify({'success': False, 'message': 'Database connection failed'}), 500
 
 
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Get hit/miss counters of the per-rollno lookup caches"""
+    return jsonify({
+        'success': True,
+        'students': Student.cache_stats(),
+        'marks': Marks.cache_stats()
+    })
+
+
 @app.route('/api/students', methods=['GET'])
+@conditional
 def get_students():
-    """Get all students"""
+    """Get a page of students"""
     try:
-        students = Student.get_all()
-        return jsonify({'success': True, 'data': students})
+        limit, after = page_args()
+        students, next_cursor = Student.fetch_page(limit, after, Student.PUBLIC_COLUMNS)
+        return jsonify({'success': True, 'data': students, 'next_cursor': next_cursor})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
 @app.route('/api/students/<int:rollno>', methods=['GET'])
+@conditional
 def get_student(rollno):
     """Get student by roll number"""
     try:
-        student = Student.get_by_rollno(rollno)
+        student = Student.fetch_by_rollno(rollno, Student.PUBLIC_COLUMNS)
         if student:
-            marks = Marks.get_by_rollno(rollno)
+            marks = Marks.fetch_by_rollno(rollno, Marks.MARK_COLUMNS)
             return jsonify({'success': True, 'student': student, 'marks': marks})
         return jsonify({'success': False, 'message': 'Student not found'}), 404
     except Exception as e:
@@ -72,33 +111,51 @@ def add_student():
     try:
         data = request.json
         
-        # Create student
-        student_created = Student.create(
+        # Create student and marks in one transaction
+        created = Student.create_with_marks(
             data['rollno'],
             data['name'],
             data['father'],
-            data['password']
+            data['password'],
+            float(data['dsp']),
+            float(data['iot']),
+            float(data['android']),
+            float(data['compiler']),
+            float(data['minor'])
         )
         
-        if student_created:
-            # Create marks
-            marks_created = Marks.create(
-                data['rollno'],
-                float(data['dsp']),
-                float(data['iot']),
-                float(data['android']),
-                float(data['compiler']),
-                float(data['minor'])
-            )
-            
-            if marks_created:
-                return jsonify({'success': True, 'message': 'Student added successfully'})
-            else:
-                # Rollback student creation
-                Student.delete(data['rollno'])
-                return jsonify({'success': False, 'message': 'Failed to add marks'}), 500
-        
+        if created:
+            return jsonify({'success': True, 'message': 'Student added successfully'})
         return jsonify({'success': False, 'message': 'Failed to add student'}), 500
+    except DuplicateRollNoError:
+        return jsonify({'success': False, 'message': 'Student with this roll number already exists'}), 409
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/students/bulk', methods=['POST'])
+def bulk_add_students():
+    """Bulk import students and marks from an uploaded CSV/XLSX/JSON file or a JSON array"""
+    try:
+        batch_size = request.args.get('batch_size', DEFAULT_BATCH_SIZE, type=int)
+        
+        if 'file' in request.files:
+            upload = request.files['file']
+            frame = read_import_file(upload.stream, detect_format(upload.filename))
+        else:
+            payload = request.get_json(silent=True)
+            if isinstance(payload, dict):
+                payload = payload.get('students')
+            if not isinstance(payload, list):
+                return jsonify({'success': False, 'message': 'Upload a file or send a JSON array of students'}), 400
+            import pandas as pd
+            frame = pd.DataFrame(payload)
+        
+        records, errors = validate_import_frame(frame)
+        report = bulk_import(records, errors, batch_size)
+        return jsonify({'success': True, **report})
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -141,24 +198,28 @@ def update_student(rollno):
         if data.get('password') and data['password'] != student['password']:
             return jsonify({'success': False, 'message': 'Password verification failed'}), 401
         
-        # Update student info
-        if 'new_name' in data:
-            Student.update(rollno, name=data['new_name'])
-        if 'new_father' in data:
-            Student.update(rollno, father=data['new_father'])
-        if 'new_password' in data:
-            Student.update(rollno, password=data['new_password'])
-        
-        # Update marks
-        marks_update = {}
-        for subject in ['dsp', 'iot', 'android', 'compiler', 'minor']:
+        # Collect every change and write them in one transaction
+        patch = StudentPatch(rollno)
+        if data.get('new_name') and data['new_name'].upper() != student['name']:
+            patch.set(name=data['new_name'])
+        if data.get('new_father') and data['new_father'].upper() != student['father']:
+            patch.set(father=data['new_father'])
+        if data.get('new_password') and data['new_password'] != student['password']:
+            patch.set(password=data['new_password'])
+        
+        for subject in Marks.SUBJECTS:
             if subject in data:
-                marks_update[subject] = float(data[subject])
+                patch.set(**{subject: float(data[subject])})
+        
+        if not patch.pending:
+            return jsonify({'success': True, 'message': 'Nothing to update'})
         
-        if marks_update:
-            Marks.update(rollno, **marks_update)
+        updated = patch.flush()
+        if not updated:
+            return jsonify({'success': False, 'message': 'Update failed'}), 500
         
-        return jsonify({'success': True, 'message': 'Updated successfully'})
+        updated.pop('password', None)
+        return jsonify({'success': True, 'message': 'Updated successfully', 'data': updated})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -179,10 +240,9 @@ def delete_student(rollno):
         if not verified:
             return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
         
-        # Delete marks first (foreign key)
-        Marks.delete(rollno)
-        # Delete student
-        Student.delete(rollno)
+        # The marks row is removed by the foreign key cascade
+        if not Student.delete(rollno):
+            return jsonify({'success': False, 'message': 'Failed to delete student'}), 500
         
         return jsonify({'success': True, 'message': 'Student deleted successfully'})
     except Exception as e:
@@ -190,28 +250,113 @@ def delete_student(rollno):
 
 
 @app.route('/api/full-details', methods=['GET'])
+@conditional
 def get_full_details():
-    """Get combined student and marks data"""
+    """Get a page of combined student and marks data"""
+    try:
+        limit, after = page_args()
+        data, next_cursor = Marks.fetch_full_details_page(limit, after, Marks.DETAIL_COLUMNS)
+        return jsonify({'success': True, 'data': data, 'next_cursor': next_cursor})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """Server-Sent Events stream of row-level changes
+
+    Each stream holds a server thread; the ASGI app serves this route on its
+    event loop instead.
+    """
+    def generate():
+        with change_feed.subscribe() as subscription:
+            yield f"retry: {EVENTS_RETRY_MS}\n\n"
+            last_sent = time.monotonic()
+            while True:
+                subscription.wait(EVENTS_POLL_SECONDS)
+                # Writes from other processes are published by the version read
+                data_version.sync()
+                events = subscription.drain()
+                for event in events:
+                    yield format_sse(event)
+                if events:
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= EVENTS_HEARTBEAT_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/search', methods=['GET'])
+@conditional
+def search_students():
+    """Search students by roll number, name or father's name"""
     try:
-        data = Marks.get_full_details()
-        return jsonify({'success': True, 'data': data})
+        field = request.args.get('field', 'name')
+        query = request.args.get('q', '').strip()
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+
+        if field == 'rollno':
+            rollnos = [int(query)] if query.isdigit() else []
+            total = None
+        elif field in ('name', 'father'):
+            rollnos, total = Student.search(query, field, (page - 1) * per_page, per_page)
+        else:
+            return jsonify({'success': False, 'message': 'Invalid search field'}), 400
+
+        # Fetch only the rows on this page, preserving the ranked order
+        students = {s['rollno']: s for s in Student.fetch_by_rollnos(rollnos, Student.PUBLIC_COLUMNS)}
+        marks = {m['rollno']: m for m in Marks.fetch_by_rollnos(rollnos, Marks.MARK_COLUMNS)}
+        data = [
+            {**students[r], **marks[r]}
+            for r in rollnos if r in students and r in marks
+        ]
+        if total is None:
+            total = len(data)
+
+        return jsonify({
+            'success': True,
+            'data': data,
+            'total': total,
+            'page': page,
+            'per_page': per_page
+        })
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+def submit_export(fmt):
+    """Queue an export of the current data (done at once if it is cached)"""
+    return export_jobs.submit(
+        fmt,
+        lambda: Marks.iter_full_details(columns=Marks.DETAIL_COLUMNS),
+        data_version.token
+    )
+
+
+def send_export(fmt):
+    """Serve an export of the current data, waiting for the export pool on a cache miss"""
+    try:
+        job = submit_export(fmt)
+    except ExportQueueFull as e:
+        return jsonify({'success': False, 'message': str(e)}), 429
+    
+    job.wait()
+    if job.error == NO_DATA:
+        return jsonify({'success': False, 'message': job.error}), 404
+    if not job.ready:
+        return jsonify({'success': False, 'message': job.error or f'Export is {job.status}'}), 500
+    return send_file(os.path.abspath(job.filepath), as_attachment=True, download_name=job.filename)
+
+
 @app.route('/api/export/excel', methods=['GET'])
 def export_excel():
     """Export to Excel"""
     try:
-        data = Marks.get_full_details()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Student_Report_{timestamp}.xlsx"
-        
-        if export_to_excel(data, filename):
-            filepath = os.path.join("exports", filename)
-            return send_file(filepath, as_attachment=True)
-        
-        return jsonify({'success': False, 'message': 'Export failed'}), 500
+        return send_export('excel')
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -220,25 +365,93 @@ def export_excel():
 def export_pdf():
     """Export to PDF"""
     try:
-        data = Marks.get_full_details()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Student_Report_{timestamp}.pdf"
-        
-        if export_to_pdf(data, filename):
-            filepath = os.path.join("exports", filename)
-            return send_file(filepath, as_attachment=True)
+        return send_export('pdf')
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/exports', methods=['POST'])
+def create_export():
+    """Queue a background export job"""
+    try:
+        data = request.get_json(silent=True) or {}
+        job = submit_export(data.get('format', 'excel'))
+        return jsonify({'success': True, 'job': job.to_dict()}), 202
+    except ExportQueueFull as e:
+        return jsonify({'success': False, 'message': str(e)}), 429
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/exports/<job_id>', methods=['GET'])
+def get_export(job_id):
+    """Get the status and progress of an export job"""
+    job = export_jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Export job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+
+@app.route('/api/exports/<job_id>/download', methods=['GET'])
+def download_export(job_id):
+    """Download the file of a finished export job"""
+    job = export_jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Export job not found'}), 404
+    if job.status == 'done' and not job.ready:
+        return jsonify({'success': False, 'message': 'Export file has expired, please export again'}), 410
+    if not job.ready:
+        return jsonify({'success': False, 'message': f'Export is {job.status}'}), 409
+    return send_file(os.path.abspath(job.filepath), as_attachment=True, download_name=job.filename)
+
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Get per-subject and overall marks statistics"""
+    stats = ClassStats.get()
+    if stats is None:
+        return jsonify({'success': False, 'message': 'Error computing statistics'}), 500
+    return jsonify({'success': True, 'data': stats})
+
+
+@app.route('/api/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Get the top students by one subject or by total marks"""
+    try:
+        subject = request.args.get('subject', 'total').strip().lower()
+        limit = min(max(int(request.args.get('limit', 10)), 1), MAX_PAGE_SIZE)
+        offset = max(int(request.args.get('offset', 0)), 0)
         
-        return jsonify({'success': False, 'message': 'Export failed'}), 500
+        leaders = Marks.leaderboard(subject, limit, offset)
+        return jsonify({'success': True, 'subject': subject, 'data': leaders})
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/students/<int:rollno>/rank', methods=['GET'])
+def get_student_rank(rollno):
+    """Get a student's rank and percentile per subject and overall"""
+    try:
+        ranks = Marks.rank(rollno)
+        if ranks is None:
+            return jsonify({'success': False, 'message': 'Marks not found'}), 404
+        return jsonify({'success': True, 'rollno': rollno, 'data': ranks})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
 @app.route('/api/marks', methods=['GET'])
+@conditional
 def get_marks():
-    """Get all marks"""
+    """Get a page of marks"""
     try:
-        marks = Marks.get_all()
-        return jsonify({'success': True, 'data': marks})
+        limit, after = page_args()
+        marks, next_cursor = Marks.fetch_page(limit, after, Marks.MARK_COLUMNS)
+        return jsonify({'success': True, 'data': marks, 'next_cursor': next_cursor})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
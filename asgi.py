@@ -0,0 +1,225 @@
+"""
+ASGI entry point with async read routes
+
+Run with:
+    uvicorn asgi:app
+
+The hot read routes are served natively on the event loop and issue their
+independent queries concurrently, so one process can hold many slow
+requests in flight without a thread each. Every other route (writes,
+login, exports, the web UI) falls through to the Flask app from app.py.
+
+Several workers can share a database: each catches up on writes made by
+the others through the data version (see models/version.py).
+"""
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from functools import wraps
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+from app import (app as flask_app, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+                 EVENTS_HEARTBEAT_SECONDS, EVENTS_RETRY_MS, EVENTS_POLL_SECONDS)
+from config.database import adb
+from models import aio, Student, Marks
+from models.version import data_version
+from models.events import change_feed, format_sse
+from utils import http_cache, metrics
+
+# Threads available to the mounted Flask app
+WSGI_WORKERS = 10
+
+
+def native(path, endpoint, methods):
+    """Route served on the event loop, timed under the Flask app's rule syntax"""
+    rule = re.sub(r"\{(\w+):(\w+)\}", r"<\2:\1>", path)
+
+    @wraps(endpoint)
+    async def timed(request):
+        started = time.perf_counter()
+        response = await endpoint(request)
+        metrics.observe_request(request.method, rule, response.status_code, time.perf_counter() - started)
+        return response
+    return Route(path, timed, methods=methods)
+
+
+def error(message, status):
+    return JSONResponse({'success': False, 'message': message}, status_code=status)
+
+
+def conditional(endpoint):
+    """Async counterpart of utils.http_cache.conditional for native routes"""
+    @wraps(endpoint)
+    async def wrapper(request):
+        token, modified = (await asyncio.to_thread(data_version.current) if data_version.stale
+                           else data_version.snapshot())
+        encoding = http_cache.choose_encoding(request.headers.get('accept-encoding'))
+
+        headers = http_cache.revalidate(request.headers.get('if-none-match'),
+                                        request.headers.get('if-modified-since'),
+                                        token, modified, encoding)
+        if headers is not None:
+            return Response(status_code=304, headers=headers)
+
+        response = await endpoint(request)
+        if response.status_code != 200:
+            return response
+
+        body, encoding = http_cache.encode(response.body, encoding)
+        if encoding:
+            response.body = body
+            response.headers['content-length'] = str(len(body))
+            response.headers['content-encoding'] = encoding
+        response.headers.update(http_cache.cache_headers(token, modified, encoding))
+        return response
+    return wrapper
+
+
+def page_args(request):
+    """Read keyset pagination arguments (limit, after) from the query string"""
+    params = request.query_params
+    limit = int(params.get('limit', DEFAULT_PAGE_SIZE))
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    after = int(params['after']) if params.get('after') else None
+    return limit, after
+
+
+@conditional
+async def get_students(request):
+    """Get a page of students"""
+    try:
+        limit, after = page_args(request)
+        students, next_cursor = await aio.get_page('students', limit, after, Student.PUBLIC_COLUMNS)
+        return JSONResponse({'success': True, 'data': students, 'next_cursor': next_cursor})
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@conditional
+async def get_student(request):
+    """Get student by roll number, fetching their marks at the same time"""
+    try:
+        student, marks = await aio.get_student_with_marks(request.path_params['rollno'])
+        if student:
+            return JSONResponse({'success': True, 'student': student, 'marks': marks})
+        return error('Student not found', 404)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@conditional
+async def get_full_details(request):
+    """Get a page of combined student and marks data"""
+    try:
+        limit, after = page_args(request)
+        data, next_cursor = await aio.get_full_details_page(limit, after)
+        return JSONResponse({'success': True, 'data': data, 'next_cursor': next_cursor})
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@conditional
+async def get_marks(request):
+    """Get a page of marks"""
+    try:
+        limit, after = page_args(request)
+        marks, next_cursor = await aio.get_page('marks', limit, after, Marks.MARK_COLUMNS)
+        return JSONResponse({'success': True, 'data': marks, 'next_cursor': next_cursor})
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@conditional
+async def search_students(request):
+    """Search students by roll number, name or father's name"""
+    try:
+        params = request.query_params
+        field = params.get('field', 'name')
+        query = params.get('q', '').strip()
+        page = max(int(params.get('page', 1)), 1)
+        per_page = min(max(int(params.get('per_page', 20)), 1), 100)
+
+        if field == 'rollno':
+            rollnos = [int(query)] if query.isdigit() else []
+            total = None
+        elif field in ('name', 'father'):
+            rollnos, total = await aio.search(query, field, (page - 1) * per_page, per_page)
+        else:
+            return error('Invalid search field', 400)
+
+        data = await aio.get_search_rows(rollnos)
+        if total is None:
+            total = len(data)
+
+        return JSONResponse({
+            'success': True,
+            'data': data,
+            'total': total,
+            'page': page,
+            'per_page': per_page
+        })
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+async def stream_events(request):
+    """Server-Sent Events stream of row-level changes, without a thread per client"""
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+
+    async def generate():
+        with change_feed.subscribe(lambda: loop.call_soon_threadsafe(wake.set)) as subscription:
+            yield f"retry: {EVENTS_RETRY_MS}\n\n"
+            last_sent = loop.time()
+            while True:
+                try:
+                    await asyncio.wait_for(wake.wait(), EVENTS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                wake.clear()
+                # Writes from other processes are published by the version read
+                await aio.sync_version()
+                events = subscription.drain()
+                for event in events:
+                    yield format_sse(event)
+                if events:
+                    last_sent = loop.time()
+                elif loop.time() - last_sent >= EVENTS_HEARTBEAT_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = loop.time()
+
+    return StreamingResponse(generate(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await adb.close()
+
+
+app = Starlette(
+    routes=[
+        native('/api/students', get_students, methods=['GET']),
+        native('/api/students/{rollno:int}', get_student, methods=['GET']),
+        native('/api/full-details', get_full_details, methods=['GET']),
+        native('/api/marks', get_marks, methods=['GET']),
+        native('/api/search', search_students, methods=['GET']),
+        native('/api/events', stream_events, methods=['GET']),
+        # Everything else, including other methods on the paths above
+        Mount('/', app=WSGIMiddleware(flask_app, workers=WSGI_WORKERS))
+    ],
+    lifespan=lifespan
+)
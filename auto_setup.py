@@ -38,6 +38,125 @@ def create_tables_automatically():
         );
         """
         
+        create_functions = """
+        -- Atomic student + marks creation (one round trip, one transaction)
+        CREATE OR REPLACE FUNCTION create_student_with_marks(
+            p_rollno INTEGER,
+            p_name VARCHAR,
+            p_father VARCHAR,
+            p_password VARCHAR,
+            p_dsp DECIMAL,
+            p_iot DECIMAL,
+            p_android DECIMAL,
+            p_compiler DECIMAL,
+            p_minor DECIMAL
+        ) RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO students (rollno, name, father, password)
+            VALUES (p_rollno, p_name, p_father, p_password);
+
+            INSERT INTO marks (rollno, dsp, iot, android, compiler, minor)
+            VALUES (p_rollno, p_dsp, p_iot, p_android, p_compiler, p_minor);
+        END;
+        $$ LANGUAGE plpgsql;
+        
+        -- Atomic multi-row student + marks creation for bulk imports
+        CREATE OR REPLACE FUNCTION create_students_with_marks(
+            p_rows JSONB
+        ) RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO students (rollno, name, father, password)
+            SELECT r.rollno, r.name, r.father, r.password
+            FROM jsonb_to_recordset(p_rows)
+                AS r(rollno INTEGER, name VARCHAR, father VARCHAR, password VARCHAR);
+
+            INSERT INTO marks (rollno, dsp, iot, android, compiler, minor)
+            SELECT r.rollno, r.dsp, r.iot, r.android, r.compiler, r.minor
+            FROM jsonb_to_recordset(p_rows)
+                AS r(rollno INTEGER, dsp DECIMAL, iot DECIMAL, android DECIMAL, compiler DECIMAL, minor DECIMAL);
+        END;
+        $$ LANGUAGE plpgsql;
+        
+        -- Coalesced student + marks update (one round trip, one transaction)
+        CREATE OR REPLACE FUNCTION update_student_with_marks(
+            p_rollno INTEGER,
+            p_student JSONB,
+            p_marks JSONB
+        ) RETURNS JSON AS $$
+        DECLARE
+            result JSON;
+        BEGIN
+            IF p_student <> '{}'::JSONB THEN
+                UPDATE students SET
+                    name = COALESCE(p_student->>'name', name),
+                    father = COALESCE(p_student->>'father', father),
+                    password = COALESCE(p_student->>'password', password)
+                WHERE rollno = p_rollno;
+            END IF;
+
+            IF p_marks <> '{}'::JSONB THEN
+                UPDATE marks SET
+                    dsp = COALESCE((p_marks->>'dsp')::DECIMAL, dsp),
+                    iot = COALESCE((p_marks->>'iot')::DECIMAL, iot),
+                    android = COALESCE((p_marks->>'android')::DECIMAL, android),
+                    compiler = COALESCE((p_marks->>'compiler')::DECIMAL, compiler),
+                    minor = COALESCE((p_marks->>'minor')::DECIMAL, minor),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE rollno = p_rollno;
+            END IF;
+
+            SELECT row_to_json(t) INTO result FROM (
+                SELECT s.rollno, s.name, s.father, s.password,
+                       m.dsp, m.iot, m.android, m.compiler, m.minor
+                FROM students s LEFT JOIN marks m ON m.rollno = s.rollno
+                WHERE s.rollno = p_rollno
+            ) t;
+            RETURN result;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+        
+        create_data_version = """
+        -- Data version bumped by every row written to students or marks, plus a
+        -- log of the roll numbers written so each app process can catch up
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            epoch BIGINT NOT NULL DEFAULT (random() * 1e15)::BIGINT,
+            version BIGINT NOT NULL DEFAULT 0
+        );
+        INSERT INTO data_version (id) VALUES (1) ON CONFLICT DO NOTHING;
+
+        CREATE TABLE IF NOT EXISTS data_changes (
+            version BIGINT PRIMARY KEY,
+            rollno INTEGER NOT NULL
+        );
+
+        -- The row lock on data_version orders versions by commit, so a reader
+        -- never sees a version before the changes logged under it
+        CREATE OR REPLACE FUNCTION record_data_change() RETURNS TRIGGER AS $$
+        DECLARE
+            new_version BIGINT;
+        BEGIN
+            UPDATE data_version SET version = version + 1 WHERE id = 1
+            RETURNING version INTO new_version;
+
+            INSERT INTO data_changes (version, rollno)
+            VALUES (new_version, CASE WHEN TG_OP = 'DELETE' THEN OLD.rollno ELSE NEW.rollno END);
+
+            DELETE FROM data_changes WHERE version <= new_version - 10000;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER;
+
+        DROP TRIGGER IF EXISTS students_changed ON students;
+        CREATE TRIGGER students_changed AFTER INSERT OR UPDATE OR DELETE ON students
+            FOR EACH ROW EXECUTE FUNCTION record_data_change();
+
+        DROP TRIGGER IF EXISTS marks_changed ON marks;
+        CREATE TRIGGER marks_changed AFTER INSERT OR UPDATE OR DELETE ON marks
+            FOR EACH ROW EXECUTE FUNCTION record_data_change();
+        """
+        
         print("Creating 'students' table...")
         db.client.rpc('exec_sql', {'query': create_students_table}).execute()
         print("✅ Students table created")
@@ -46,6 +165,14 @@ def create_tables_automatically():
         db.client.rpc('exec_sql', {'query': create_marks_table}).execute()
         print("✅ Marks table created")
         
+        print("Creating database functions...")
+        db.client.rpc('exec_sql', {'query': create_functions}).execute()
+        print("✅ Database functions created")
+        
+        print("Creating data version tracking...")
+        db.client.rpc('exec_sql', {'query': create_data_version}).execute()
+        print("✅ Data version tracking created")
+        
         print_separator()
         print("\n✅ Database setup complete!")
         print("✅ You can now run main.py to use the application")
@@ -57,6 +184,8 @@ def create_tables_automatically():
         print_separator()
         print(create_students_table)
         print(create_marks_table)
+        print(create_functions)
+        print(create_data_version)
         print_separator()
         print("\nSteps:")
         print("1. Go to https://supabase.com/dashboard")
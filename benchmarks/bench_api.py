@@ -0,0 +1,161 @@
+"""
+End-to-end benchmark of the Flask API against an in-process PostgREST fake
+
+Usage:
+    python benchmarks/bench_api.py [--sizes 1000 10000 100000] [--requests 200]
+                                   [--latency-ms 0] [--exports]
+
+For each class size app.py runs in a fresh interpreter with its database
+swapped for benchmarks/fake_postgrest.FakePostgREST, seeded with synthetic
+students. Every route is driven through the Flask test client and timed
+per request; the fake counts database round trips. --latency-ms adds a
+delay to each round trip to model the network. Exports are rendered once
+cold (cache miss) and then served from the export cache.
+
+Results are printed as JSON so runs from different commits can be diffed.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAGE_SIZE = 100
+
+
+def summarize(latencies, round_trips, statuses):
+    """Turn per-request measurements into summary figures"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    total = sum(ordered)
+    return {
+        "requests": count,
+        "mean_ms": round(total / count * 1000, 3),
+        "p50_ms": round(ordered[count // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(int(count * 0.95), count - 1)] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "requests_per_second": round(count / total, 1) if total else None,
+        "round_trips_per_request": round(round_trips / count, 2),
+        "errors": sum(1 for s in statuses if s >= 400)
+    }
+
+
+def drive(client, fake, requests):
+    """Send each (method, url, json) request, timing it and counting round trips"""
+    latencies = []
+    statuses = []
+    before = fake.round_trips
+    for method, url, body in requests:
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        response.get_data()
+        latencies.append(time.perf_counter() - started)
+        statuses.append(response.status_code)
+    return summarize(latencies, fake.round_trips - before, statuses)
+
+
+def run_size(size, count, latency_ms, exports):
+    """Benchmark every route against one seeded dataset (runs in a child process)"""
+    from benchmarks.fake_postgrest import FakePostgREST, SUBJECTS
+    from config.database import db
+    from utils.export_cache import export_cache
+
+    fake = FakePostgREST(latency_ms)
+    fake.seed(size)
+    db._backend = fake
+    export_cache.directory = tempfile.mkdtemp(prefix="bench_exports_")
+
+    from app import app
+    app.config["TESTING"] = True
+    client = app.test_client()
+
+    rng = random.Random(size)
+    existing = lambda: rng.randint(1, size)
+    new_rollnos = list(range(size + 1, size + 1 + count))
+
+    def list_pages():
+        cursors = [None] + [rng.randrange(0, max(size - PAGE_SIZE, 1)) for _ in range(count - 1)]
+        return [f"?limit={PAGE_SIZE}" + (f"&after={c}" if c is not None else "") for c in cursors]
+
+    routes = {}
+    routes["list"] = drive(client, fake, [
+        ("GET", "/api/students" + q, None) for q in list_pages()
+    ])
+    routes["get"] = drive(client, fake, [
+        ("GET", f"/api/students/{existing()}", None) for _ in range(count)
+    ])
+    routes["verify"] = drive(client, fake, [
+        ("POST", "/api/students/verify", {"rollno": r, "name": f"STUDENT {r}", "password": f"pw{r}"})
+        for r in (existing() for _ in range(count))
+    ])
+    routes["search"] = drive(client, fake, [
+        ("GET", f"/api/search?field=name&q=STUDENT {existing()}", None) for _ in range(count)
+    ])
+    routes["full_details"] = drive(client, fake, [
+        ("GET", "/api/full-details" + q, None) for q in list_pages()
+    ])
+    routes["create"] = drive(client, fake, [
+        ("POST", "/api/students", {"rollno": r, "name": f"new {r}", "father": f"father {r}",
+                                   "password": f"pw{r}", **{s: 55 for s in SUBJECTS}})
+        for r in new_rollnos
+    ])
+    routes["update"] = drive(client, fake, [
+        ("PUT", f"/api/students/{r}", {"name": f"STUDENT {r}", "password": f"pw{r}",
+                                       "new_father": f"FATHER {r} JR", "dsp": rng.randint(0, 100)})
+        for r in (existing() for _ in range(count))
+    ])
+    routes["delete"] = drive(client, fake, [
+        ("DELETE", f"/api/students/{r}", {"name": f"new {r}", "password": f"pw{r}"})
+        for r in new_rollnos
+    ])
+    routes["stats"] = drive(client, fake, [("GET", "/api/stats", None)] * count)
+    routes["leaderboard"] = drive(client, fake, [("GET", "/api/leaderboard?limit=10", None)] * count)
+
+    if exports:
+        for fmt in ("excel", "pdf"):
+            # A fresh cache directory makes the first request a cold render
+            export_cache.directory = tempfile.mkdtemp(prefix="bench_exports_")
+            routes[f"export_{fmt}_cold"] = drive(client, fake, [("GET", f"/api/export/{fmt}", None)])
+            routes[f"export_{fmt}_cached"] = drive(client, fake, [("GET", f"/api/export/{fmt}", None)] * 10)
+
+    return {"students": size, "latency_ms": latency_ms, "routes": routes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated delay per round trip")
+    parser.add_argument("--exports", action="store_true", help="also benchmark both export routes")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Keep the app's progress messages out of the JSON on stdout
+        stdout = sys.stdout
+        sys.stdout = sys.stderr
+        result = run_size(args.child, args.requests, args.latency_ms, args.exports)
+        stdout.write(json.dumps(result))
+        return
+
+    results = []
+    for size in args.sizes:
+        command = [sys.executable, os.path.abspath(__file__), "--child", str(size),
+                   "--requests", str(args.requests), "--latency-ms", str(args.latency_ms)]
+        if args.exports:
+            command.append("--exports")
+        output = subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True).stdout
+        results.append(json.loads(output))
+
+    print(json.dumps({"benchmark": "api", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Guard application startup cost with `python -X importtime`
+
+Usage:
+    python benchmarks/bench_import_time.py [--max-ratio 10] [--budget-ms MS] [--runs 3]
+
+Each entry module is imported in a fresh interpreter a few times and the
+fastest cumulative import time is kept. The budget is relative: a module
+fails when it takes more than --max-ratio times as long as a stdlib
+baseline import (http.client) timed the same way, so a slow or busy CI
+machine does not fail the check. --budget-ms adds an absolute ceiling on
+top for machines known to be steady. The script also checks that heavy
+libraries (pandas, NumPy, ReportLab, openpyxl, matplotlib, the Supabase
+client) are not loaded at startup. Results are printed as JSON and the
+exit status is 1 when any module is over budget or imports a heavy library,
+so it can run as a CI step.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_MODULES = ["main", "app", "setup_database", "operations.student_ops"]
+HEAVY_MODULES = ["pandas", "numpy", "reportlab", "openpyxl", "matplotlib", "supabase"]
+BASELINE_MODULE = "http.client"
+
+
+def import_profile(module: str) -> dict:
+    """Import a module in a fresh interpreter and parse the -X importtime log"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative[parts[2].strip()] = int(parts[1])
+        except ValueError:
+            continue  # header line
+    return cumulative
+
+
+def measure(module: str, runs: int) -> dict:
+    """Return the fastest cumulative import time and any heavy modules loaded"""
+    best = None
+    loaded = set()
+    for _ in range(runs):
+        profile = import_profile(module)
+        best = profile[module] if best is None else min(best, profile[module])
+        loaded |= {name.split(".")[0] for name in profile} & set(HEAVY_MODULES)
+    return {"ms": round(best / 1000, 1), "heavy_imports": sorted(loaded)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=ENTRY_MODULES)
+    parser.add_argument("--baseline", default=BASELINE_MODULE,
+                        help="stdlib module whose import time the budget is relative to")
+    parser.add_argument("--max-ratio", type=float, default=10.0,
+                        help="maximum import time as a multiple of the baseline import")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="optional absolute ceiling on cumulative import time per module")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    baseline_ms = measure(args.baseline, args.runs)["ms"]
+    results = {}
+    failed = False
+    for module in args.modules:
+        result = measure(module, args.runs)
+        result["ratio"] = round(result["ms"] / baseline_ms, 2)
+        within_budget = result["ratio"] <= args.max_ratio and (
+            args.budget_ms is None or result["ms"] <= args.budget_ms
+        )
+        result["ok"] = within_budget and not result["heavy_imports"]
+        failed |= not result["ok"]
+        results[module] = result
+
+    print(json.dumps({
+        "baseline": {"module": args.baseline, "ms": baseline_ms},
+        "max_ratio": args.max_ratio,
+        "budget_ms": args.budget_ms,
+        "modules": results
+    }, indent=2))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
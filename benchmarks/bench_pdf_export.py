@@ -0,0 +1,84 @@
+"""
+Benchmark PDF export build time and peak memory across class sizes
+
+Usage:
+    python benchmarks/bench_pdf_export.py [--sizes 1000 10000 100000] [--memory]
+
+Rows are synthesized by a generator, so the measurement covers only the
+PDF writer. Timing runs without tracing; --memory adds a second,
+tracemalloc-instrumented pass per size to record peak allocations.
+Results are printed as JSON.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.export import write_pdf
+
+
+def synthetic_rows(count: int):
+    """Yield combined student + marks records"""
+    for rollno in range(1, count + 1):
+        yield {
+            "rollno": rollno,
+            "name": f"STUDENT {rollno}",
+            "father": f"FATHER {rollno}",
+            "dsp": float(rollno % 101),
+            "iot": float((rollno * 7) % 101),
+            "android": float((rollno * 13) % 101),
+            "compiler": float((rollno * 17) % 101),
+            "minor": float((rollno * 23) % 101)
+        }
+
+
+def build(count: int, trace_memory: bool = False) -> dict:
+    """Build one PDF and return its timing (or peak memory) figures"""
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        rows = write_pdf(synthetic_rows(count), path)
+        elapsed = time.perf_counter() - started
+        result = {"rows": rows, "seconds": elapsed, "file_size": os.path.getsize(path)}
+        if trace_memory:
+            result["peak"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return result
+    finally:
+        os.remove(path)
+
+
+def run(count: int, measure_memory: bool) -> dict:
+    """Benchmark one class size"""
+    timed = build(count)
+    result = {
+        "rows": timed["rows"],
+        "seconds": round(timed["seconds"], 4),
+        "rows_per_second": round(timed["rows"] / timed["seconds"], 1),
+        "file_size_mb": round(timed["file_size"] / 1024 / 1024, 2)
+    }
+    if measure_memory:
+        result["peak_memory_mb"] = round(build(count, trace_memory=True)["peak"] / 1024 / 1024, 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--memory", action="store_true", help="also record peak traced memory")
+    args = parser.parse_args()
+
+    results = [run(count, args.memory) for count in args.sizes]
+    print(json.dumps({"benchmark": "pdf_export", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+In-process stand-in for the Supabase (PostgREST) table API
+
+FakePostgREST implements the storage backend interface over in-memory
+tables keyed by roll number, so app.py can be benchmarked without a
+network or a database. Every execute() counts as one round trip, and an
+optional per-call delay models network latency.
+"""
+import os
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.backends.base import BackendError, QueryResult, StorageBackend
+
+UNIQUE_VIOLATION = "23505"
+SUBJECTS = ("dsp", "iot", "android", "compiler", "minor")
+
+# Entries kept in the data_changes log, as the database triggers do
+CHANGE_LOG_SIZE = 10000
+
+
+class FakeTable:
+    """Rows keyed by one integer column (the roll number by default) with a
+    sorted key list for range scans"""
+
+    def __init__(self, key: str = "rollno"):
+        self.key = key
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.keys: List[int] = []
+        self.next_id = 1
+
+    def insert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        value = row[self.key]
+        if value in self.rows:
+            raise BackendError(f"duplicate key value violates unique constraint ({self.key}={value})",
+                               UNIQUE_VIOLATION)
+        row = dict(row)
+        row.setdefault("id", self.next_id)
+        self.next_id += 1
+        self.rows[value] = row
+        insort(self.keys, value)
+        return row
+
+    def remove(self, rollno: int):
+        del self.rows[rollno]
+        del self.keys[bisect_left(self.keys, rollno)]
+
+
+class FakeQuery:
+    """Query builder mirroring the PostgREST subset used by the models"""
+
+    def __init__(self, backend: "FakePostgREST", table: str):
+        self._backend = backend
+        self._name = table
+        self._table = backend.tables.setdefault(table, FakeTable())
+        self._op = "select"
+        self._columns: Optional[List[str]] = None
+        self._payload: Any = None
+        self._filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self._low = None
+        self._high = None
+        self._keys: Optional[List[int]] = None
+        self._order = None
+        self._limit: Optional[int] = None
+
+    def select(self, columns: str = "*") -> "FakeQuery":
+        self._op = "select"
+        if columns.strip() != "*":
+            self._columns = [c.strip() for c in columns.split(",")]
+        return self
+
+    def insert(self, rows) -> "FakeQuery":
+        self._op = "insert"
+        self._payload = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "FakeQuery":
+        self._op = "update"
+        self._payload = values
+        return self
+
+    def delete(self) -> "FakeQuery":
+        self._op = "delete"
+        return self
+
+    # Filters on the key column narrow the scan through the sorted keys; others filter rows
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        if column == self._table.key:
+            return self.in_(column, [value])
+        self._filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        if column == self._table.key:
+            self._low = (value, bisect_right)
+        else:
+            self._filters.append(lambda r: r.get(column) > value)
+        return self
+
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        if column == self._table.key:
+            self._low = (value, bisect_left)
+        else:
+            self._filters.append(lambda r: r.get(column) >= value)
+        return self
+
+    def lte(self, column: str, value: Any) -> "FakeQuery":
+        if column == self._table.key:
+            self._high = value
+        else:
+            self._filters.append(lambda r: r.get(column) <= value)
+        return self
+
+    def in_(self, column: str, values) -> "FakeQuery":
+        values = list(values)
+        if column == self._table.key:
+            self._keys = sorted(set(values) if self._keys is None else set(values) & set(self._keys))
+        else:
+            wanted = set(values)
+            self._filters.append(lambda r: r.get(column) in wanted)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "FakeQuery":
+        self._order = (column, desc)
+        return self
+
+    def limit(self, count: int) -> "FakeQuery":
+        self._limit = int(count)
+        return self
+
+    def _matches(self) -> List[Dict[str, Any]]:
+        table = self._table
+        if self._keys is not None:
+            keys = [k for k in self._keys if k in table.rows]
+        else:
+            start = self._low[1](table.keys, self._low[0]) if self._low else 0
+            end = bisect_right(table.keys, self._high) if self._high is not None else len(table.keys)
+            keys = table.keys[start:end]
+        if self._low and self._keys is not None:
+            keys = [k for k in keys if k > self._low[0] or (k == self._low[0] and self._low[1] is bisect_left)]
+        if self._high is not None and self._keys is not None:
+            keys = [k for k in keys if k <= self._high]
+
+        rows = []
+        ordered_by_key = self._order is None or (self._order == (table.key, False))
+        for key in keys:
+            row = table.rows[key]
+            if all(f(row) for f in self._filters):
+                rows.append(row)
+                # Keys are already in roll number order, so a limit can stop the scan
+                if ordered_by_key and self._limit is not None and len(rows) >= self._limit:
+                    break
+        if not ordered_by_key:
+            rows.sort(key=lambda r: r[self._order[0]], reverse=self._order[1])
+        return rows
+
+    def execute(self) -> QueryResult:
+        self._backend.round_trip()
+        table = self._table
+
+        if self._op == "insert":
+            for row in self._payload:
+                if row[table.key] in table.rows:
+                    raise BackendError("duplicate key value violates unique constraint", UNIQUE_VIOLATION)
+            rows = [dict(table.insert(row)) for row in self._payload]
+            self._backend.record_changes(self._name, rows)
+            return QueryResult(rows)
+
+        rows = self._matches()
+
+        if self._op == "select":
+            if self._limit is not None:
+                rows = rows[:self._limit]
+            if self._columns:
+                return QueryResult([{c: r.get(c) for c in self._columns} for r in rows])
+            return QueryResult([dict(r) for r in rows])
+
+        if self._op == "update":
+            for row in rows:
+                row.update(self._payload)
+            self._backend.record_changes(self._name, rows)
+            return QueryResult([dict(r) for r in rows])
+
+        for row in rows:
+            table.remove(row[table.key])
+        self._backend.record_changes(self._name, rows)
+        return QueryResult([dict(r) for r in rows])
+
+
+class FakeRPC:
+    """Deferred call to one of the fake database functions"""
+
+    def __init__(self, backend: "FakePostgREST", name: str, params: Dict[str, Any]):
+        self._backend = backend
+        self._function = getattr(backend, f"_rpc_{name}")
+        self._params = params
+
+    def execute(self) -> QueryResult:
+        self._backend.round_trip()
+        return QueryResult(self._function(**self._params))
+
+
+class FakePostgREST(StorageBackend):
+    """In-memory backend that counts round trips"""
+
+    name = "fake-postgrest"
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.tables: Dict[str, FakeTable] = {
+            "students": FakeTable(),
+            "marks": FakeTable(),
+            "data_version": FakeTable("id"),
+            "data_changes": FakeTable("version")
+        }
+        self.tables["data_version"].insert({"id": 1, "epoch": random.getrandbits(48), "version": 0})
+        self.latency = latency_ms / 1000
+        self.round_trips = 0
+
+    def record_changes(self, table: str, rows: List[Dict[str, Any]]):
+        """Bump the data version and log each row written, like the database triggers"""
+        if table not in ("students", "marks"):
+            return
+        state = self.tables["data_version"].rows[1]
+        changes = self.tables["data_changes"]
+        for row in rows:
+            state["version"] += 1
+            changes.insert({"version": state["version"], "rollno": row["rollno"]})
+        while changes.keys and changes.keys[0] <= state["version"] - CHANGE_LOG_SIZE:
+            changes.remove(changes.keys[0])
+
+    def round_trip(self):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> FakeRPC:
+        return FakeRPC(self, name, params)
+
+    def seed(self, count: int, start: int = 1):
+        """Add synthetic students (and their marks) without counting round trips"""
+        students = self.tables["students"]
+        marks = self.tables["marks"]
+        for rollno in range(start, start + count):
+            students.insert({
+                "rollno": rollno,
+                "name": f"STUDENT {rollno}",
+                "father": f"FATHER {rollno}",
+                "password": f"pw{rollno}"
+            })
+            marks.insert({
+                "rollno": rollno,
+                **{subject: float((rollno * (i + 3)) % 101) for i, subject in enumerate(SUBJECTS)}
+            })
+
+    def _rpc_create_student_with_marks(self, p_rollno, p_name, p_father, p_password, **marks):
+        if p_rollno in self.tables["students"].rows:
+            raise BackendError("duplicate key value violates unique constraint", UNIQUE_VIOLATION)
+        self.tables["students"].insert(
+            {"rollno": p_rollno, "name": p_name, "father": p_father, "password": p_password}
+        )
+        self.tables["marks"].insert(
+            {"rollno": p_rollno, **{subject: marks[f"p_{subject}"] for subject in SUBJECTS}}
+        )
+        self.record_changes("students", [{"rollno": p_rollno}])
+        self.record_changes("marks", [{"rollno": p_rollno}])
+        return None
+
+    def _rpc_create_students_with_marks(self, p_rows):
+        rollnos = [row["rollno"] for row in p_rows]
+        if len(set(rollnos)) != len(rollnos) or any(r in self.tables["students"].rows for r in rollnos):
+            raise BackendError("duplicate key value violates unique constraint", UNIQUE_VIOLATION)
+        for row in p_rows:
+            self.tables["students"].insert({k: row[k] for k in ("rollno", "name", "father", "password")})
+            self.tables["marks"].insert({"rollno": row["rollno"], **{s: row[s] for s in SUBJECTS}})
+        self.record_changes("students", p_rows)
+        self.record_changes("marks", p_rows)
+        return None
+
+    def _rpc_update_student_with_marks(self, p_rollno, p_student, p_marks):
+        student = self.tables["students"].rows.get(p_rollno)
+        marks = self.tables["marks"].rows.get(p_rollno)
+        if student is None:
+            return None
+        if p_student:
+            student.update(p_student)
+            self.record_changes("students", [student])
+        if marks is None:
+            return {**dict.fromkeys(SUBJECTS), **student}
+        if p_marks:
+            marks.update(p_marks)
+            self.record_changes("marks", [marks])
+        return {**marks, **student}
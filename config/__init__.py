@@ -1,4 +1,4 @@
 """Configuration package"""
-from .database import db
+from .database import db, adb
 
-__all__ = ['db']
+__all__ = ['db', 'adb']
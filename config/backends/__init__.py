@@ -0,0 +1,24 @@
+"""
+Storage backends selectable with the DB_BACKEND environment variable
+"""
+import os
+from config.backends.base import BackendError, QueryResult, StorageBackend
+
+BACKENDS = ("supabase", "sqlite")
+
+
+def create_backend(name: str = None) -> StorageBackend:
+    """Create the backend named by DB_BACKEND (supabase by default)"""
+    name = (name or os.getenv("DB_BACKEND", "supabase")).strip().lower()
+
+    if name == "supabase":
+        from config.backends.supabase_backend import SupabaseBackend
+        return SupabaseBackend(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    if name == "sqlite":
+        from config.backends.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(os.getenv("SQLITE_PATH", "students.db"))
+
+    raise ValueError(f"Unknown DB_BACKEND '{name}', expected one of: {', '.join(BACKENDS)}")
+
+
+__all__ = ['BackendError', 'QueryResult', 'StorageBackend', 'create_backend']
@@ -0,0 +1,114 @@
+"""
+Async storage backends for the ASGI app
+
+Queries are built with the same builder calls as the sync backends; only
+execute() differs, returning an awaitable.
+"""
+import asyncio
+import os
+from typing import Any, Dict
+from config.backends.base import StorageBackend
+from config.backends.supabase_backend import (
+    DB_POOL_SIZE, DB_POOL_KEEPALIVE, DB_KEEPALIVE_SECONDS,
+    DB_TIMEOUT_SECONDS, DB_CONNECT_TIMEOUT_SECONDS, DB_POOL_TIMEOUT_SECONDS
+)
+
+
+class AsyncSupabaseBackend:
+    """Native async backend using the async Supabase client
+
+    All requests of an event loop share one AsyncClient connection pool,
+    so many slow queries can be in flight without a thread each.
+    """
+
+    name = "supabase"
+
+    def __init__(self, client, http):
+        self.client = client
+        self.http = http
+
+    @classmethod
+    async def connect(cls, url: str, key: str) -> "AsyncSupabaseBackend":
+        import httpx
+        from supabase import acreate_client, AsyncClientOptions
+
+        if not url or not key:
+            raise ValueError(
+                "Missing Supabase credentials. Please set SUPABASE_URL and SUPABASE_KEY in .env file"
+            )
+        http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=DB_POOL_SIZE,
+                max_keepalive_connections=DB_POOL_KEEPALIVE,
+                keepalive_expiry=DB_KEEPALIVE_SECONDS
+            ),
+            timeout=httpx.Timeout(
+                DB_TIMEOUT_SECONDS,
+                connect=DB_CONNECT_TIMEOUT_SECONDS,
+                pool=DB_POOL_TIMEOUT_SECONDS
+            ),
+            follow_redirects=True,
+            http2=True
+        )
+        client = await acreate_client(url, key, options=AsyncClientOptions(httpx_client=http))
+        return cls(client, http)
+
+    def table(self, name: str):
+        return self.client.table(name)
+
+    def rpc(self, name: str, params: Dict[str, Any]):
+        return self.client.rpc(name, params)
+
+    async def close(self):
+        await self.http.aclose()
+
+
+class ThreadedQuery:
+    """Builder proxy whose execute() runs the sync query in a worker thread"""
+
+    __slots__ = ("_query",)
+
+    def __init__(self, query: Any):
+        self._query = query
+
+    async def execute(self):
+        return await asyncio.to_thread(self._query.execute)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._query, name)
+
+        def call(*args, **kwargs):
+            return ThreadedQuery(attr(*args, **kwargs))
+        return call
+
+
+class ThreadedAsyncBackend:
+    """Adapts a sync backend (e.g. SQLite) to the async interface
+
+    Used for engines without an async driver; each query borrows a thread
+    from the event loop's default executor only while it executes.
+    """
+
+    def __init__(self, backend: StorageBackend):
+        self.inner = backend
+        self.name = backend.name
+
+    def table(self, name: str) -> ThreadedQuery:
+        return ThreadedQuery(self.inner.table(name))
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> ThreadedQuery:
+        return ThreadedQuery(self.inner.rpc(name, params))
+
+    async def close(self):
+        pass
+
+
+async def create_async_backend(sync_backend: StorageBackend):
+    """Create the async counterpart of a sync backend
+
+    Supabase gets the native async client; other engines run their sync
+    queries in worker threads.
+    """
+    if sync_backend.name == "supabase":
+        return await AsyncSupabaseBackend.connect(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    return ThreadedAsyncBackend(sync_backend)
@@ -0,0 +1,49 @@
+"""
+Storage backend interface shared by the Supabase and SQLite engines
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class BackendError(Exception):
+    """Database error carrying a Postgres-style SQLSTATE code when known"""
+
+    def __init__(self, message: str, code: str = None):
+        super().__init__(message)
+        self.code = code
+
+
+class QueryResult:
+    """Result of an executed query; rows (or an RPC's return value) are in data"""
+
+    def __init__(self, data: Any):
+        self.data = data
+
+
+class StorageBackend(ABC):
+    """Interface used by the Student and Marks models
+
+    table(name) returns a query builder supporting the PostgREST subset the
+    models use:
+
+        select(columns="*") / insert(row_or_rows) / update(values) / delete()
+        eq / gt / gte / lte / in_(column, value)
+        order(column, desc=False) / limit(n)
+        execute() -> QueryResult
+
+    Writes return the affected rows in QueryResult.data. rpc(name, params)
+    runs a server-side function such as create_student_with_marks.
+    """
+
+    name = "backend"
+
+    @abstractmethod
+    def table(self, name: str):
+        """Start a query against a table"""
+
+    @abstractmethod
+    def rpc(self, name: str, params: Dict[str, Any]):
+        """Prepare a call to a database function; call execute() to run it"""
+
+    def close(self):
+        """Release connections held by the backend"""
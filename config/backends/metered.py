@@ -0,0 +1,98 @@
+"""
+Backend wrapper that reports the duration of every database call
+"""
+import time
+from typing import Any, Callable, Dict
+from config.backends.base import StorageBackend
+
+# observe(table, operation, seconds, ok)
+Observer = Callable[[str, str, float, bool], None]
+
+OPERATIONS = ("select", "insert", "update", "delete", "upsert")
+
+
+class MeteredQuery:
+    """Proxy over a backend query builder that times execute()
+
+    Builder calls are forwarded to the wrapped query; the first of
+    select/insert/update/delete names the operation reported for it.
+    """
+
+    __slots__ = ("_query", "_table", "_operation", "_observe")
+
+    def __init__(self, query: Any, table: str, operation: str, observe: Observer):
+        self._query = query
+        self._table = table
+        self._operation = operation
+        self._observe = observe
+
+    def execute(self):
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = self._query.execute()
+            ok = True
+            return result
+        finally:
+            self._observe(self._table, self._operation, time.perf_counter() - started, ok)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._query, name)
+        if not callable(attr):
+            return attr
+        operation = name if name in OPERATIONS else self._operation
+
+        def call(*args, **kwargs):
+            return type(self)(attr(*args, **kwargs), self._table, operation, self._observe)
+        return call
+
+
+class AsyncMeteredQuery(MeteredQuery):
+    """MeteredQuery for async backends, whose execute() is awaited"""
+
+    __slots__ = ()
+
+    async def execute(self):
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = await self._query.execute()
+            ok = True
+            return result
+        finally:
+            self._observe(self._table, self._operation, time.perf_counter() - started, ok)
+
+
+class MeteredBackend(StorageBackend):
+    """Wraps a backend so every query and RPC is passed to an observer"""
+
+    def __init__(self, backend: StorageBackend, observe: Observer):
+        self.inner = backend
+        self.name = backend.name
+        self._observe = observe
+
+    def __getattr__(self, name: str):
+        # Backend-specific attributes (e.g. the raw Supabase client)
+        return getattr(self.inner, name)
+
+    def table(self, name: str) -> MeteredQuery:
+        return MeteredQuery(self.inner.table(name), name, "select", self._observe)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> MeteredQuery:
+        return MeteredQuery(self.inner.rpc(name, params), f"rpc:{name}", "rpc", self._observe)
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncMeteredBackend(MeteredBackend):
+    """Wraps an async backend (see config.backends.aio) like MeteredBackend"""
+
+    def table(self, name: str) -> AsyncMeteredQuery:
+        return AsyncMeteredQuery(self.inner.table(name), name, "select", self._observe)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> AsyncMeteredQuery:
+        return AsyncMeteredQuery(self.inner.rpc(name, params), f"rpc:{name}", "rpc", self._observe)
+
+    async def close(self):
+        await self.inner.close()
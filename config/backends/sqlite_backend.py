@@ -0,0 +1,373 @@
+"""
+Embedded SQLite storage backend for offline and kiosk deployments
+"""
+import os
+import sqlite3
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.backends.base import BackendError, QueryResult, StorageBackend
+
+# SQLSTATE codes reported for constraint failures, matching Postgres
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+CHECK_VIOLATION = "23514"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    rollno INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    father VARCHAR(100) NOT NULL,
+    password VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS marks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    rollno INTEGER UNIQUE NOT NULL,
+    dsp REAL NOT NULL CHECK (dsp >= 0 AND dsp <= 100),
+    iot REAL NOT NULL CHECK (iot >= 0 AND iot <= 100),
+    android REAL NOT NULL CHECK (android >= 0 AND android <= 100),
+    compiler REAL NOT NULL CHECK (compiler >= 0 AND compiler <= 100),
+    minor REAL NOT NULL CHECK (minor >= 0 AND minor <= 100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (rollno) REFERENCES students(rollno) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_students_name ON students(name);
+CREATE INDEX IF NOT EXISTS idx_students_father ON students(father);
+
+-- Data version bumped by every row written to students or marks, plus a
+-- log of the roll numbers written so each process can catch up
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    epoch INTEGER NOT NULL DEFAULT (abs(random())),
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO data_version (id) VALUES (1);
+
+CREATE TABLE IF NOT EXISTS data_changes (
+    version INTEGER PRIMARY KEY,
+    rollno INTEGER NOT NULL
+);
+"""
+
+# Entries kept in data_changes
+CHANGE_LOG_SIZE = 10000
+
+_CHANGE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS {table}_{event}_changed AFTER {event} ON {table}
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+    INSERT INTO data_changes (version, rollno)
+        SELECT version, {row}.rollno FROM data_version WHERE id = 1;
+    DELETE FROM data_changes
+        WHERE version <= (SELECT version FROM data_version WHERE id = 1) - {keep};
+END;
+"""
+
+SCHEMA += "".join(
+    _CHANGE_TRIGGER.format(table=table, event=event, row="OLD" if event == "DELETE" else "NEW",
+                           keep=CHANGE_LOG_SIZE)
+    for table in ("students", "marks")
+    for event in ("INSERT", "UPDATE", "DELETE")
+)
+
+COLUMNS = {
+    "students": ("rollno", "name", "father", "password", "created_at"),
+    "marks": ("id", "rollno", "dsp", "iot", "android", "compiler", "minor",
+              "created_at", "updated_at"),
+    "data_version": ("id", "epoch", "version"),
+    "data_changes": ("version", "rollno")
+}
+
+OPERATORS = {"eq": "=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+# Compiled statements cached per connection; query shapes are few and stable
+STATEMENT_CACHE_SIZE = 512
+
+# Seconds a connection waits for another thread's write lock
+DB_TIMEOUT_SECONDS = float(os.getenv("DB_TIMEOUT_SECONDS", "10"))
+
+
+def _translate(error: sqlite3.Error) -> BackendError:
+    """Map an SQLite error onto a BackendError with a Postgres-style code"""
+    message = str(error)
+    code = None
+    if isinstance(error, sqlite3.IntegrityError):
+        if "UNIQUE" in message or "PRIMARY KEY" in message:
+            code = UNIQUE_VIOLATION
+            message = f"duplicate key value violates unique constraint ({message})"
+        elif "FOREIGN KEY" in message:
+            code = FOREIGN_KEY_VIOLATION
+        elif "CHECK" in message:
+            code = CHECK_VIOLATION
+    return BackendError(message, code)
+
+
+class SQLiteQuery:
+    """Query builder compiling the PostgREST subset to parameterized SQL"""
+
+    def __init__(self, backend: "SQLiteBackend", table: str):
+        if table not in COLUMNS:
+            raise BackendError(f"Unknown table: {table}")
+        self._backend = backend
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._payload: Any = None
+        self._where: List[Tuple[str, Any]] = []
+        self._params: List[Any] = []
+        self._order: Optional[Tuple[str, bool]] = None
+        self._limit: Optional[int] = None
+
+    def _column(self, name: str) -> str:
+        name = name.strip()
+        if name not in COLUMNS[self._table]:
+            raise BackendError(f"Unknown column {self._table}.{name}")
+        return name
+
+    def select(self, columns: str = "*") -> "SQLiteQuery":
+        self._op = "select"
+        if columns.strip() != "*":
+            columns = ", ".join(self._column(c) for c in columns.split(","))
+        self._columns = columns
+        return self
+
+    def insert(self, rows) -> "SQLiteQuery":
+        self._op = "insert"
+        self._payload = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "SQLiteQuery":
+        self._op = "update"
+        self._payload = values
+        return self
+
+    def delete(self) -> "SQLiteQuery":
+        self._op = "delete"
+        return self
+
+    def _filter(self, op: str, column: str, value: Any) -> "SQLiteQuery":
+        self._where.append(f"{self._column(column)} {OPERATORS[op]} ?")
+        self._params.append(value)
+        return self
+
+    def eq(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter("eq", column, value)
+
+    def gt(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter("gt", column, value)
+
+    def gte(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter("gte", column, value)
+
+    def lt(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter("lt", column, value)
+
+    def lte(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter("lte", column, value)
+
+    def in_(self, column: str, values) -> "SQLiteQuery":
+        values = list(values)
+        if not values:
+            self._where.append("0")
+        else:
+            self._where.append(f"{self._column(column)} IN ({', '.join('?' * len(values))})")
+            self._params.extend(values)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "SQLiteQuery":
+        self._order = (self._column(column), desc)
+        return self
+
+    def limit(self, count: int) -> "SQLiteQuery":
+        self._limit = int(count)
+        return self
+
+    def _compile(self) -> Tuple[str, List[Any]]:
+        where = f" WHERE {' AND '.join(self._where)}" if self._where else ""
+        params = list(self._params)
+
+        if self._op == "select":
+            sql = f"SELECT {self._columns} FROM {self._table}{where}"
+            if self._order:
+                sql += f" ORDER BY {self._order[0]}{' DESC' if self._order[1] else ''}"
+            if self._limit is not None:
+                sql += f" LIMIT {self._limit}"
+            return sql, params
+
+        if self._op == "insert":
+            columns = [self._column(c) for c in self._payload[0]]
+            row_sql = f"({', '.join('?' * len(columns))})"
+            values = []
+            for row in self._payload:
+                values.extend(row[c] for c in columns)
+            sql = (f"INSERT INTO {self._table} ({', '.join(columns)}) "
+                   f"VALUES {', '.join([row_sql] * len(self._payload))} RETURNING *")
+            return sql, values
+
+        if self._op == "update":
+            assignments = [f"{self._column(c)} = ?" for c in self._payload]
+            return (f"UPDATE {self._table} SET {', '.join(assignments)}{where} RETURNING *",
+                    list(self._payload.values()) + params)
+
+        return f"DELETE FROM {self._table}{where} RETURNING *", params
+
+    def execute(self) -> QueryResult:
+        if self._op == "insert" and not self._payload:
+            return QueryResult([])
+
+        sql, params = self._compile()
+        conn = self._backend.connection()
+        try:
+            if self._op == "select":
+                rows = conn.execute(sql, params).fetchall()
+            else:
+                with conn:
+                    rows = conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise _translate(e) from e
+        return QueryResult([dict(row) for row in rows])
+
+
+class SQLiteRPC:
+    """Deferred call to one of the backend's database functions"""
+
+    def __init__(self, backend: "SQLiteBackend", name: str, params: Dict[str, Any]):
+        function = getattr(backend, f"_rpc_{name}", None)
+        if function is None:
+            raise BackendError(f"Unknown database function: {name}")
+        self._function = function
+        self._params = params
+
+    def execute(self) -> QueryResult:
+        try:
+            return QueryResult(self._function(**self._params))
+        except sqlite3.Error as e:
+            raise _translate(e) from e
+
+
+class _ThreadConnection:
+    """One thread's connection, closed once the thread's locals are dropped
+
+    threading.local releases a thread's values when the thread ends, so the
+    finalizer closes the connection of every finished request thread.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.close = weakref.finalize(self, conn.close)
+
+
+class SQLiteBackend(StorageBackend):
+    """Backend storing data in a local SQLite file
+
+    Each thread gets its own connection, closed again when the thread exits
+    (the threaded dev server starts a thread per request). The database
+    runs in WAL mode so readers never block the writer, foreign keys are
+    enforced, and the database functions used by the models run as local
+    transactions.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = "students.db"):
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            raise BackendError(f"SQLite 3.35+ is required (found {sqlite3.sqlite_version})")
+        self.path = path
+        self._local = threading.local()
+        self._connections: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = sqlite3.connect(self.path, timeout=DB_TIMEOUT_SECONDS, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            holder = _ThreadConnection(conn)
+            self._local.holder = holder
+            with self._lock:
+                self._connections.add(holder)
+        return holder.conn
+
+    @property
+    def open_connections(self) -> int:
+        """Number of connections currently open (one per live thread that used the backend)"""
+        return len(self._connections)
+
+    def table(self, name: str) -> SQLiteQuery:
+        return SQLiteQuery(self, name)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> SQLiteRPC:
+        return SQLiteRPC(self, name, params)
+
+    def close(self):
+        with self._lock:
+            for holder in list(self._connections):
+                holder.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _rpc_create_student_with_marks(self, p_rollno, p_name, p_father, p_password,
+                                       p_dsp, p_iot, p_android, p_compiler, p_minor):
+        conn = self.connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO students (rollno, name, father, password) VALUES (?, ?, ?, ?)",
+                (p_rollno, p_name, p_father, p_password)
+            )
+            conn.execute(
+                "INSERT INTO marks (rollno, dsp, iot, android, compiler, minor) VALUES (?, ?, ?, ?, ?, ?)",
+                (p_rollno, p_dsp, p_iot, p_android, p_compiler, p_minor)
+            )
+        return None
+
+    def _rpc_create_students_with_marks(self, p_rows):
+        conn = self.connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO students (rollno, name, father, password) "
+                "VALUES (:rollno, :name, :father, :password)",
+                p_rows
+            )
+            conn.executemany(
+                "INSERT INTO marks (rollno, dsp, iot, android, compiler, minor) "
+                "VALUES (:rollno, :dsp, :iot, :android, :compiler, :minor)",
+                p_rows
+            )
+        return None
+
+    def _rpc_update_student_with_marks(self, p_rollno, p_student, p_marks):
+        conn = self.connection()
+        with conn:
+            if p_student:
+                columns = [c for c in ("name", "father", "password") if c in p_student]
+                conn.execute(
+                    f"UPDATE students SET {', '.join(f'{c} = ?' for c in columns)} WHERE rollno = ?",
+                    [p_student[c] for c in columns] + [p_rollno]
+                )
+            if p_marks:
+                columns = [c for c in ("dsp", "iot", "android", "compiler", "minor") if c in p_marks]
+                conn.execute(
+                    f"UPDATE marks SET {', '.join(f'{c} = ?' for c in columns)}, "
+                    f"updated_at = CURRENT_TIMESTAMP WHERE rollno = ?",
+                    [p_marks[c] for c in columns] + [p_rollno]
+                )
+            row = conn.execute(
+                "SELECT s.rollno, s.name, s.father, s.password, "
+                "m.dsp, m.iot, m.android, m.compiler, m.minor "
+                "FROM students s LEFT JOIN marks m ON m.rollno = s.rollno WHERE s.rollno = ?",
+                (p_rollno,)
+            ).fetchone()
+        return dict(row) if row else None
@@ -0,0 +1,65 @@
+"""
+Supabase (PostgREST) storage backend
+"""
+import os
+from typing import Any, Dict
+import httpx
+from supabase import create_client, Client
+from supabase.lib.client_options import SyncClientOptions
+from config.backends.base import StorageBackend
+
+# HTTP connection pool shared by all threads, overridable from .env
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_POOL_KEEPALIVE = int(os.getenv("DB_POOL_KEEPALIVE", str(DB_POOL_SIZE)))
+DB_KEEPALIVE_SECONDS = float(os.getenv("DB_KEEPALIVE_SECONDS", "30"))
+DB_TIMEOUT_SECONDS = float(os.getenv("DB_TIMEOUT_SECONDS", "10"))
+DB_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "5"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+
+
+class SupabaseBackend(StorageBackend):
+    """Backend that forwards queries to a Supabase project
+
+    One Supabase client is shared by all threads. Every table() or rpc()
+    call returns a fresh request builder, and the client only reads its
+    headers, so nothing per-request is shared. Requests go through one
+    thread-safe httpx client whose connection pool bounds concurrency,
+    keeps connections alive between requests and applies the request
+    timeouts. The backend is created on first use of config.database.db,
+    so each gunicorn worker process builds its own after forking.
+    """
+
+    name = "supabase"
+
+    def __init__(self, url: str, key: str):
+        if not url or not key:
+            raise ValueError(
+                "Missing Supabase credentials. Please set SUPABASE_URL and SUPABASE_KEY in .env file"
+            )
+        self.url = url
+        self.key = key
+        self.http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=DB_POOL_SIZE,
+                max_keepalive_connections=DB_POOL_KEEPALIVE,
+                keepalive_expiry=DB_KEEPALIVE_SECONDS
+            ),
+            timeout=httpx.Timeout(
+                DB_TIMEOUT_SECONDS,
+                connect=DB_CONNECT_TIMEOUT_SECONDS,
+                pool=DB_POOL_TIMEOUT_SECONDS
+            ),
+            follow_redirects=True,
+            http2=True
+        )
+        # Also validates the credentials and URL up front
+        self.client: Client = create_client(url, key, options=SyncClientOptions(httpx_client=self.http))
+
+    def table(self, name: str):
+        return self.client.table(name)
+
+    def rpc(self, name: str, params: Dict[str, Any]):
+        return self.client.rpc(name, params)
+
+    def close(self):
+        self.http.close()
@@ -1,57 +1,113 @@
 """
-Database configuration and connection module for Supabase
+Database configuration and connection module
 """
-import os
-from supabase import create_client, Client
+import threading
 from dotenv import load_dotenv
+from config.backends import StorageBackend, create_backend
+from config.backends.metered import AsyncMeteredBackend, MeteredBackend, Observer
 
 # Load environment variables
 load_dotenv()
 
 class Database:
-    """Database connection class using Supabase"""
+    """Database connection class wrapping the configured storage backend
+    
+    The backend (and its client library) is created on first use rather
+    than at import time, so commands that never touch the database start fast.
+    """
     
     _instance = None
-    _client: Client = None
+    _backend: StorageBackend = None
+    _lock = threading.Lock()
+    _observer: Observer = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Database, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        if self._client is None:
-            self.connect()
-    
     def connect(self):
-        """Initialize Supabase client"""
+        """Initialize the storage backend selected by DB_BACKEND"""
         try:
-            url = os.getenv("SUPABASE_URL")
-            key = os.getenv("SUPABASE_KEY")
-            
-            if not url or not key:
-                raise ValueError(
-                    "Missing Supabase credentials. Please set SUPABASE_URL and SUPABASE_KEY in .env file"
-                )
-            
-            self._client = create_client(url, key)
-            print("✅ Successfully connected to Supabase database")
+            with self._lock:
+                if self._backend is None:
+                    backend = create_backend()
+                    if self._observer:
+                        backend = MeteredBackend(backend, self._observer)
+                    self._backend = backend
+            print(f"✅ Successfully connected to {self._backend.name} database")
             return True
         except Exception as e:
             print(f"❌ Error connecting to database: {e}")
             return False
     
+    def instrument(self, observe: Observer):
+        """Report every database call to observe(table, operation, seconds, ok)"""
+        with self._lock:
+            self._observer = observe
+            if self._backend is not None and not isinstance(self._backend, MeteredBackend):
+                self._backend = MeteredBackend(self._backend, observe)
+    
     @property
-    def client(self) -> Client:
-        """Get Supabase client instance"""
-        if self._client is None:
+    def backend(self) -> StorageBackend:
+        """Get the storage backend instance"""
+        if self._backend is None:
             self.connect()
-        return self._client
+        return self._backend
+    
+    @property
+    def client(self):
+        """Get the raw Supabase client (or the backend for other engines)"""
+        return getattr(self.backend, "client", self.backend)
+    
+    @property
+    def backend_name(self) -> str:
+        """Name of the active backend"""
+        return self._backend.name if self._backend else None
     
     def is_connected(self):
-        """Check if database is connected"""
-        return self._client is not None
+        """Check if database is connected, connecting on first call"""
+        if self._backend is None:
+            self.connect()
+        return self._backend is not None
+
+
+class AsyncDatabase:
+    """Lazily created async backend for the ASGI app (one per event loop)"""
+    
+    def __init__(self, sync_db: Database):
+        self._sync_db = sync_db
+        self._backend = None
+        self._lock = None  # asyncio.Lock, created inside the event loop
+    
+    async def backend(self):
+        """Get the async backend, creating it on first use"""
+        if self._backend is None:
+            import asyncio
+            from config.backends.aio import ThreadedAsyncBackend, create_async_backend
+            
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._backend is None:
+                    sync_backend = await asyncio.to_thread(lambda: self._sync_db.backend)
+                    if sync_backend is None:
+                        raise RuntimeError("Database connection failed")
+                    backend = await create_async_backend(sync_backend)
+                    # Threaded backends run the (already metered) sync queries
+                    observe = self._sync_db._observer
+                    if observe and not isinstance(backend, ThreadedAsyncBackend):
+                        backend = AsyncMeteredBackend(backend, observe)
+                    self._backend = backend
+        return self._backend
+    
+    async def close(self):
+        """Release the async backend's connections"""
+        if self._backend is not None:
+            await self._backend.close()
+            self._backend = None
 
 
-# Global database instance
+# Global database instances
 db = Database()
+adb = AsyncDatabase(db)
@@ -1,6 +1,9 @@
 """
 Student Database Management System
 Main application file with Supabase integration
+
+Run without arguments for the interactive menu, or with a command for
+batch mode (see `python main.py --help`).
 """
 import sys
 from config.database import db
@@ -11,8 +14,10 @@ from operations.student_ops import (
     update_student,
     delete_student
 )
+from operations.bulk_ops import import_students
 from models.marks import Marks
-from utils.display import print_header, print_separator
+from models.stats import ClassStats
+from utils.display import print_header, print_separator, display_stats
 from utils.export import export_to_excel, export_to_pdf
 
 
@@ -32,7 +37,9 @@ def display_menu():
     5. 🗑️  Delete Student
     6. 📊 Export to Excel
     7. 📄 Export to PDF
-    8. ❌ Exit
+    8. 📥 Import Students (CSV/XLSX/JSON)
+    9. 📈 Class Statistics
+    10. ❌ Exit
     """)
     print_separator('=', 80)
 
@@ -61,7 +68,7 @@ def main():
             choice = input("Enter your choice (0 to show menu): ").strip()
             
             if choice == "":
-                print("❌ Invalid input. Please enter a number from 0 to 8.")
+                print("❌ Invalid input. Please enter a number from 0 to 10.")
                 continue
             
             choice = int(choice)
@@ -85,14 +92,23 @@ def main():
                 delete_student()
             
             elif choice == 6:
-                data = Marks.get_full_details()
+                data = Marks.iter_full_details(columns=Marks.DETAIL_COLUMNS)
                 export_to_excel(data)
             
             elif choice == 7:
-                data = Marks.get_full_details()
+                data = Marks.iter_full_details(columns=Marks.DETAIL_COLUMNS)
                 export_to_pdf(data)
             
             elif choice == 8:
+                import_students()
+            
+            elif choice == 9:
+                stats = ClassStats.get()
+                # None means the marks could not be read; the error is already shown
+                if stats is not None:
+                    display_stats(stats)
+            
+            elif choice == 10:
                 print_separator()
                 print("\n" + "="*80)
                 print_header("THANK YOU FOR USING STUDENT DATABASE MANAGEMENT SYSTEM", 80)
@@ -102,7 +118,7 @@ def main():
                 break
             
             else:
-                print("❌ Invalid choice! Please enter a number between 0 and 8.")
+                print("❌ Invalid choice! Please enter a number between 0 and 10.")
         
         except ValueError:
             print("❌ Invalid input! Please enter a valid number.")
@@ -114,4 +130,7 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from operations.batch_ops import run
+        sys.exit(run(sys.argv[1:]))
     main()
@@ -1,5 +1,7 @@
 """Models package"""
-from .student import Student
+from .student import Student, DuplicateRollNoError
 from .marks import Marks
+from .patch import StudentPatch
+from .stats import ClassStats
 
-__all__ = ['Student', 'Marks']
+__all__ = ['Student', 'Marks', 'StudentPatch', 'ClassStats', 'DuplicateRollNoError']
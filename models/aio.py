@@ -0,0 +1,112 @@
+"""
+Async read paths for the ASGI app
+
+These mirror the read methods of Student and Marks, share their caches
+and search index, and run independent queries concurrently. Writes stay
+on the sync models so cache invalidation and index upkeep live in one place.
+Unlike the sync models, errors are raised to the caller.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from config.database import adb
+from models.student import Student, select_clause, project
+from models.marks import Marks, merge_join
+from models.search_index import student_index
+from models.version import data_version
+
+Page = Tuple[List[Dict[str, Any]], Optional[int]]
+
+
+async def _fetch_one(table: str, rollno: int) -> Optional[Dict[str, Any]]:
+    backend = await adb.backend()
+    result = await backend.table(table).select("*").eq("rollno", rollno).execute()
+    return result.data[0] if result.data else None
+
+
+async def sync_version():
+    """Read the data version off the event loop when it is due, like the sync reads do"""
+    if data_version.stale:
+        await asyncio.to_thread(data_version.sync)
+
+
+async def get_student(rollno: int, columns: Sequence[str] = None) -> Optional[Dict[str, Any]]:
+    """Get a student by roll number (read-through cached)"""
+    await sync_version()
+    row = await Student._cache.aget_or_load(rollno, lambda: _fetch_one(Student.TABLE_NAME, rollno))
+    return project(row, columns) if row else None
+
+
+async def get_marks(rollno: int, columns: Sequence[str] = None) -> Optional[Dict[str, Any]]:
+    """Get marks by roll number (read-through cached)"""
+    await sync_version()
+    row = await Marks._cache.aget_or_load(rollno, lambda: _fetch_one(Marks.TABLE_NAME, rollno))
+    return project(row, columns) if row else None
+
+
+async def get_student_with_marks(rollno: int) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Fetch a student's public fields and their marks at the same time"""
+    return await asyncio.gather(
+        get_student(rollno, Student.PUBLIC_COLUMNS),
+        get_marks(rollno, Marks.MARK_COLUMNS)
+    )
+
+
+async def get_page(table: str, limit: int = 100, after: Optional[int] = None,
+                   columns: Sequence[str] = None) -> Page:
+    """Get one keyset page of a table ordered by roll number"""
+    backend = await adb.backend()
+    query = backend.table(table).select(select_clause(columns))
+    if after is not None:
+        query = query.gt("rollno", after)
+    result = await query.order("rollno").limit(limit + 1).execute()
+    rows = result.data or []
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]['rollno']
+    return rows, None
+
+
+async def get_full_details_page(limit: int = 100, after: Optional[int] = None,
+                                columns: Sequence[str] = Marks.DETAIL_COLUMNS) -> Page:
+    """Get one keyset page of combined student and marks data
+
+    Both pages are requested at once with the same cursor. Every marks row
+    belongs to a student, so the first `limit` marks rows after the cursor
+    always include the marks of every student on the students page.
+    """
+    student_columns, marks_columns = Marks._split_columns(columns)
+    (students, next_cursor), (marks, _) = await asyncio.gather(
+        get_page(Student.TABLE_NAME, limit, after, student_columns),
+        get_page(Marks.TABLE_NAME, limit, after, marks_columns)
+    )
+    return list(merge_join(students, marks)), next_cursor
+
+
+async def get_by_rollnos(table: str, rollnos: List[int],
+                         columns: Sequence[str] = None) -> List[Dict[str, Any]]:
+    """Get the rows of a table for a list of roll numbers"""
+    if not rollnos:
+        return []
+    backend = await adb.backend()
+    result = await backend.table(table).select(select_clause(columns)).in_("rollno", rollnos).execute()
+    return result.data or []
+
+
+async def search(query: str, field: str = "name", offset: int = 0,
+                 limit: int = 20) -> Tuple[List[int], int]:
+    """Search names via the in-process index, returning (rollnos, total)"""
+    if data_version.stale or not student_index.built:
+        await asyncio.to_thread(Student.ensure_indexed)
+    return student_index.search(query, field, offset, limit)
+
+
+async def get_search_rows(rollnos: List[int]) -> List[Dict[str, Any]]:
+    """Fetch combined rows for search results, preserving their order"""
+    students, marks = await asyncio.gather(
+        get_by_rollnos(Student.TABLE_NAME, rollnos, Student.PUBLIC_COLUMNS),
+        get_by_rollnos(Marks.TABLE_NAME, rollnos, Marks.MARK_COLUMNS)
+    )
+    students = {s['rollno']: s for s in students}
+    marks = {m['rollno']: m for m in marks}
+    return [{**students[r], **marks[r]} for r in rollnos if r in students and r in marks]
@@ -0,0 +1,130 @@
+"""
+Change feed of row-level write events for live clients
+"""
+import json
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# Events held for a subscriber that is not keeping up before it is told to reload
+MAX_PENDING_EVENTS = 1000
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+RESET = "reset"
+
+
+class Subscription:
+    """Bounded queue of change events for one client
+
+    If the client falls more than max_pending events behind, the backlog is
+    replaced by a single reset event telling it to reload from scratch.
+    notify, if given, is called (from the writing thread) after each event
+    so async consumers can wake up without blocking a thread.
+    """
+
+    def __init__(self, feed: "ChangeFeed", max_pending: int = MAX_PENDING_EVENTS,
+                 notify: Optional[Callable[[], None]] = None):
+        self._feed = feed
+        self._events: deque = deque()
+        self._cond = threading.Condition()
+        self.max_pending = max_pending
+        self.notify = notify
+
+    def push(self, event: Dict[str, Any]):
+        with self._cond:
+            if len(self._events) >= self.max_pending:
+                self._events.clear()
+                event = {"id": event["id"], "op": RESET}
+            self._events.append(event)
+            self._cond.notify()
+        if self.notify:
+            self.notify()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take every pending event without waiting"""
+        with self._cond:
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+    def wait(self, timeout: float) -> List[Dict[str, Any]]:
+        """Take pending events, waiting up to timeout seconds for the first"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._events, timeout)
+        return self.drain()
+
+    def close(self):
+        self._feed.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ChangeFeed:
+    """Fans out insert/update/delete events from the models to live clients
+
+    Events carry the roll number and the changed public fields (never the
+    password). Writes made through this process are published as they
+    happen; writes made elsewhere are published once the data version shows
+    them, so a row may be announced twice, which clients apply idempotently.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Set[Subscription] = set()
+        self._last_id = 0
+
+    def subscribe(self, notify: Optional[Callable[[], None]] = None) -> Subscription:
+        subscription = Subscription(self, notify=notify)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, op: str, rollno: int, row: Optional[Dict[str, Any]] = None):
+        """Send one change to every subscriber (a no-op when nobody listens)"""
+        event = {"op": op, "rollno": rollno}
+        if row is not None:
+            event["row"] = row
+        self._send(event)
+
+    def reset(self):
+        """Tell every subscriber to reload from scratch (changes are unknown)"""
+        self._send({"op": RESET})
+
+    def _send(self, event: Dict[str, Any]):
+        if not self._subscribers:
+            return
+        with self._lock:
+            self._last_id += 1
+            event = {"id": self._last_id, **event}
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.push(event)
+            except Exception:
+                # e.g. the event loop of an async client has closed; a
+                # broken listener must never fail the write that published
+                self.unsubscribe(subscription)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event as a Server-Sent Events message"""
+    kind = "reset" if event["op"] == RESET else "change"
+    return f"id: {event['id']}\nevent: {kind}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+# Global change feed instance
+change_feed = ChangeFeed()
@@ -1,14 +1,66 @@
 """
 Marks model for database operations
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator, Callable, Sequence, Set
 from config.database import db
+from models.cache import LRUCache
+from models.version import data_version
+from models.events import change_feed, INSERT, UPDATE, DELETE
+from models.rank_index import RankIndex, TOTAL
+from models.student import Student, select_clause, project
+
+# Rows fetched per round trip when streaming whole tables
+STREAM_BATCH_SIZE = 1000
+
+
+def iter_pages(fetch_page: Callable[..., Tuple[List[Dict[str, Any]], Optional[int]]],
+               batch_size: int = STREAM_BATCH_SIZE,
+               columns: Sequence[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield every row of a keyset-paginated fetch_page() function
+
+    fetch_page must raise on errors (as the models' fetch_page() does);
+    one that returns an empty page instead would end the stream early.
+    """
+    after = None
+    while True:
+        rows, after = fetch_page(batch_size, after, columns)
+        yield from rows
+        if after is None:
+            break
+
+
+def merge_join(students: Iterable[Dict[str, Any]],
+               marks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Inner-join two rollno-ordered row streams, yielding combined rows"""
+    marks = iter(marks)
+    current = next(marks, None)
+    
+    for student in students:
+        rollno = student['rollno']
+        while current is not None and current['rollno'] < rollno:
+            current = next(marks, None)
+        if current is None:
+            return
+        if current['rollno'] == rollno:
+            yield {**student, **current}
 
 
 class Marks:
     """Marks model class"""
     
     TABLE_NAME = "marks"
+    SUBJECTS = ("dsp", "iot", "android", "compiler", "minor")
+    
+    # Columns rendered for marks alone and for combined student + marks rows
+    MARK_COLUMNS = ("rollno",) + SUBJECTS
+    DETAIL_COLUMNS = Student.PUBLIC_COLUMNS + SUBJECTS
+    
+    # Per-rollno lookup cache, invalidated by every write below and by
+    # writes from elsewhere once the data version shows them
+    _cache = LRUCache()
+    
+    # Per-subject and total rankings, kept in step with every write below
+    _ranks = RankIndex(SUBJECTS)
     
     def __init__(self, rollno: int, dsp: float, iot: float, android: float, 
                  compiler: float, minor: float):
@@ -44,9 +96,13 @@ class Marks:
         """Create marks record"""
         try:
             marks = Marks(rollno, dsp, iot, android, compiler, minor)
-            result = db.client.table(Marks.TABLE_NAME).insert(marks.to_dict()).execute()
+            result = db.backend.table(Marks.TABLE_NAME).insert(marks.to_dict()).execute()
+            Marks._cache.invalidate(rollno)
+            data_version.bump()
             
             if result.data:
+                Marks._ranks.add(result.data[0])
+                change_feed.publish(INSERT, rollno, project(result.data[0], Marks.MARK_COLUMNS))
                 print("✅ Marks record created successfully")
                 return True
             return False
@@ -55,32 +111,99 @@ class Marks:
             return False
     
     @staticmethod
-    def get_by_rollno(rollno: int) -> Optional[Dict[str, Any]]:
-        """Get marks by roll number"""
+    def _fetch_by_rollno(rollno: int) -> Optional[Dict[str, Any]]:
+        """Fetch a single row from the database, bypassing the cache"""
+        result = db.backend.table(Marks.TABLE_NAME).select("*").eq("rollno", rollno).execute()
+        return result.data[0] if result.data else None
+    
+    @staticmethod
+    def fetch_by_rollno(rollno: int, columns: Sequence[str] = None) -> Optional[Dict[str, Any]]:
+        """Get marks by roll number (read-through cached), raising on errors
+        
+        The cache always holds the full row; columns only shapes the result.
+        """
+        data_version.sync()
+        row = Marks._cache.get_or_load(rollno, lambda: Marks._fetch_by_rollno(rollno))
+        return project(row, columns) if row else None
+    
+    @staticmethod
+    def get_by_rollno(rollno: int, columns: Sequence[str] = None) -> Optional[Dict[str, Any]]:
+        """Get marks by roll number (see fetch_by_rollno), or None on errors"""
         try:
-            result = db.client.table(Marks.TABLE_NAME).select("*").eq("rollno", rollno).execute()
-            return result.data[0] if result.data else None
+            return Marks.fetch_by_rollno(rollno, columns)
         except Exception as e:
             print(f"❌ Error fetching marks: {e}")
             return None
     
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
-        """Get all marks"""
+    def fetch_by_rollnos(rollnos: List[int], columns: Sequence[str] = None) -> List[Dict[str, Any]]:
+        """Get marks for a list of roll numbers, raising on errors"""
+        if not rollnos:
+            return []
+        result = db.backend.table(Marks.TABLE_NAME).select(select_clause(columns)).in_("rollno", rollnos).execute()
+        return result.data if result.data else []
+    
+    @staticmethod
+    def get_by_rollnos(rollnos: List[int], columns: Sequence[str] = None) -> List[Dict[str, Any]]:
+        """Get marks for a list of roll numbers, or [] on errors"""
+        try:
+            return Marks.fetch_by_rollnos(rollnos, columns)
+        except Exception as e:
+            print(f"❌ Error fetching marks: {e}")
+            return []
+    
+    @staticmethod
+    def get_all(columns: Sequence[str] = None) -> List[Dict[str, Any]]:
+        """Get all marks, optionally only some columns"""
         try:
-            result = db.client.table(Marks.TABLE_NAME).select("*").order("rollno").execute()
+            result = db.backend.table(Marks.TABLE_NAME).select(select_clause(columns)).order("rollno").execute()
             return result.data if result.data else []
         except Exception as e:
             print(f"❌ Error fetching marks: {e}")
             return []
     
+    @staticmethod
+    def fetch_page(limit: int = 100, after: Optional[int] = None,
+                   columns: Sequence[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get one keyset page of marks ordered by roll number
+
+        Returns the rows and the cursor for the next page (None on the last page).
+        columns must include rollno, which the cursor is taken from. Unlike
+        get_page(), errors are raised, so a stream built on it never mistakes
+        a failed read for the last page.
+        """
+        query = db.backend.table(Marks.TABLE_NAME).select(select_clause(columns))
+        if after is not None:
+            query = query.gt("rollno", after)
+        result = query.order("rollno").limit(limit + 1).execute()
+        rows = result.data if result.data else []
+        
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1]['rollno']
+        return rows, None
+    
+    @staticmethod
+    def get_page(limit: int = 100, after: Optional[int] = None,
+                 columns: Sequence[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get one keyset page of marks ordered by roll number (see fetch_page)"""
+        try:
+            return Marks.fetch_page(limit, after, columns)
+        except Exception as e:
+            print(f"❌ Error fetching marks: {e}")
+            return [], None
+    
     @staticmethod
     def update(rollno: int, **kwargs) -> bool:
         """Update marks record"""
         try:
-            result = db.client.table(Marks.TABLE_NAME).update(kwargs).eq("rollno", rollno).execute()
+            result = db.backend.table(Marks.TABLE_NAME).update(kwargs).eq("rollno", rollno).execute()
+            Marks._cache.invalidate(rollno)
+            data_version.bump()
             
             if result.data:
+                Marks._ranks.add(result.data[0])
+                change_feed.publish(UPDATE, rollno, project(result.data[0], Marks.MARK_COLUMNS))
                 print("✅ Marks updated successfully")
                 return True
             return False
@@ -92,9 +215,13 @@ class Marks:
     def delete(rollno: int) -> bool:
         """Delete marks record"""
         try:
-            result = db.client.table(Marks.TABLE_NAME).delete().eq("rollno", rollno).execute()
+            result = db.backend.table(Marks.TABLE_NAME).delete().eq("rollno", rollno).execute()
+            Marks._cache.invalidate(rollno)
+            data_version.bump()
             
             if result.data:
+                Marks._ranks.remove(rollno)
+                change_feed.publish(DELETE, rollno)
                 print("✅ Marks record deleted successfully")
                 return True
             return False
@@ -103,32 +230,132 @@ class Marks:
             return False
     
     @staticmethod
-    def get_full_details() -> List[Dict[str, Any]]:
+    def _split_columns(columns: Optional[Sequence[str]]) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+        """Split combined-row columns into (student, marks) selections joined on rollno"""
+        if not columns:
+            return None, None
+        students = ["rollno"] + [c for c in columns if c != "rollno" and c not in Marks.SUBJECTS]
+        marks = ["rollno"] + [c for c in columns if c in Marks.SUBJECTS]
+        return students, marks
+    
+    @staticmethod
+    def get_full_details(columns: Sequence[str] = None) -> List[Dict[str, Any]]:
         """Get combined student and marks data"""
+        return list(Marks.iter_full_details(columns=columns))
+    
+    @staticmethod
+    def iter_full_details(batch_size: int = STREAM_BATCH_SIZE,
+                          columns: Sequence[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream combined student and marks data in roll number order
+        
+        Both tables are read through keyset cursors and merge-joined, so only
+        one batch of each is held in memory at a time. columns (e.g.
+        DETAIL_COLUMNS) limits what is read from each table. A failed read
+        raises instead of ending the stream early.
+        """
+        student_columns, marks_columns = Marks._split_columns(columns)
+        return merge_join(
+            iter_pages(Student.fetch_page, batch_size, student_columns),
+            iter_pages(Marks.fetch_page, batch_size, marks_columns)
+        )
+    
+    @staticmethod
+    def fetch_full_details_page(limit: int = 100, after: Optional[int] = None,
+                                columns: Sequence[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get one keyset page of combined student and marks data
+
+        The cursor follows the students table; marks are fetched for the
+        roll number range covered by the page. Errors are raised.
+        """
+        student_columns, marks_columns = Marks._split_columns(columns)
+        students, next_cursor = Student.fetch_page(limit, after, student_columns)
+        if not students:
+            return [], None
+        
+        marks_result = (
+            db.backend.table(Marks.TABLE_NAME).select(select_clause(marks_columns))
+            .gte("rollno", students[0]['rollno'])
+            .lte("rollno", students[-1]['rollno'])
+            .order("rollno")
+            .execute()
+        )
+        page = list(merge_join(students, marks_result.data or []))
+        return page, next_cursor
+    
+    @staticmethod
+    def get_full_details_page(limit: int = 100, after: Optional[int] = None,
+                              columns: Sequence[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get one keyset page of combined student and marks data (see fetch_full_details_page)"""
         try:
-            # Get all students
-            students_result = db.client.table("students").select("*").order("rollno").execute()
-            students = students_result.data if students_result.data else []
-            
-            # Get all marks
-            marks_result = db.client.table("marks").select("*").order("rollno").execute()
-            marks = marks_result.data if marks_result.data else []
-            
-            # Combine data
-            full_data = []
-            marks_dict = {m['rollno']: m for m in marks}
-            
-            for student in students:
-                rollno = student['rollno']
-                if rollno in marks_dict:
-                    combined = {
-                        **student,
-                        **marks_dict[rollno]
-                    }
-                    # Remove duplicate rollno
-                    full_data.append(combined)
-            
-            return full_data
+            return Marks.fetch_full_details_page(limit, after, columns)
         except Exception as e:
             print(f"❌ Error fetching full details: {e}")
-            return []
+            return [], None
+
+    @staticmethod
+    def leaderboard(subject: str = TOTAL, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """Top students by one subject or by total, with shared ranks for ties"""
+        Marks.ensure_ranked()
+        return Marks._ranks.top(subject, limit, offset)
+
+    @staticmethod
+    def rank(rollno: int) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Rank and percentile of a student per subject and overall, or None"""
+        Marks.ensure_ranked()
+        return Marks._ranks.rank(rollno)
+
+    @staticmethod
+    def ensure_ranked():
+        """Build the rank index on first use (read errors are raised)"""
+        data_version.sync()
+        Marks._ranks.ensure_built(lambda: iter_pages(Marks.fetch_page, columns=Marks.MARK_COLUMNS))
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        """Get hit/miss counters of the per-rollno cache"""
+        return Marks._cache.stats()
+
+    @staticmethod
+    def _forget_changed(rollnos: Optional[Set[int]]):
+        """Drop cached rows written since the last data version read"""
+        if rollnos is None:
+            Marks._cache.clear()
+            return
+        for rollno in rollnos:
+            Marks._cache.invalidate(rollno)
+
+    @staticmethod
+    def _rerank_changed(rollnos: Optional[Set[int]]):
+        """Re-read marks written since the last data version read into the rank index"""
+        if rollnos is None:
+            Marks._ranks.reset()
+        elif Marks._ranks.built:
+            rows = Marks.fetch_by_rollnos(sorted(rollnos), Marks.MARK_COLUMNS)
+            Marks._ranks.refresh(rollnos, rows)
+
+
+    @staticmethod
+    def _publish_changed(rollnos: Optional[Set[int]]):
+        """Send the current rows of students written since the last data version read to the change feed
+
+        Writes made through this process were already published; sending
+        their rows again is harmless, as clients apply events idempotently.
+        """
+        if not change_feed.subscriber_count:
+            return
+        if rollnos is None:
+            change_feed.reset()
+            return
+        rollnos = sorted(rollnos)
+        students = {s['rollno']: s for s in Student.fetch_by_rollnos(rollnos, Student.PUBLIC_COLUMNS)}
+        marks = {m['rollno']: m for m in Marks.fetch_by_rollnos(rollnos, Marks.MARK_COLUMNS)}
+        for rollno in rollnos:
+            if rollno in students:
+                change_feed.publish(UPDATE, rollno, {**students[rollno], **marks.get(rollno, {})})
+            else:
+                change_feed.publish(DELETE, rollno)
+
+
+data_version.subscribe(Marks._forget_changed)
+data_version.subscribe(Marks._rerank_changed)
+data_version.subscribe(Marks._publish_changed)
@@ -0,0 +1,95 @@
+"""
+Unit-of-work patch for a student's details and marks
+"""
+from typing import Any, Dict, Optional
+from config.database import db
+from models.student import Student, project
+from models.marks import Marks
+from models.version import data_version
+from models.events import change_feed, UPDATE
+from models.search_index import student_index
+
+
+class StudentPatch:
+    """Collects field changes for one roll number and writes them together
+
+    flush() sends every pending change for both tables in a single call to
+    the update_student_with_marks database function, which applies them in
+    one transaction and returns the updated combined row.
+    """
+
+    STUDENT_FIELDS = ("name", "father", "password")
+    MARKS_FIELDS = Marks.SUBJECTS
+
+    def __init__(self, rollno: int):
+        self.rollno = rollno
+        self.student_changes: Dict[str, Any] = {}
+        self.marks_changes: Dict[str, Any] = {}
+
+    def set(self, **fields) -> "StudentPatch":
+        """Stage field changes; later values for the same field win
+
+        Raises ValueError for unknown fields and values of the wrong type,
+        before anything is staged for that field.
+        """
+        for field, value in fields.items():
+            if field in self.STUDENT_FIELDS and not isinstance(value, str):
+                raise ValueError(f"{field} must be a string")
+            if field in ("name", "father"):
+                self.student_changes[field] = value.upper()
+            elif field in self.STUDENT_FIELDS:
+                self.student_changes[field] = value
+            elif field in self.MARKS_FIELDS:
+                self.marks_changes[field] = float(value)
+            else:
+                raise ValueError(f"Unknown field: {field}")
+        return self
+
+    @property
+    def pending(self) -> bool:
+        """Whether there are unsaved changes"""
+        return bool(self.student_changes or self.marks_changes)
+
+    def __len__(self) -> int:
+        return len(self.student_changes) + len(self.marks_changes)
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Write all pending changes and return the updated row
+
+        Returns None if the student does not exist or the write fails; the
+        changes then stay staged so the caller can retry. With nothing
+        pending it does nothing and returns None, so no version is bumped.
+        """
+        if not self.pending:
+            return None
+        try:
+            result = db.backend.rpc("update_student_with_marks", {
+                "p_rollno": self.rollno,
+                "p_student": self.student_changes,
+                "p_marks": self.marks_changes
+            }).execute()
+
+            Student._cache.invalidate(self.rollno)
+            Marks._cache.invalidate(self.rollno)
+            data_version.bump()
+
+            row = result.data
+            if isinstance(row, list):
+                row = row[0] if row else None
+            if not row:
+                print("❌ Student not found")
+                return None
+
+            if self.student_changes:
+                student_index.update(self.rollno, **self.student_changes)
+            # A student without a marks row comes back with null marks
+            if self.marks_changes and row.get("dsp") is not None:
+                Marks._ranks.add(row)
+            change_feed.publish(UPDATE, self.rollno, project(row, Marks.DETAIL_COLUMNS))
+            self.student_changes = {}
+            self.marks_changes = {}
+            print("✅ Student record updated successfully")
+            return row
+        except Exception as e:
+            print(f"❌ Error updating student: {e}")
+            return None
@@ -0,0 +1,165 @@
+"""
+In-process order-statistics index over marks for ranks and leaderboards
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sortedcontainers import SortedList
+
+TOTAL = "total"
+
+
+class RankIndex:
+    """Sorted (-score, rollno) entries per subject and for the total
+
+    Every lookup (rank, percentile, top-N page) is a bisect or positional
+    access on a SortedList, so it costs O(log n); writes re-key a single
+    student in O(log n) per ranking instead of re-sorting the table.
+    Ties share a rank (1, 2, 2, 4) and are listed by roll number.
+    """
+
+    def __init__(self, subjects: Sequence[str]):
+        self.subjects = tuple(subjects)
+        self.rankings = self.subjects + (TOTAL,)
+        self._lock = threading.RLock()
+        self._built = False
+        self._scores: Dict[int, Tuple[float, ...]] = {}
+        self._sorted: Dict[str, SortedList] = {r: SortedList() for r in self.rankings}
+
+    @property
+    def built(self) -> bool:
+        """Whether the index has been populated"""
+        return self._built
+
+    def _scores_of(self, row: Dict[str, Any]) -> Tuple[float, ...]:
+        scores = tuple(float(row[s]) for s in self.subjects)
+        return scores + (sum(scores),)
+
+    def _insert(self, rollno: int, scores: Tuple[float, ...]):
+        self._scores[rollno] = scores
+        for ranking, score in zip(self.rankings, scores):
+            self._sorted[ranking].add((-score, rollno))
+
+    def _remove(self, rollno: int) -> Optional[Tuple[float, ...]]:
+        scores = self._scores.pop(rollno, None)
+        if scores is not None:
+            for ranking, score in zip(self.rankings, scores):
+                self._sorted[ranking].discard((-score, rollno))
+        return scores
+
+    def build(self, marks: Iterable[Dict[str, Any]]):
+        """(Re)build the index from marks rows
+
+        The rankings are built aside and swapped in only once marks has been
+        read to the end, so an error while reading leaves the index as it was.
+        The lock is held throughout, so a write made during the load waits
+        and is applied on top of it.
+        """
+        with self._lock:
+            scores = {row['rollno']: self._scores_of(row) for row in marks}
+            rankings = {
+                ranking: SortedList((-s[i], rollno) for rollno, s in scores.items())
+                for i, ranking in enumerate(self.rankings)
+            }
+            self._scores = scores
+            self._sorted = rankings
+            self._built = True
+
+    def ensure_built(self, loader: Callable[[], Iterable[Dict[str, Any]]]):
+        """Build the index from loader() on first use
+
+        loader must raise on a read error; the index then stays unbuilt and
+        the next call tries again.
+        """
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build(loader())
+
+    def reset(self):
+        """Drop everything; the next ensure_built() loads the index again"""
+        with self._lock:
+            self._built = False
+            self._scores = {}
+            self._sorted = {r: SortedList() for r in self.rankings}
+
+    def refresh(self, rollnos: Iterable[int], marks: Iterable[Dict[str, Any]]):
+        """Replace the entries of rollnos with the given current marks rows
+
+        Roll numbers without a row are dropped from every ranking.
+        """
+        with self._lock:
+            if not self._built:
+                return
+            for rollno in rollnos:
+                self._remove(rollno)
+            for row in marks:
+                self._remove(row['rollno'])
+                self._insert(row['rollno'], self._scores_of(row))
+
+    def add(self, row: Dict[str, Any]):
+        """Index (or re-index) a marks row"""
+        # Checked under the lock, so a write during a build is not lost
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(row['rollno'])
+            self._insert(row['rollno'], self._scores_of(row))
+
+    def remove(self, rollno: int):
+        """Drop a student from every ranking"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(rollno)
+
+    def update(self, rollno: int, **fields):
+        """Apply changed subject marks to an indexed student"""
+        with self._lock:
+            if not self._built:
+                return
+            scores = self._remove(rollno)
+            if scores is None:
+                return
+            row = dict(zip(self.subjects, scores))
+            row.update({k: v for k, v in fields.items() if k in self.subjects})
+            self._insert(rollno, self._scores_of(row))
+
+    def _check(self, ranking: str):
+        if ranking not in self._sorted:
+            raise ValueError(f"Unknown ranking '{ranking}', expected one of: {', '.join(self.rankings)}")
+
+    def top(self, ranking: str = TOTAL, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """Return the best `limit` students of a ranking after skipping `offset`"""
+        self._check(ranking)
+        with self._lock:
+            entries = self._sorted[ranking]
+            page = list(entries.islice(offset, offset + limit))
+            return [
+                {"rollno": rollno, "score": -neg, "rank": entries.bisect_left((neg,)) + 1}
+                for neg, rollno in page
+            ]
+
+    def rank(self, rollno: int) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Return score, rank and percentile of a student in every ranking
+
+        The percentile is the share of students scoring strictly lower.
+        """
+        with self._lock:
+            scores = self._scores.get(rollno)
+            if scores is None:
+                return None
+            count = len(self._scores)
+            result = {}
+            for ranking, score in zip(self.rankings, scores):
+                entries = self._sorted[ranking]
+                below = count - entries.bisect_right((-score, float("inf")))
+                result[ranking] = {
+                    "score": score,
+                    "rank": entries.bisect_left((-score,)) + 1,
+                    "percentile": round(below / count * 100, 2),
+                    "out_of": count
+                }
+            return result
+
+    def __len__(self) -> int:
+        return len(self._scores)
@@ -0,0 +1,225 @@
+"""
+In-process n-gram/prefix search index over student names
+"""
+import heapq
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+SEARCH_FIELDS = ("name", "father")
+NGRAM_SIZE = 3
+
+
+def _ngrams(value: str) -> Set[str]:
+    """Return the set of trigrams of a value"""
+    return {value[i:i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)}
+
+
+class StudentSearchIndex:
+    """Trigram + word-prefix index over the searchable student fields
+
+    Queries of three or more characters are answered by intersecting trigram
+    posting sets and verifying the substring; shorter queries match word
+    prefixes through a sorted token list.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._docs: Dict[int, Dict[str, str]] = {}
+        self._grams: Dict[str, Dict[str, Set[int]]] = {f: {} for f in SEARCH_FIELDS}
+        self._tokens: Dict[str, List[Tuple[str, int]]] = {f: [] for f in SEARCH_FIELDS}
+
+    @property
+    def built(self) -> bool:
+        """Whether the index has been populated"""
+        return self._built
+
+    def build(self, students: Iterable[Dict[str, Any]]):
+        """(Re)build the index from student rows
+
+        Rows are indexed into fresh structures that replace the current ones
+        only after the whole load succeeded, so a failed load (the error is
+        raised) leaves the index as it was. The lock is held throughout, so
+        a write made during the load waits and is applied on top of it.
+        """
+        with self._lock:
+            fresh = StudentSearchIndex()
+            for student in students:
+                fresh._add(student, sort_tokens=False)
+            for field in SEARCH_FIELDS:
+                fresh._tokens[field].sort()
+
+            self._docs, self._grams, self._tokens = fresh._docs, fresh._grams, fresh._tokens
+            self._built = True
+
+    def ensure_built(self, loader: Callable[[], Iterable[Dict[str, Any]]]):
+        """Build the index from loader() on first use
+
+        If loading fails the error is raised and the index stays unbuilt, so
+        the next call tries again.
+        """
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build(loader())
+
+    def reset(self):
+        """Drop everything; the next ensure_built() loads the index again"""
+        with self._lock:
+            self._built = False
+            self._docs = {}
+            self._grams = {f: {} for f in SEARCH_FIELDS}
+            self._tokens = {f: [] for f in SEARCH_FIELDS}
+
+    def refresh(self, rollnos: Iterable[int], students: Iterable[Dict[str, Any]]):
+        """Replace the entries of rollnos with the given current rows
+
+        Roll numbers without a row are dropped from the index.
+        """
+        with self._lock:
+            if not self._built:
+                return
+            for rollno in rollnos:
+                self._remove(rollno)
+            for student in students:
+                self._remove(student['rollno'])
+                self._add(student)
+
+    def add(self, student: Dict[str, Any]):
+        """Index (or re-index) a student row"""
+        # Checked under the lock, so a write during a build is not lost
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(student['rollno'])
+            self._add(student)
+
+    def remove(self, rollno: int):
+        """Drop a student from the index"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(rollno)
+
+    def update(self, rollno: int, **fields):
+        """Apply changed field values to an indexed student"""
+        with self._lock:
+            if not self._built:
+                return
+            doc = self._docs.get(rollno)
+            if doc is None:
+                return
+            changed = {f: fields[f] for f in SEARCH_FIELDS if f in fields}
+            if changed:
+                self._remove(rollno)
+                self._add({'rollno': rollno, **doc, **changed})
+
+    def search(self, query: str, field: str = "name", offset: int = 0,
+               limit: int = 20) -> Tuple[List[int], int]:
+        """Return (ranked roll numbers for the page, total match count)"""
+        if field not in SEARCH_FIELDS:
+            raise ValueError(f"Unsupported search field: {field}")
+
+        query = query.strip().upper()
+        if not query:
+            return [], 0
+
+        with self._lock:
+            if len(query) >= NGRAM_SIZE:
+                candidates = self._trigram_candidates(field, query)
+            else:
+                candidates = self._prefix_candidates(field, query)
+
+            docs = self._docs
+            ranked = heapq.nsmallest(
+                offset + limit,
+                ((self._score(docs[r][field], query), r) for r in candidates)
+            )
+
+        page = [rollno for _, rollno in ranked[offset:]]
+        return page, len(candidates)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _add(self, student: Dict[str, Any], sort_tokens: bool = True):
+        rollno = student['rollno']
+        doc = {f: (student.get(f) or "").upper() for f in SEARCH_FIELDS}
+        self._docs[rollno] = doc
+
+        for field, value in doc.items():
+            postings = self._grams[field]
+            for gram in _ngrams(value):
+                postings.setdefault(gram, set()).add(rollno)
+
+            tokens = self._tokens[field]
+            for word in set(value.split()):
+                entry = (word, rollno)
+                if sort_tokens:
+                    tokens.insert(bisect_left(tokens, entry), entry)
+                else:
+                    tokens.append(entry)
+
+    def _remove(self, rollno: int):
+        doc = self._docs.pop(rollno, None)
+        if doc is None:
+            return
+
+        for field, value in doc.items():
+            postings = self._grams[field]
+            for gram in _ngrams(value):
+                bucket = postings.get(gram)
+                if bucket is not None:
+                    bucket.discard(rollno)
+                    if not bucket:
+                        del postings[gram]
+
+            tokens = self._tokens[field]
+            for word in set(value.split()):
+                i = bisect_left(tokens, (word, rollno))
+                if i < len(tokens) and tokens[i] == (word, rollno):
+                    del tokens[i]
+
+    def _trigram_candidates(self, field: str, query: str) -> Set[int]:
+        postings = self._grams[field]
+        buckets = []
+        for gram in _ngrams(query):
+            bucket = postings.get(gram)
+            if not bucket:
+                return set()
+            buckets.append(bucket)
+
+        buckets.sort(key=len)
+        candidates = set(buckets[0])
+        for bucket in buckets[1:]:
+            candidates &= bucket
+            if not candidates:
+                return candidates
+
+        # Trigram hits are necessary but not sufficient; confirm the substring
+        return {r for r in candidates if query in self._docs[r][field]}
+
+    def _prefix_candidates(self, field: str, query: str) -> Set[int]:
+        tokens = self._tokens[field]
+        candidates = set()
+        i = bisect_left(tokens, (query,))
+        while i < len(tokens) and tokens[i][0].startswith(query):
+            candidates.add(tokens[i][1])
+            i += 1
+        return candidates
+
+    @staticmethod
+    def _score(value: str, query: str) -> int:
+        """Lower is better: exact, prefix, word prefix, substring"""
+        if value == query:
+            return 0
+        if value.startswith(query):
+            return 1
+        if f" {query}" in value:
+            return 2
+        return 3
+
+
+# Global search index instance
+student_index = StudentSearchIndex()
@@ -0,0 +1,112 @@
+"""
+Class-wide marks statistics computed with NumPy
+"""
+import os
+import threading
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from models.marks import Marks, iter_pages
+from models.version import data_version
+
+# Minimum mark needed to pass a subject, overridable from .env
+PASS_MARK = float(os.getenv("PASS_MARK", "40"))
+HISTOGRAM_BANDS = 10
+
+# NumPy is imported on first computation to keep it out of application startup
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _summary(values: "np.ndarray", pass_mark: float, top: float) -> List[Dict[str, Any]]:
+    """Describe the columns of a (students x columns) array scored out of top"""
+    import numpy as np
+    
+    bins = np.linspace(0, top, HISTOGRAM_BANDS + 1)
+    counts = [np.histogram(values[:, i], bins=bins)[0].tolist() for i in range(values.shape[1])]
+    columns = zip(
+        values.mean(axis=0), np.median(values, axis=0), values.std(axis=0),
+        values.min(axis=0), values.max(axis=0), (values >= pass_mark).mean(axis=0), counts
+    )
+    return [
+        {
+            "mean": round(float(mean), 2),
+            "median": round(float(median), 2),
+            "std": round(float(std), 2),
+            "min": float(low),
+            "max": float(high),
+            "pass_rate": round(float(rate) * 100, 2),
+            "histogram": {"bins": bins.tolist(), "counts": hist}
+        }
+        for mean, median, std, low, high, rate, hist in columns
+    ]
+
+
+def compute_stats(marks: "np.ndarray", pass_mark: float = PASS_MARK) -> Dict[str, Any]:
+    """Compute per-subject and overall statistics from a marks array
+
+    marks has one row per student and one column per entry in Marks.SUBJECTS.
+    A student passes overall when every subject is at least pass_mark.
+    """
+    count = len(marks)
+    if count == 0:
+        return {"count": 0, "pass_mark": pass_mark, "subjects": {}, "total": None}
+
+    subjects = _summary(marks, pass_mark, 100)
+
+    max_total = 100 * len(Marks.SUBJECTS)
+    totals = marks.sum(axis=1, keepdims=True)
+    total = _summary(totals, max_total * pass_mark / 100, max_total)[0]
+    total["pass_rate"] = round(float((marks >= pass_mark).all(axis=1).mean()) * 100, 2)
+    total["mean_percentage"] = round(total["mean"] / max_total * 100, 2)
+
+    return {
+        "count": count,
+        "pass_mark": pass_mark,
+        "subjects": dict(zip(Marks.SUBJECTS, subjects)),
+        "total": total
+    }
+
+
+class ClassStats:
+    """Statistics over the marks table, cached until the next write"""
+
+    _lock = threading.Lock()
+    _version = None
+    _result = None
+
+    @staticmethod
+    def load_marks() -> "np.ndarray":
+        """Read every marks row into a (students x subjects) float array"""
+        import numpy as np
+        
+        rows = iter_pages(Marks.fetch_page, columns=Marks.MARK_COLUMNS)
+        flat = np.fromiter(
+            (row[subject] for row in rows for subject in Marks.SUBJECTS), dtype=float
+        )
+        return flat.reshape(-1, len(Marks.SUBJECTS))
+
+    @staticmethod
+    def compute() -> Dict[str, Any]:
+        """Return statistics for the current data version (read errors are raised)
+
+        Only a complete load is cached, so a failed read is retried on the
+        next call instead of serving partial numbers until the next write.
+        """
+        version = data_version.token
+        with ClassStats._lock:
+            if ClassStats._version == version:
+                return ClassStats._result
+
+            result = compute_stats(ClassStats.load_marks())
+            result["version"] = version
+            ClassStats._version = version
+            ClassStats._result = result
+            return result
+
+    @staticmethod
+    def get() -> Optional[Dict[str, Any]]:
+        """Return statistics for the current data version, or None on error"""
+        try:
+            return ClassStats.compute()
+        except Exception as e:
+            print(f"❌ Error computing statistics: {e}")
+            return None
@@ -1,8 +1,36 @@
 """
 Student model for database operations
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Set, Sequence
 from config.database import db
+from models.cache import LRUCache
+from models.version import data_version
+from models.events import change_feed, INSERT, UPDATE, DELETE
+from models.search_index import student_index
+
+# Postgres SQLSTATE for unique_violation
+UNIQUE_VIOLATION = "23505"
+
+
+class DuplicateRollNoError(ValueError):
+    """Raised when a roll number is already taken"""
+
+
+def is_unique_violation(error: Exception) -> bool:
+    """Check whether a database error was caused by a unique constraint"""
+    return getattr(error, "code", None) == UNIQUE_VIOLATION or "duplicate key" in str(error)
+
+
+def select_clause(columns: Optional[Sequence[str]]) -> str:
+    """Build a select() argument; None selects every column"""
+    return ",".join(columns) if columns else "*"
+
+
+def project(row: Dict[str, Any], columns: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Copy a row, keeping only the given columns (all of them if None)"""
+    if not columns:
+        return dict(row)
+    return {c: row[c] for c in columns if c in row}
 
 
 class Student:
@@ -10,6 +38,13 @@ class Student:
     
     TABLE_NAME = "students"
     
+    # Columns safe to show or send to clients (everything except the password)
+    PUBLIC_COLUMNS = ("rollno", "name", "father")
+    
+    # Per-rollno lookup cache, invalidated by every write below and by
+    # writes from elsewhere once the data version shows them
+    _cache = LRUCache()
+    
     def __init__(self, rollno: int, name: str, father: str, password: str):
         self.rollno = rollno
         self.name = name.upper()
@@ -29,44 +64,202 @@ class Student:
     def create(rollno: int, name: str, father: str, password: str) -> bool:
         """Create a new student record"""
         try:
-            # Check if student already exists
-            existing = db.client.table(Student.TABLE_NAME).select("rollno").eq("rollno", rollno).execute()
-            
-            if existing.data:
-                print("❌ Student with this roll number already exists")
-                return False
-            
             student = Student(rollno, name, father, password)
-            result = db.client.table(Student.TABLE_NAME).insert(student.to_dict()).execute()
+            result = db.backend.table(Student.TABLE_NAME).insert(student.to_dict()).execute()
+            Student._cache.invalidate(rollno)
+            data_version.bump()
             
             if result.data:
+                student_index.add(result.data[0])
+                change_feed.publish(INSERT, rollno, project(result.data[0], Student.PUBLIC_COLUMNS))
                 print("✅ Student record created successfully")
                 return True
             return False
         except Exception as e:
+            if is_unique_violation(e):
+                print("❌ Student with this roll number already exists")
+            else:
+                print(f"❌ Error creating student: {e}")
+            return False
+    
+    @staticmethod
+    def create_with_marks(rollno: int, name: str, father: str, password: str,
+                          dsp: float, iot: float, android: float,
+                          compiler: float, minor: float) -> bool:
+        """Create a student and their marks atomically in one round trip
+        
+        Both rows are written by the create_student_with_marks database
+        function inside a single transaction. A taken roll number is reported
+        by the primary key constraint and raised as DuplicateRollNoError.
+        """
+        from models.marks import Marks
+        
+        try:
+            student = Student(rollno, name, father, password)
+            params = {f"p_{k}": v for k, v in student.to_dict().items()}
+            params.update({
+                "p_dsp": dsp,
+                "p_iot": iot,
+                "p_android": android,
+                "p_compiler": compiler,
+                "p_minor": minor
+            })
+            
+            db.backend.rpc("create_student_with_marks", params).execute()
+            Student._cache.invalidate(rollno)
+            Marks._cache.invalidate(rollno)
+            data_version.bump()
+            
+            student_index.add(student.to_dict())
+            marks = {"rollno": rollno, "dsp": dsp, "iot": iot, "android": android,
+                     "compiler": compiler, "minor": minor}
+            Marks._ranks.add(marks)
+            change_feed.publish(INSERT, rollno, {**project(student.to_dict(), Student.PUBLIC_COLUMNS), **marks})
+            print("✅ Student and marks created successfully")
+            return True
+        except Exception as e:
+            if is_unique_violation(e):
+                raise DuplicateRollNoError(f"Student with roll number {rollno} already exists")
             print(f"❌ Error creating student: {e}")
             return False
     
     @staticmethod
-    def get_by_rollno(rollno: int) -> Optional[Dict[str, Any]]:
-        """Get student by roll number"""
+    def create_many_with_marks(records: List[Dict[str, Any]]) -> int:
+        """Insert several students and their marks in one transaction
+        
+        Both tables are written by the create_students_with_marks database
+        function, so a failing row rolls back the whole call and never leaves
+        a student without marks. Errors are raised so bulk callers can
+        isolate bad rows. Returns the number of students inserted.
+        """
+        from models.marks import Marks
+        
+        if not records:
+            return 0
+        
+        rows = [
+            {**Student(r['rollno'], r['name'], r['father'], r['password']).to_dict(),
+             **Marks(r['rollno'], *(r[subject] for subject in Marks.SUBJECTS)).to_dict()}
+            for r in records
+        ]
+        db.backend.rpc("create_students_with_marks", {"p_rows": rows}).execute()
+        
+        for row in rows:
+            Student._cache.invalidate(row['rollno'])
+            Marks._cache.invalidate(row['rollno'])
+        data_version.bump()
+        for row in rows:
+            student_index.add(row)
+            Marks._ranks.add(row)
+            change_feed.publish(INSERT, row['rollno'], project(row, Marks.DETAIL_COLUMNS))
+        return len(rows)
+    
+    @staticmethod
+    def existing_rollnos(rollnos: List[int]) -> Set[int]:
+        """Return which of the given roll numbers already exist"""
+        if not rollnos:
+            return set()
+        result = db.backend.table(Student.TABLE_NAME).select("rollno").in_("rollno", rollnos).execute()
+        return {row['rollno'] for row in result.data or []}
+    
+    @staticmethod
+    def _fetch_by_rollno(rollno: int) -> Optional[Dict[str, Any]]:
+        """Fetch a single row from the database, bypassing the cache"""
+        result = db.backend.table(Student.TABLE_NAME).select("*").eq("rollno", rollno).execute()
+        return result.data[0] if result.data else None
+    
+    @staticmethod
+    def fetch_by_rollno(rollno: int, columns: Sequence[str] = None) -> Optional[Dict[str, Any]]:
+        """Get student by roll number (read-through cached), raising on errors
+        
+        The cache always holds the full row; columns only shapes the result.
+        """
+        data_version.sync()
+        row = Student._cache.get_or_load(rollno, lambda: Student._fetch_by_rollno(rollno))
+        return project(row, columns) if row else None
+    
+    @staticmethod
+    def get_by_rollno(rollno: int, columns: Sequence[str] = None) -> Optional[Dict[str, Any]]:
+        """Get student by roll number (see fetch_by_rollno), or None on errors"""
         try:
-            result = db.client.table(Student.TABLE_NAME).select("*").eq("rollno", rollno).execute()
-            return result.data[0] if result.data else None
+            return Student.fetch_by_rollno(rollno, columns)
         except Exception as e:
             print(f"❌ Error fetching student: {e}")
             return None
     
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
-        """Get all students"""
+    def get_all(columns: Sequence[str] = None) -> List[Dict[str, Any]]:
+        """Get all students, optionally only some columns"""
         try:
-            result = db.client.table(Student.TABLE_NAME).select("*").order("rollno").execute()
+            result = db.backend.table(Student.TABLE_NAME).select(select_clause(columns)).order("rollno").execute()
             return result.data if result.data else []
         except Exception as e:
             print(f"❌ Error fetching students: {e}")
             return []
     
+    @staticmethod
+    def fetch_page(limit: int = 100, after: Optional[int] = None,
+                   columns: Sequence[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get one keyset page of students ordered by roll number
+
+        Returns the rows and the cursor for the next page (None on the last page).
+        columns must include rollno, which the cursor is taken from. Unlike
+        get_page(), errors are raised, so a stream built on it never mistakes
+        a failed read for the last page.
+        """
+        query = db.backend.table(Student.TABLE_NAME).select(select_clause(columns))
+        if after is not None:
+            query = query.gt("rollno", after)
+        result = query.order("rollno").limit(limit + 1).execute()
+        rows = result.data if result.data else []
+        
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1]['rollno']
+        return rows, None
+    
+    @staticmethod
+    def get_page(limit: int = 100, after: Optional[int] = None,
+                 columns: Sequence[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get one keyset page of students ordered by roll number (see fetch_page)"""
+        try:
+            return Student.fetch_page(limit, after, columns)
+        except Exception as e:
+            print(f"❌ Error fetching students: {e}")
+            return [], None
+    
+    @staticmethod
+    def fetch_by_rollnos(rollnos: List[int], columns: Sequence[str] = None) -> List[Dict[str, Any]]:
+        """Get students for a list of roll numbers, raising on errors"""
+        if not rollnos:
+            return []
+        result = db.backend.table(Student.TABLE_NAME).select(select_clause(columns)).in_("rollno", rollnos).execute()
+        return result.data if result.data else []
+    
+    @staticmethod
+    def get_by_rollnos(rollnos: List[int], columns: Sequence[str] = None) -> List[Dict[str, Any]]:
+        """Get students for a list of roll numbers, or [] on errors"""
+        try:
+            return Student.fetch_by_rollnos(rollnos, columns)
+        except Exception as e:
+            print(f"❌ Error fetching students: {e}")
+            return []
+    
+    @staticmethod
+    def search(query: str, field: str = "name", offset: int = 0,
+               limit: int = 20) -> Tuple[List[int], int]:
+        """Search names via the in-process index, returning (rollnos, total)"""
+        Student.ensure_indexed()
+        return student_index.search(query, field, offset, limit)
+    
+    @staticmethod
+    def ensure_indexed():
+        """Build the search index on first use (read errors are raised)"""
+        from models.marks import iter_pages
+        
+        data_version.sync()
+        student_index.ensure_built(lambda: iter_pages(Student.fetch_page, columns=Student.PUBLIC_COLUMNS))
+    
     @staticmethod
     def update(rollno: int, **kwargs) -> bool:
         """Update student record"""
@@ -77,9 +270,13 @@ class Student:
             if 'father' in kwargs:
                 kwargs['father'] = kwargs['father'].upper()
             
-            result = db.client.table(Student.TABLE_NAME).update(kwargs).eq("rollno", rollno).execute()
+            result = db.backend.table(Student.TABLE_NAME).update(kwargs).eq("rollno", rollno).execute()
+            Student._cache.invalidate(rollno)
+            data_version.bump()
             
             if result.data:
+                student_index.update(rollno, **kwargs)
+                change_feed.publish(UPDATE, rollno, project(result.data[0], Student.PUBLIC_COLUMNS))
                 print("✅ Student record updated successfully")
                 return True
             return False
@@ -89,11 +286,19 @@ class Student:
     
     @staticmethod
     def delete(rollno: int) -> bool:
-        """Delete student record"""
+        """Delete student record (their marks are removed by the cascade)"""
+        from models.marks import Marks
+        
         try:
-            result = db.client.table(Student.TABLE_NAME).delete().eq("rollno", rollno).execute()
+            result = db.backend.table(Student.TABLE_NAME).delete().eq("rollno", rollno).execute()
+            Student._cache.invalidate(rollno)
+            Marks._cache.invalidate(rollno)
+            data_version.bump()
             
             if result.data:
+                student_index.remove(rollno)
+                Marks._ranks.remove(rollno)
+                change_feed.publish(DELETE, rollno)
                 print("✅ Student record deleted successfully")
                 return True
             return False
@@ -101,6 +306,31 @@ class Student:
             print(f"❌ Error deleting student: {e}")
             return False
     
+    @staticmethod
+    def delete_many(rollnos: List[int]) -> List[int]:
+        """Delete several students (and, by the cascade, their marks) in one query
+        
+        Unlike delete(), errors are raised so bulk callers can report them.
+        Returns the roll numbers that existed and were deleted.
+        """
+        from models.marks import Marks
+        
+        if not rollnos:
+            return []
+        
+        result = db.backend.table(Student.TABLE_NAME).delete().in_("rollno", rollnos).execute()
+        for rollno in rollnos:
+            Student._cache.invalidate(rollno)
+            Marks._cache.invalidate(rollno)
+        data_version.bump()
+        
+        deleted = [row['rollno'] for row in result.data or []]
+        for rollno in deleted:
+            student_index.remove(rollno)
+            Marks._ranks.remove(rollno)
+            change_feed.publish(DELETE, rollno)
+        return deleted
+    
     @staticmethod
     def verify_credentials(rollno: int, name: str, password: str) -> bool:
         """Verify student credentials"""
@@ -115,3 +345,30 @@ class Student:
         except Exception as e:
             print(f"❌ Error verifying credentials: {e}")
             return False
+    
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        """Get hit/miss counters of the per-rollno cache"""
+        return Student._cache.stats()
+    
+    @staticmethod
+    def _forget_changed(rollnos: Optional[Set[int]]):
+        """Drop cached rows written since the last data version read"""
+        if rollnos is None:
+            Student._cache.clear()
+            return
+        for rollno in rollnos:
+            Student._cache.invalidate(rollno)
+    
+    @staticmethod
+    def _reindex_changed(rollnos: Optional[Set[int]]):
+        """Re-read students written since the last data version read into the search index"""
+        if rollnos is None:
+            student_index.reset()
+        elif student_index.built:
+            rows = Student.fetch_by_rollnos(sorted(rollnos), Student.PUBLIC_COLUMNS)
+            student_index.refresh(rollnos, rows)
+
+
+data_version.subscribe(Student._forget_changed)
+data_version.subscribe(Student._reindex_changed)
@@ -0,0 +1,157 @@
+"""
+Data version of the students and marks tables, read from the database
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional, Set, Tuple
+from config.database import db
+
+# Seconds a version read from the database is trusted before it is read again
+DATA_VERSION_TTL_SECONDS = float(os.getenv("DATA_VERSION_TTL_SECONDS", "1"))
+
+# Changes applied roll number by roll number; listeners start over beyond this
+MAX_CHANGES_PER_SYNC = int(os.getenv("MAX_CHANGES_PER_SYNC", "1000"))
+
+# Tables maintained by the triggers on students and marks
+VERSION_TABLE = "data_version"
+CHANGES_TABLE = "data_changes"
+
+# Called with the changed roll numbers, or None when they are unknown
+Listener = Callable[[Optional[Set[int]]], None]
+
+
+class DataVersion:
+    """Identifies the current state of the data, whichever process wrote it
+
+    Triggers on students and marks bump a version row and log the roll
+    number of every row written, so writes from the CLI, the importer,
+    other workers or plain SQL are all counted. The version is read again
+    at most every ttl seconds, and right after a write made through this
+    process. When it has moved, listeners are called with the changed roll
+    numbers (or None if the log no longer covers the gap) before the new
+    version is handed out, so per-process caches and indexes never lag
+    behind the token that tags a response.
+    """
+
+    def __init__(self, ttl: float = DATA_VERSION_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._listeners: List[Listener] = []
+        self.reset()
+
+    def reset(self):
+        """Forget the version seen so far; the next read starts over"""
+        with self._lock:
+            # The epoch is chosen when the version table is created, so a
+            # recreated database never repeats an earlier token
+            self._epoch: Optional[int] = None
+            self._version: Optional[int] = None
+            self._modified = time.time()
+            self._checked = 0.0
+            self._dirty = True
+            self._failed = False
+
+    def subscribe(self, listener: Listener):
+        """Call listener(rollnos) whenever the data changes"""
+        self._listeners.append(listener)
+
+    def bump(self):
+        """Record that this process has written; the next read checks the database"""
+        self._dirty = True
+
+    @property
+    def stale(self) -> bool:
+        """Whether the next read has to go to the database"""
+        return self._dirty or time.monotonic() - self._checked >= self.ttl
+
+    def sync(self):
+        """Read the version from the database if it is stale
+
+        A failed read is reported once and leaves the version unverified
+        (see snapshot) until a later read succeeds.
+        """
+        if not self.stale:
+            return
+        with self._lock:
+            if not self.stale:
+                return
+            # A write landing during the read sets it again
+            self._dirty = False
+            try:
+                self._refresh()
+                self._failed = False
+            except Exception as e:
+                if not self._failed:
+                    print(f"❌ Error reading data version: {e}")
+                self._failed = True
+            self._checked = time.monotonic()
+
+    def snapshot(self) -> Tuple[str, float]:
+        """Return (token, last modified) as last read, without a database call
+
+        While the version is unverified every call returns a fresh token, so
+        nothing is served from, or stored in, a cache keyed on it.
+        """
+        with self._lock:
+            if self._failed or self._version is None:
+                return f"unverified-{uuid.uuid4().hex}", time.time()
+            return f"{self._epoch:x}-{self._version}", self._modified
+
+    def current(self) -> Tuple[str, float]:
+        """Return (token, last modified), reading the database if stale"""
+        self.sync()
+        return self.snapshot()
+
+    @property
+    def token(self) -> str:
+        """Opaque identifier of the current data version"""
+        return self.current()[0]
+
+    @property
+    def last_modified(self) -> float:
+        """Unix time at which this process first saw the current version
+
+        That is never before the write committed, so a client's
+        If-Modified-Since can only err towards a needless refetch.
+        """
+        return self.current()[1]
+
+    def _refresh(self):
+        rows = (db.backend.table(VERSION_TABLE).select("epoch,version")
+                .eq("id", 1).execute().data)
+        if not rows:
+            raise RuntimeError(f"{VERSION_TABLE} table is empty")
+        epoch, version = rows[0]["epoch"], rows[0]["version"]
+        if (epoch, version) == (self._epoch, self._version):
+            return
+
+        self._notify(self._changes(epoch, version))
+        self._epoch, self._version = epoch, version
+        self._modified = time.time()
+
+    def _changes(self, epoch: int, version: int) -> Optional[Set[int]]:
+        """Roll numbers written since the last read, or None if unknown"""
+        if epoch != self._epoch or version < self._version:
+            return None
+        if version - self._version > MAX_CHANGES_PER_SYNC:
+            return None
+        rows = (db.backend.table(CHANGES_TABLE).select("rollno")
+                .gt("version", self._version).lte("version", version).execute().data or [])
+        # Old entries are pruned; a gap means some changes are unknown
+        if len(rows) != version - self._version:
+            return None
+        return {row["rollno"] for row in rows}
+
+    def _notify(self, rollnos: Optional[Set[int]]):
+        for listener in self._listeners:
+            try:
+                listener(rollnos)
+            except Exception:
+                # A listener that cannot apply the changes starts over instead
+                listener(None)
+
+
+# Global data version instance
+data_version = DataVersion()
@@ -6,11 +6,14 @@ from .student_ops import (
     update_student,
     delete_student
 )
+from .bulk_ops import bulk_import, import_students
 
 __all__ = [
     'accept_student',
     'display_students_data',
     'search_student',
     'update_student',
-    'delete_student'
+    'delete_student',
+    'bulk_import',
+    'import_students'
 ]
@@ -0,0 +1,332 @@
+"""
+Batch operations - non-interactive subcommands for scripts and pipelines
+
+Every command writes machine-readable results to stdout (one JSON object
+per line unless noted) and per-record errors as JSON lines to stderr. The
+models' progress messages are sent to stderr as well, so stdout can be
+piped. Exit status is 0 on success, 1 if any record failed and 2 on bad
+usage.
+"""
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, Iterator, List
+from config.database import db
+from models.student import Student, project
+from models.marks import Marks
+from models.patch import StudentPatch
+from models.stats import ClassStats
+from operations.bulk_ops import bulk_import, DEFAULT_BATCH_SIZE
+
+# Roll numbers per query for get and delete
+LOOKUP_BATCH_SIZE = 500
+# Concurrent single-student update transactions
+DEFAULT_UPDATE_JOBS = 4
+
+EXPORT_FORMATS = ("xlsx", "pdf", "csv", "json")
+
+
+def emit(stream: IO, obj: Any):
+    """Write one JSON line"""
+    stream.write(json.dumps(obj, default=str) + "\n")
+
+
+def chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def parse_object(number: int, line: str) -> Dict[str, Any]:
+    """Parse one JSON-lines line that must hold an object"""
+    try:
+        obj = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"line {number}: invalid JSON ({e.msg})")
+    if not isinstance(obj, dict):
+        raise ValueError(f"line {number}: expected a JSON object")
+    return obj
+
+
+def read_objects(stream: IO) -> Iterator[Dict[str, Any]]:
+    """Parse JSON lines (blank lines are skipped)"""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if line:
+            yield parse_object(number, line)
+
+
+def to_rollno(value: Any, where: str) -> int:
+    """Convert an argument or stdin value to a roll number"""
+    if isinstance(value, bool):
+        raise ValueError(f"{where}: invalid roll number {value!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: invalid roll number {value!r}")
+
+
+def read_rollnos(values: List[str], stream: IO) -> List[int]:
+    """Roll numbers from the arguments, or one per stdin line (bare or {"rollno": ...})"""
+    if values:
+        return [to_rollno(value, "argument") for value in values]
+
+    rollnos = []
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        value = line
+        if line.startswith("{"):
+            obj = parse_object(number, line)
+            if "rollno" not in obj:
+                raise ValueError(f"line {number}: missing rollno")
+            value = obj["rollno"]
+        rollnos.append(to_rollno(value, f"line {number}"))
+    return rollnos
+
+
+def add_student_arguments(parser: argparse.ArgumentParser, required: bool):
+    for field in ("name", "father", "password"):
+        parser.add_argument(f"--{field}", required=required)
+    for subject in Marks.SUBJECTS:
+        parser.add_argument(f"--{subject}", type=float, required=required)
+
+
+def cmd_add(args, out: IO, err: IO) -> int:
+    """Add students from flags or from JSON lines on stdin, in batches"""
+    import pandas as pd
+    from utils.importer import validate_import_frame
+
+    if args.rollno is not None:
+        fields = ("rollno", "name", "father", "password") + Marks.SUBJECTS
+        missing = [f for f in fields if getattr(args, f) is None]
+        if missing:
+            raise ValueError(f"missing --{', --'.join(missing)}")
+        rows = [{f: getattr(args, f) for f in fields}]
+    else:
+        rows = list(read_objects(sys.stdin))
+        if not rows:
+            raise ValueError("no students given on stdin")
+
+    records, errors = validate_import_frame(pd.DataFrame(rows))
+    report = bulk_import(records, errors, args.batch_size)
+    emit(out, report)
+    return 1 if report["failed"] else 0
+
+
+def cmd_import(args, out: IO, err: IO) -> int:
+    """Import a CSV, XLSX or JSON file (or stdin with --format)"""
+    from utils.importer import read_import_file, validate_import_frame
+
+    if args.file == "-":
+        if not args.format:
+            raise ValueError("--format is required when reading from stdin")
+        source = sys.stdin.buffer if args.format == "xlsx" else sys.stdin
+    else:
+        source = args.file
+
+    records, errors = validate_import_frame(read_import_file(source, args.format))
+    report = bulk_import(records, errors, args.batch_size)
+    emit(out, report)
+    return 1 if report["failed"] else 0
+
+
+def cmd_get(args, out: IO, err: IO) -> int:
+    """Print students with their marks, one query per table per batch"""
+    rollnos = read_rollnos(args.rollnos, sys.stdin)
+    status = 0
+    for batch in chunks(rollnos, LOOKUP_BATCH_SIZE):
+        students = {s['rollno']: s for s in Student.fetch_by_rollnos(batch, Student.PUBLIC_COLUMNS)}
+        marks = {m['rollno']: m for m in Marks.fetch_by_rollnos(batch, Marks.MARK_COLUMNS)}
+        for rollno in batch:
+            if rollno in students:
+                emit(out, {**students[rollno], **marks.get(rollno, {})})
+            else:
+                emit(err, {"rollno": rollno, "error": "Student not found"})
+                status = 1
+    return status
+
+
+def _update_one(change: Dict[str, Any]) -> Dict[str, Any]:
+    change = dict(change)
+    rollno = int(change.pop("rollno"))
+    patch = StudentPatch(rollno).set(**change)
+    if not patch.pending:
+        return {"rollno": rollno, "error": "Nothing to update"}
+    row = patch.flush()
+    if row is None:
+        return {"rollno": rollno, "error": "Student not found or update failed"}
+    return {"row": project(row, Marks.DETAIL_COLUMNS)}
+
+
+def cmd_update(args, out: IO, err: IO) -> int:
+    """Apply field changes from flags or JSON lines; one transaction per student"""
+    fields = ("name", "father", "password") + Marks.SUBJECTS
+    change = {f: getattr(args, f) for f in fields if getattr(args, f) is not None}
+    if args.rollno is not None:
+        changes = [{"rollno": args.rollno, **change}]
+    elif change:
+        raise ValueError(f"--{', --'.join(change)} given without a roll number")
+    else:
+        changes = list(read_objects(sys.stdin))
+
+    def safe_update(change):
+        try:
+            return _update_one(change)
+        except (KeyError, ValueError, TypeError) as e:
+            return {"rollno": change.get("rollno"), "error": f"Invalid change: {e}"}
+
+    status = 0
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+        for result in pool.map(safe_update, changes):
+            if "row" in result:
+                emit(out, result["row"])
+            else:
+                emit(err, result)
+                status = 1
+    return status
+
+
+def cmd_delete(args, out: IO, err: IO) -> int:
+    """Delete students (and their marks), one query per batch"""
+    rollnos = read_rollnos(args.rollnos, sys.stdin)
+    status = 0
+    for batch in chunks(rollnos, LOOKUP_BATCH_SIZE):
+        deleted = set(Student.delete_many(batch))
+        for rollno in batch:
+            if rollno in deleted:
+                emit(out, {"rollno": rollno, "deleted": True})
+            else:
+                emit(err, {"rollno": rollno, "error": "Student not found"})
+                status = 1
+    return status
+
+
+def cmd_list(args, out: IO, err: IO) -> int:
+    """Stream every student with marks, as JSON lines or a table"""
+    rows = Marks.iter_full_details(columns=Marks.DETAIL_COLUMNS)
+    if args.json:
+        for row in rows:
+            emit(out, row)
+    else:
+        from utils.display import display_full_details
+        with redirect_stdout(out):
+            display_full_details(rows)
+    return 0
+
+
+def write_rows(rows: Iterable[Dict[str, Any]], fmt: str, stream: IO) -> int:
+    """Write rows as CSV or JSON lines, returning how many were written"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=Marks.DETAIL_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            emit(stream, row)
+            count += 1
+    return count
+
+
+def cmd_export(args, out: IO, err: IO) -> int:
+    """Export all students; xlsx/pdf go to a file, csv/json to stdout or --output"""
+    rows = Marks.iter_full_details(columns=Marks.DETAIL_COLUMNS)
+
+    if args.format in ("xlsx", "pdf"):
+        from utils.export import write_excel, write_pdf
+
+        path = args.output or f"Student_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{args.format}"
+        count = (write_excel if args.format == "xlsx" else write_pdf)(rows, path)
+        emit(out, {"format": args.format, "path": path, "rows": count})
+        return 0
+
+    if args.output and args.output != "-":
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            count = write_rows(rows, args.format, f)
+        emit(out, {"format": args.format, "path": args.output, "rows": count})
+    else:
+        write_rows(rows, args.format, out)
+    return 0
+
+
+def cmd_stats(args, out: IO, err: IO) -> int:
+    """Print class statistics as one JSON object"""
+    emit(out, ClassStats.compute())
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Student database batch commands. Run without a command for the interactive menu."
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    add = commands.add_parser("add", help="add students from flags or JSON lines on stdin")
+    add.add_argument("--rollno", type=int)
+    add_student_arguments(add, required=False)
+    add.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    add.set_defaults(handler=cmd_add)
+
+    get = commands.add_parser("get", help="print students by roll number (arguments or stdin)")
+    get.add_argument("rollnos", nargs="*")
+    get.set_defaults(handler=cmd_get)
+
+    update = commands.add_parser("update", help="update fields from flags or JSON lines on stdin")
+    update.add_argument("rollno", type=int, nargs="?")
+    add_student_arguments(update, required=False)
+    update.add_argument("--jobs", type=int, default=DEFAULT_UPDATE_JOBS,
+                        help=f"concurrent updates (default {DEFAULT_UPDATE_JOBS})")
+    update.set_defaults(handler=cmd_update)
+
+    delete = commands.add_parser("delete", help="delete students by roll number (arguments or stdin)")
+    delete.add_argument("rollnos", nargs="*")
+    delete.set_defaults(handler=cmd_delete)
+
+    list_ = commands.add_parser("list", help="list every student with marks")
+    list_.add_argument("--json", action="store_true", help="one JSON object per line")
+    list_.set_defaults(handler=cmd_list)
+
+    export = commands.add_parser("export", help="export every student with marks")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="xlsx")
+    export.add_argument("--output", "-o", help="file path (csv/json default to stdout)")
+    export.set_defaults(handler=cmd_export)
+
+    import_ = commands.add_parser("import", help="import a CSV, XLSX or JSON file ('-' for stdin)")
+    import_.add_argument("file")
+    import_.add_argument("--format", choices=("csv", "xlsx", "json"))
+    import_.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    import_.set_defaults(handler=cmd_import)
+
+    stats = commands.add_parser("stats", help="print class statistics")
+    stats.set_defaults(handler=cmd_stats)
+
+    return parser
+
+
+def run(argv: List[str]) -> int:
+    """Run one batch command and return the process exit status"""
+    args = build_parser().parse_args(argv)
+    out, err = sys.stdout, sys.stderr
+
+    # Model and connection messages are for humans; keep them off stdout
+    with redirect_stdout(err):
+        if not db.is_connected():
+            emit(err, {"error": "Failed to connect to database"})
+            return 1
+        try:
+            return args.handler(args, out, err)
+        except (ValueError, OSError) as e:
+            emit(err, {"error": str(e)})
+            return 1
+        except Exception as e:
+            # Database errors (e.g. mid-way through a list or export stream)
+            emit(err, {"error": f"Database error: {e}"})
+            return 1
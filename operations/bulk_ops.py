@@ -0,0 +1,105 @@
+"""
+Bulk operations - batched student + marks import
+"""
+from typing import Any, Dict, List
+from models.student import Student
+from utils.display import print_separator
+from utils.importer import read_import_file, validate_import_frame
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def _insert_bisecting(records: List[Dict[str, Any]], errors: List[Dict[str, Any]]) -> int:
+    """Insert records atomically, halving a failed call to isolate the bad rows
+
+    A batch with k failing rows costs O(k log n) calls instead of one per row.
+    """
+    if not records:
+        return 0
+    try:
+        return Student.create_many_with_marks(records)
+    except Exception as e:
+        if len(records) == 1:
+            errors.append({"row": records[0]["row"], "rollno": records[0]["rollno"],
+                           "message": f"insert failed: {e}"})
+            return 0
+    middle = len(records) // 2
+    return _insert_bisecting(records[:middle], errors) + _insert_bisecting(records[middle:], errors)
+
+
+def _import_batch(batch: List[Dict[str, Any]], errors: List[Dict[str, Any]]) -> int:
+    """Write one batch of validated records, returning how many were inserted"""
+    try:
+        existing = Student.existing_rollnos([r["rollno"] for r in batch])
+    except Exception as e:
+        for r in batch:
+            errors.append({"row": r["row"], "rollno": r["rollno"], "message": f"existence check failed: {e}"})
+        return 0
+
+    pending = []
+    for record in batch:
+        if record["rollno"] in existing:
+            errors.append({"row": record["row"], "rollno": record["rollno"],
+                           "message": "student with this roll number already exists"})
+        else:
+            pending.append(record)
+
+    # A failed call is rolled back, so the halves can be retried safely
+    return _insert_bisecting(pending, errors)
+
+
+def bulk_import(records: List[Dict[str, Any]], errors: List[Dict[str, Any]] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """Write validated records in batches and report per-row errors
+
+    records and errors are the output of utils.importer.validate_import_frame.
+    Each batch costs one existence check plus one transactional call that
+    inserts both tables, so a failed batch never leaves orphaned students.
+    """
+    errors = list(errors or [])
+    invalid = len(errors)
+    batch_size = max(int(batch_size), 1)
+    inserted = 0
+
+    for start in range(0, len(records), batch_size):
+        inserted += _import_batch(records[start:start + batch_size], errors)
+
+    errors.sort(key=lambda e: e["row"])
+    return {
+        "total": len(records) + invalid,
+        "inserted": inserted,
+        "failed": len(errors),
+        "errors": errors
+    }
+
+
+def import_students():
+    """Import students and marks from a CSV, XLSX or JSON file"""
+    print_separator()
+    print("📥 Import Students")
+    print_separator()
+
+    try:
+        path = input("Enter file path (.csv, .xlsx, .json): ").strip().strip('"')
+        batch_input = input(f"Batch size (default {DEFAULT_BATCH_SIZE}): ").strip()
+        batch_size = int(batch_input) if batch_input else DEFAULT_BATCH_SIZE
+
+        records, errors = validate_import_frame(read_import_file(path))
+        print(f"🔎 Validated {len(records) + len(errors)} rows: {len(records)} valid, {len(errors)} invalid")
+
+        report = bulk_import(records, errors, batch_size)
+
+        print_separator()
+        print(f"✅ Imported {report['inserted']} student(s)")
+        if report["errors"]:
+            print(f"❌ {report['failed']} row(s) failed:")
+            for error in report["errors"]:
+                print(f"   Row {error['row']} (Roll No. {error['rollno']}): {error['message']}")
+        print_separator()
+
+    except FileNotFoundError:
+        print("❌ File not found!")
+    except ValueError as e:
+        print(f"❌ Invalid input: {e}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
@@ -1,9 +1,10 @@
 """
 Student operations - CRUD operations for students
 """
-from models.student import Student
+from models.student import Student, DuplicateRollNoError
 from models.marks import Marks
-from utils.display import print_separator, display_students, display_marks, display_full_details, display_student_detail
+from models.patch import StudentPatch
+from utils.display import print_separator, page_students, page_marks, page_full_details, display_student_detail
 
 
 def accept_student():
@@ -14,15 +15,6 @@ def accept_student():
     
     try:
         rollno = int(input("Enter Roll No.: "))
-        
-        # Check if student exists
-        existing = Student.get_by_rollno(rollno)
-        if existing:
-            print_separator()
-            print("❌ Student with this Roll No. already exists!")
-            print_separator()
-            return
-        
         name = input("Enter Name: ").strip()
         father = input("Enter Father's Name: ").strip()
         password = input("Enter Password: ").strip()
@@ -47,15 +39,14 @@ def accept_student():
             print("❌ Marks must be between 0 and 100!")
             return
         
-        # Create student and marks records
-        student_created = Student.create(rollno, name, father, password)
-        if student_created:
-            marks_created = Marks.create(rollno, dsp, iot, android, compiler, minor)
-            if not marks_created:
-                # Rollback student creation if marks creation fails
-                Student.delete(rollno)
-                print("❌ Failed to create student record")
+        # Create student and marks records in one transaction
+        Student.create_with_marks(rollno, name, father, password,
+                                  dsp, iot, android, compiler, minor)
         
+    except DuplicateRollNoError:
+        print_separator()
+        print("❌ Student with this Roll No. already exists!")
+        print_separator()
     except ValueError:
         print("❌ Invalid input! Please enter valid numbers.")
     except Exception as e:
@@ -75,15 +66,13 @@ def display_students_data():
         choice = int(input("Enter your choice (1-3): "))
         print_separator()
         
+        # Pages are read on demand, so only the rows on screen are fetched
         if choice == 1:
-            students = Student.get_all()
-            display_students(students)
+            page_students(lambda limit, after: Student.get_page(limit, after, Student.PUBLIC_COLUMNS))
         elif choice == 2:
-            marks = Marks.get_all()
-            display_marks(marks)
+            page_marks(lambda limit, after: Marks.get_page(limit, after, Marks.MARK_COLUMNS))
         elif choice == 3:
-            full_data = Marks.get_full_details()
-            display_full_details(full_data)
+            page_full_details(lambda limit, after: Marks.get_full_details_page(limit, after, Marks.DETAIL_COLUMNS))
         else:
             print("❌ Invalid choice!")
     except ValueError:
@@ -130,7 +119,7 @@ def search_student():
             return
         
         # Get marks
-        marks = Marks.get_by_rollno(rollno)
+        marks = Marks.get_by_rollno(rollno, Marks.MARK_COLUMNS)
         
         if marks:
             display_student_detail(student, marks)
@@ -178,6 +167,9 @@ def update_student():
             print_separator()
             return
         
+        # Changes are collected here and saved together on exit
+        patch = StudentPatch(rollno)
+        
         # Update menu
         while True:
             print_separator()
@@ -186,20 +178,26 @@ def update_student():
             print("2. Update Father's Name")
             print("3. Update Password")
             print("4. Update Marks")
-            print("5. Exit")
+            print(f"5. Save & Exit ({len(patch)} pending change(s))")
+            print("6. Discard & Exit")
             print_separator()
             
-            choice = int(input("Enter your choice: "))
+            try:
+                choice = int(input("Enter your choice: "))
+            except ValueError:
+                # Keep the staged changes on a mistyped choice
+                print("❌ Invalid input!")
+                continue
             
             if choice == 1:
                 new_name = input("Enter new Name: ").strip()
                 if new_name:
-                    Student.update(rollno, name=new_name)
+                    patch.set(name=new_name)
             
             elif choice == 2:
                 new_father = input("Enter new Father's Name: ").strip()
                 if new_father:
-                    Student.update(rollno, father=new_father)
+                    patch.set(father=new_father)
             
             elif choice == 3:
                 while True:
@@ -209,16 +207,28 @@ def update_student():
                     else:
                         confirm_password = input("Re-enter new Password: ").strip()
                         if new_password == confirm_password:
-                            Student.update(rollno, password=new_password)
+                            patch.set(password=new_password)
                             password = new_password  # Update local variable
                             break
                         else:
                             print("❌ Passwords do not match!")
             
             elif choice == 4:
-                update_marks_submenu(rollno)
+                update_marks_submenu(patch)
             
             elif choice == 5:
+                if not patch.pending:
+                    print("ℹ️ No changes to save")
+                    break
+                updated = patch.flush()
+                if updated:
+                    display_student_detail(updated, updated)
+                    break
+                # A failed flush keeps the staged changes, so they can be retried
+                print("⚠️ Changes were not saved. Choose 5 to try again or 6 to discard them.")
+            
+            elif choice == 6:
+                print("❌ Changes discarded!")
                 break
             
             else:
@@ -230,8 +240,8 @@ def update_student():
         print(f"❌ Error: {e}")
 
 
-def update_marks_submenu(rollno: int):
-    """Submenu for updating marks"""
+def update_marks_submenu(patch: StudentPatch):
+    """Submenu for staging marks changes"""
     while True:
         print_separator()
         print("Select Subject to Update:")
@@ -268,7 +278,7 @@ def update_marks_submenu(rollno: int):
             }
             
             subject = subject_map[choice]
-            Marks.update(rollno, **{subject: mark})
+            patch.set(**{subject: mark})
             
         except ValueError:
             print("❌ Invalid input!")
@@ -314,12 +324,10 @@ def delete_student():
         confirm = input("⚠️ Are you sure you want to delete this student? (yes/no): ").strip().lower()
         
         if confirm == 'yes':
-            # Delete marks first (foreign key constraint)
-            Marks.delete(rollno)
-            # Delete student
-            Student.delete(rollno)
-            print_separator()
-            print("✅ Student deleted successfully!")
+            # The marks row is removed by the foreign key cascade
+            if Student.delete(rollno):
+                print_separator()
+                print("✅ Student deleted successfully!")
         else:
             print("❌ Deletion cancelled!")
         
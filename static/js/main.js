@@ -1,9 +1,10 @@
 // API Base URL
 const API_BASE = '/api';
 
-// Check database connection on load
+// Check database connection and subscribe to the change feed on load
 window.addEventListener('DOMContentLoaded', () => {
     checkConnection();
+    connectChangeFeed();
 });
 
 // Check database connection
@@ -157,79 +158,583 @@ async function addStudent(event) {
 }
 
 // View Records
-async function showViewRecords() {
+function showViewRecords() {
     const contentArea = document.getElementById('contentArea');
     contentArea.innerHTML = `
         <div class="section-header">
             <h2><i class="fas fa-list"></i> Student Records</h2>
-            <button class="btn btn-primary" onclick="loadFullDetails()">
+            <button class="btn btn-primary" onclick="reloadRecords()">
                 <i class="fas fa-sync"></i> Refresh
             </button>
         </div>
         <div id="tableContainer"></div>
     `;
     
-    loadFullDetails();
+    // The change feed keeps loaded records current, so only the first
+    // visit (or Refresh) downloads them
+    if (records === null) {
+        records = createRecords();
+    }
+    mountRecordsTable();
 }
 
-async function loadFullDetails() {
-    try {
-        const response = await fetch(`${API_BASE}/full-details`);
-        const result = await response.json();
+// Rows fetched per request while paging on scroll, and when a sort or
+// filter needs every row
+const PAGE_SIZE = 200;
+const BULK_PAGE_SIZE = 1000;
+const SEARCH_PAGE_SIZE = 100;
+
+// Estimated row height in pixels (measured once rows are drawn), extra rows
+// drawn above and below the viewport, and how close to the last loaded row
+// scrolling fetches the next page
+const ROW_HEIGHT = 48;
+const OVERSCAN_ROWS = 8;
+const PREFETCH_ROWS = 50;
+
+const SUBJECT_KEYS = ['dsp', 'iot', 'android', 'compiler', 'minor'];
+const RECORD_FIELDS = ['rollno', 'name', 'father', ...SUBJECT_KEYS];
+const TABLE_COLUMNS = [
+    {key: 'rollno', label: 'Roll No'},
+    {key: 'name', label: 'Name'},
+    {key: 'father', label: "Father's Name"},
+    {key: 'dsp', label: 'DSP'},
+    {key: 'iot', label: 'IOT'},
+    {key: 'android', label: 'Android'},
+    {key: 'compiler', label: 'Compiler'},
+    {key: 'minor', label: 'Minor'},
+    {key: 'total', label: 'Total (out of 350)'}
+];
+
+function isCompleteRecord(row) {
+    return RECORD_FIELDS.every(field => row[field] !== undefined);
+}
+
+async function fetchJSON(url) {
+    const response = await fetch(url);
+    const result = await response.json();
+    if (!result.success) {
+        throw new Error(result.message || 'Request failed');
+    }
+    return result;
+}
+
+// Complete student + marks rows held column-wise in typed arrays, keyed by roll number
+class ColumnStore {
+    constructor(capacity = 1024) {
+        this.size = 0;
+        this.capacity = capacity;
+        this.slots = new Map();
+        // arrival numbers rows in the order they were first loaded, which
+        // keeps the server's ranking for search results
+        this.numbers = {
+            rollno: new Int32Array(capacity),
+            total: new Float64Array(capacity),
+            arrival: new Int32Array(capacity)
+        };
+        this.arrivals = 0;
+        SUBJECT_KEYS.forEach(key => {
+            this.numbers[key] = new Float64Array(capacity);
+        });
+        this.text = {name: [], father: []};
+        // "rollno\nNAME\nFATHER" per row, so a filter is one substring test
+        this.keys = [];
+        // Bumped by every change; invalidates the cached sort and filter results
+        this.version = 0;
+        this.sorted = null;
+        this.filtered = null;
+    }
+    
+    grow() {
+        this.capacity *= 2;
+        for (const key in this.numbers) {
+            const column = new this.numbers[key].constructor(this.capacity);
+            column.set(this.numbers[key]);
+            this.numbers[key] = column;
+        }
+    }
+    
+    value(key, slot) {
+        return key in this.numbers ? this.numbers[key][slot] : this.text[key][slot];
+    }
+    
+    get(rollno) {
+        const slot = this.slots.get(rollno);
+        if (slot === undefined) {
+            return null;
+        }
+        const row = {name: this.text.name[slot], father: this.text.father[slot]};
+        for (const key in this.numbers) {
+            row[key] = this.numbers[key][slot];
+        }
+        return row;
+    }
+    
+    upsert(row) {
+        let slot = this.slots.get(row.rollno);
+        if (slot === undefined) {
+            if (this.size === this.capacity) {
+                this.grow();
+            }
+            slot = this.size++;
+            this.slots.set(row.rollno, slot);
+            this.numbers.arrival[slot] = this.arrivals++;
+        }
         
-        const tableContainer = document.getElementById('tableContainer');
-        
-        if (result.success && result.data.length > 0) {
-            let tableHTML = `
-                <div class="table-container">
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Roll No</th>
-                                <th>Name</th>
-                                <th>Father's Name</th>
-                                <th>DSP</th>
-                                <th>IOT</th>
-                                <th>Android</th>
-                                <th>Compiler</th>
-                                <th>Minor</th>
-                                <th>Total (out of 350)</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-            `;
-            
-            result.data.forEach(student => {
-                const total = student.dsp + student.iot + student.android + student.compiler + student.minor;
-                
-                tableHTML += `
-                    <tr>
-                        <td>${student.rollno}</td>
-                        <td>${student.name}</td>
-                        <td>${student.father}</td>
-                        <td>${student.dsp}</td>
-                        <td>${student.iot}</td>
-                        <td>${student.android}</td>
-                        <td>${student.compiler}</td>
-                        <td>${student.minor}</td>
-                        <td><strong>${total}</strong></td>
-                    </tr>
-                `;
+        let total = 0;
+        SUBJECT_KEYS.forEach(key => {
+            this.numbers[key][slot] = row[key];
+            total += row[key];
+        });
+        this.numbers.rollno[slot] = row.rollno;
+        this.numbers.total[slot] = total;
+        this.text.name[slot] = row.name;
+        this.text.father[slot] = row.father;
+        this.keys[slot] = `${row.rollno}\n${row.name}\n${row.father}`.toUpperCase();
+        this.version++;
+    }
+    
+    remove(rollno) {
+        const slot = this.slots.get(rollno);
+        if (slot === undefined) {
+            return;
+        }
+        
+        // Move the last row into the freed slot so the columns stay dense
+        const last = --this.size;
+        if (slot !== last) {
+            for (const key in this.numbers) {
+                this.numbers[key][slot] = this.numbers[key][last];
+            }
+            this.text.name[slot] = this.text.name[last];
+            this.text.father[slot] = this.text.father[last];
+            this.keys[slot] = this.keys[last];
+            this.slots.set(this.numbers.rollno[slot], slot);
+        }
+        this.text.name.length = last;
+        this.text.father.length = last;
+        this.keys.length = last;
+        this.slots.delete(rollno);
+        this.version++;
+    }
+    
+    // Slots ordered by one column (ties by roll number), cached until the data changes
+    order(key, descending) {
+        const cached = this.sorted;
+        if (cached && cached.key === key && cached.descending === descending && cached.version === this.version) {
+            return cached.order;
+        }
+        
+        const order = new Int32Array(this.size);
+        for (let i = 0; i < order.length; i++) {
+            order[i] = i;
+        }
+        const column = key in this.numbers ? this.numbers[key] : this.text[key];
+        const rollnos = this.numbers.rollno;
+        const sign = descending ? -1 : 1;
+        order.sort((a, b) => {
+            const x = column[a];
+            const y = column[b];
+            if (x < y) {
+                return -sign;
+            }
+            if (x > y) {
+                return sign;
+            }
+            return rollnos[a] - rollnos[b];
+        });
+        
+        this.sorted = {key, descending, version: this.version, order};
+        return order;
+    }
+    
+    // Sorted slots whose roll number, name or father's name contains the filter
+    query(key, descending, filter) {
+        const order = this.order(key, descending);
+        const needle = filter.toUpperCase();
+        if (!needle) {
+            return order;
+        }
+        
+        // Typing narrows the previous filter, so only its matches are rescanned
+        const previous = this.filtered;
+        const candidates = previous && previous.order === order && needle.includes(previous.needle)
+            ? previous.matches
+            : order;
+        
+        const keys = this.keys;
+        const matches = new Int32Array(candidates.length);
+        let count = 0;
+        for (let i = 0; i < candidates.length; i++) {
+            if (keys[candidates[i]].includes(needle)) {
+                matches[count++] = candidates[i];
+            }
+        }
+        
+        this.filtered = {order, needle, matches: matches.subarray(0, count)};
+        return this.filtered.matches;
+    }
+}
+
+// Fills a ColumnStore page by page from a paginated endpoint
+class PagedSource {
+    // fetchPage(cursor, limit) resolves to {rows, next, total}; next is null on the last page
+    constructor(store, fetchPage) {
+        this.store = store;
+        this.fetchPage = fetchPage;
+        this.cursor = null;
+        this.hasMore = true;
+        this.total = null;
+        this.loading = null;
+        this.onload = null;
+        // Roll numbers changed by the feed while pages are still arriving;
+        // their (possibly older) page copies are skipped
+        this.touched = new Set();
+    }
+    
+    loadMore(limit = PAGE_SIZE) {
+        if (!this.hasMore) {
+            return Promise.resolve();
+        }
+        if (this.loading === null) {
+            this.loading = this.fetchPage(this.cursor, limit)
+                .then(({rows, next, total}) => {
+                    rows.forEach(row => {
+                        if (!this.touched.has(row.rollno)) {
+                            this.store.upsert(row);
+                        }
+                    });
+                    this.cursor = next;
+                    this.hasMore = next !== null;
+                    this.total = total ?? null;
+                    if (!this.hasMore) {
+                        this.touched.clear();
+                    }
+                })
+                .catch(error => {
+                    this.hasMore = false;
+                    showToast(error.message || 'Error loading records', 'error');
+                })
+                .finally(() => {
+                    this.loading = null;
+                    if (this.onload) {
+                        this.onload();
+                    }
+                });
+        }
+        return this.loading;
+    }
+    
+    async loadAll() {
+        while (this.hasMore) {
+            await this.loadMore(BULK_PAGE_SIZE);
+        }
+    }
+}
+
+// Table that draws only the rows in view, reusing a small pool of <tr>
+// elements, over a ColumnStore fed by a PagedSource
+class VirtualTable {
+    // defaultSort is the order shown before any header is clicked; it must be
+    // the order the source pages rows in, so scrolling can load lazily
+    constructor(container, store, source, emptyState, defaultSort = 'rollno') {
+        this.container = container;
+        this.store = store;
+        this.source = source;
+        this.defaultSort = defaultSort;
+        this.sortKey = defaultSort;
+        this.descending = false;
+        this.filter = '';
+        this.view = new Int32Array(0);
+        this.dirty = true;
+        this.frame = null;
+        this.rowHeight = ROW_HEIGHT;
+        this.pool = [];
+        
+        container.innerHTML = `
+            <div class="virtual-toolbar">
+                <input type="search" class="virtual-filter" placeholder="Filter by roll no., name or father's name">
+                <span class="virtual-status"></span>
+            </div>
+            <div class="table-container virtual-viewport">
+                <table>
+                    <thead>
+                        <tr>${TABLE_COLUMNS.map(c => `<th data-key="${c.key}">${c.label}</th>`).join('')}</tr>
+                    </thead>
+                    <tbody>
+                        <tr class="virtual-spacer"><td colspan="${TABLE_COLUMNS.length}"></td></tr>
+                        <tr class="virtual-spacer"><td colspan="${TABLE_COLUMNS.length}"></td></tr>
+                    </tbody>
+                </table>
+            </div>
+            <div class="empty-state" hidden>
+                <i class="fas ${emptyState.icon}"></i>
+                <h3>${emptyState.title}</h3>
+                <p>${emptyState.text}</p>
+            </div>
+        `;
+        
+        this.viewport = container.querySelector('.virtual-viewport');
+        this.headers = container.querySelectorAll('th');
+        this.status = container.querySelector('.virtual-status');
+        this.empty = container.querySelector('.empty-state');
+        [this.topSpacer, this.bottomSpacer] = container.querySelectorAll('.virtual-spacer');
+        
+        this.viewport.addEventListener('scroll', () => this.schedule(), {passive: true});
+        container.querySelector('thead').addEventListener('click', event => {
+            const th = event.target.closest('th');
+            if (th) {
+                this.sortBy(th.dataset.key);
+            }
+        });
+        container.querySelector('.virtual-filter').addEventListener('input', event => {
+            this.filterBy(event.target.value.trim());
+        });
+        
+        source.onload = () => this.invalidate();
+        this.updateHeaders();
+        this.invalidate();
+    }
+    
+    get mounted() {
+        return document.body.contains(this.container);
+    }
+    
+    // Recompute the visible order on the next frame (the data changed)
+    invalidate() {
+        this.dirty = true;
+        this.schedule();
+    }
+    
+    schedule() {
+        if (this.frame === null) {
+            this.frame = requestAnimationFrame(() => {
+                this.frame = null;
+                if (this.mounted) {
+                    this.paint();
+                }
             });
-            
-            tableHTML += `</tbody></table></div>`;
-            tableContainer.innerHTML = tableHTML;
+        }
+    }
+    
+    // Sorting by anything but the source's own order, or filtering, needs every row
+    needsAllRows() {
+        return this.filter !== '' || this.sortKey !== this.defaultSort || this.descending;
+    }
+    
+    sortBy(key) {
+        if (this.sortKey === key) {
+            this.descending = !this.descending;
         } else {
-            tableContainer.innerHTML = `
-                <div class="empty-state">
-                    <i class="fas fa-inbox"></i>
-                    <h3>No Records Found</h3>
-                    <p>Add some students to see them here</p>
-                </div>
-            `;
+            this.sortKey = key;
+            this.descending = false;
+        }
+        this.updateHeaders();
+        this.viewport.scrollTop = 0;
+        this.loadAllIfNeeded();
+        this.invalidate();
+    }
+    
+    filterBy(text) {
+        this.filter = text;
+        this.viewport.scrollTop = 0;
+        this.loadAllIfNeeded();
+        this.invalidate();
+    }
+    
+    loadAllIfNeeded() {
+        if (this.needsAllRows() && this.source.hasMore) {
+            this.source.loadAll();
+        }
+    }
+    
+    updateHeaders() {
+        this.headers.forEach(th => {
+            th.classList.toggle('sorted', th.dataset.key === this.sortKey);
+            th.classList.toggle('descending', th.dataset.key === this.sortKey && this.descending);
+        });
+    }
+    
+    createRow() {
+        const tr = document.createElement('tr');
+        TABLE_COLUMNS.forEach(column => {
+            const td = document.createElement('td');
+            if (column.key === 'total') {
+                td.className = 'total-cell';
+            }
+            tr.appendChild(td);
+        });
+        this.bottomSpacer.before(tr);
+        this.pool.push(tr);
+        return tr;
+    }
+    
+    paint() {
+        if (this.dirty) {
+            this.view = this.store.query(this.sortKey, this.descending, this.filter);
+            this.dirty = false;
+        }
+        
+        const isEmpty = this.store.size === 0 && !this.source.hasMore;
+        this.empty.hidden = !isEmpty;
+        this.viewport.hidden = isEmpty;
+        this.updateStatus();
+        if (isEmpty) {
+            return;
+        }
+        
+        const count = this.view.length;
+        const top = this.viewport.scrollTop;
+        const first = Math.max(0, Math.floor(top / this.rowHeight) - OVERSCAN_ROWS);
+        const last = Math.min(count, Math.ceil((top + this.viewport.clientHeight) / this.rowHeight) + OVERSCAN_ROWS);
+        
+        this.topSpacer.style.height = `${first * this.rowHeight}px`;
+        this.bottomSpacer.style.height = `${(count - last) * this.rowHeight}px`;
+        
+        while (this.pool.length < last - first) {
+            this.createRow();
+        }
+        this.pool.forEach((tr, i) => {
+            const index = first + i;
+            tr.hidden = index >= last;
+            if (!tr.hidden) {
+                this.fillRow(tr, this.view[index]);
+            }
+        });
+        
+        // Position rows by their real height once one has been laid out
+        if (last > first && this.rowHeight === ROW_HEIGHT) {
+            const measured = this.pool[0].getBoundingClientRect().height;
+            if (measured > 0 && measured !== this.rowHeight) {
+                this.rowHeight = measured;
+                this.schedule();
+            }
+        }
+        
+        if (!this.needsAllRows() && this.source.hasMore && last + PREFETCH_ROWS >= count) {
+            this.source.loadMore();
+        }
+    }
+    
+    fillRow(tr, slot) {
+        TABLE_COLUMNS.forEach((column, i) => {
+            const text = String(this.store.value(column.key, slot));
+            const td = tr.cells[i];
+            if (td.textContent !== text) {
+                td.textContent = text;
+            }
+        });
+    }
+    
+    updateStatus() {
+        const loaded = this.store.size;
+        let text = this.filter
+            ? `${this.view.length.toLocaleString()} of ${loaded.toLocaleString()} rows match`
+            : `${loaded.toLocaleString()} rows`;
+        if (this.source.total !== null && this.source.total > loaded) {
+            text += ` (of ${this.source.total.toLocaleString()})`;
+        }
+        if (this.source.loading !== null) {
+            text += ' · loading…';
+        } else if (this.source.hasMore) {
+            text += ' · scroll for more';
+        }
+        this.status.textContent = text;
+    }
+}
+
+// Loaded records (store + source), kept across visits and patched by the change feed
+let records = null;
+let recordsTable = null;
+
+function createRecords() {
+    const store = new ColumnStore();
+    const source = new PagedSource(store, async (after, limit) => {
+        const params = new URLSearchParams({limit});
+        if (after !== null) {
+            params.set('after', after);
+        }
+        const result = await fetchJSON(`${API_BASE}/full-details?${params}`);
+        return {rows: result.data, next: result.next_cursor};
+    });
+    return {store, source};
+}
+
+function mountRecordsTable() {
+    recordsTable = new VirtualTable(document.getElementById('tableContainer'), records.store, records.source, {
+        icon: 'fa-inbox',
+        title: 'No Records Found',
+        text: 'Add some students to see them here'
+    });
+}
+
+function reloadRecords() {
+    records = null;
+    if (document.getElementById('tableContainer')) {
+        records = createRecords();
+        mountRecordsTable();
+    }
+}
+
+// Change feed: row-level insert/update/delete events pushed by the server
+function connectChangeFeed() {
+    if (!window.EventSource) {
+        return;
+    }
+    
+    const source = new EventSource(`${API_BASE}/events`);
+    let connected = false;
+    
+    source.onopen = () => {
+        // Events sent while we were disconnected are lost, so start over
+        if (connected && records !== null) {
+            reloadRecords();
+        }
+        connected = true;
+    };
+    source.addEventListener('change', event => applyChange(JSON.parse(event.data)));
+    source.addEventListener('reset', () => reloadRecords());
+}
+
+function applyChange(change) {
+    if (records === null) {
+        return;
+    }
+    const {store, source} = records;
+    if (source.hasMore) {
+        source.touched.add(change.rollno);
+    }
+    
+    if (change.op === 'delete') {
+        store.remove(change.rollno);
+    } else {
+        const row = {...(store.get(change.rollno) || {}), ...change.row};
+        if (isCompleteRecord(row)) {
+            store.upsert(row);
+        } else {
+            fillRecord(change.rollno);
+        }
+    }
+    
+    if (recordsTable !== null && recordsTable.store === store) {
+        recordsTable.invalidate();
+    }
+}
+
+// A change may carry only one table's fields (e.g. marks added to an
+// existing student); fetch the whole row once
+async function fillRecord(rollno) {
+    const current = records;
+    try {
+        const result = await fetchJSON(`${API_BASE}/students/${rollno}`);
+        if (records !== current || !result.marks) {
+            return;
+        }
+        current.store.upsert({...result.student, ...result.marks});
+        if (recordsTable !== null && recordsTable.store === current.store) {
+            recordsTable.invalidate();
         }
     } catch (error) {
-        showToast('Error loading records', 'error');
+        console.error(error);
     }
 }
 
@@ -293,93 +798,33 @@ async function searchStudent(event) {
     const searchType = formData.get('searchType');
     const searchValue = formData.get('searchValue');
     
-    try {
-        // Get all students
-        const response = await fetch(`${API_BASE}/full-details`);
-        const result = await response.json();
-        
-        if (result.success) {
-            let foundStudents = [];
-            
-            // Filter based on search type
-            if (searchType === 'rollno') {
-                foundStudents = result.data.filter(s => s.rollno == searchValue);
-            } else if (searchType === 'name') {
-                foundStudents = result.data.filter(s => 
-                    s.name.toLowerCase().includes(searchValue.toLowerCase())
-                );
-            } else if (searchType === 'father') {
-                foundStudents = result.data.filter(s => 
-                    s.father.toLowerCase().includes(searchValue.toLowerCase())
-                );
-            }
-            
-            if (foundStudents.length > 0) {
-                let resultsHTML = '<div class="search-results-container">';
-                
-                foundStudents.forEach(student => {
-                    const total = student.dsp + student.iot + student.android + student.compiler + student.minor;
-                    
-                    resultsHTML += `
-                        <div class="student-detail">
-                            <h3 style="margin-bottom: 1rem; color: var(--primary-color);">Student Details</h3>
-                            <div class="detail-row">
-                                <div class="detail-label">Roll Number:</div>
-                                <div class="detail-value">${student.rollno}</div>
-                            </div>
-                            <div class="detail-row">
-                                <div class="detail-label">Name:</div>
-                                <div class="detail-value">${student.name}</div>
-                            </div>
-                            <div class="detail-row">
-                                <div class="detail-label">Father's Name:</div>
-                                <div class="detail-value">${student.father}</div>
-                            </div>
-                            <div class="detail-row">
-                                <div class="detail-label">DSP:</div>
-                                <div class="detail-value">${student.dsp}</div>
-                            </div>
-                            <div class="detail-row">
-                                <div class="detail-label">IOT:</div>
-                                <div class="detail-value">${student.iot}</div>
-                            </div>
-                            <div class="detail-row">
-                                <div class="detail-label">Android:</div>
-                                <div class="detail-value">${student.android}</div>
-                            </div>
-                            <div class="detail-row">
-                                <div class="detail-label">Compiler:</div>
-                                <div class="detail-value">${student.compiler}</div>
-                            </div>
-                            <div class="detail-row">
-                                <div class="detail-label">Minor:</div>
-                                <div class="detail-value">${student.minor}</div>
-                            </div>
-                            <div class="detail-row">
-                                <div class="detail-label"><strong>Total (out of 350):</strong></div>
-                                <div class="detail-value"><strong>${total}</strong></div>
-                            </div>
-                        </div>
-                    `;
-                });
-                
-                resultsHTML += '</div>';
-                document.getElementById('searchResults').innerHTML = resultsHTML;
-                showToast(`Found ${foundStudents.length} student(s)`, 'success');
-            } else {
-                document.getElementById('searchResults').innerHTML = `
-                    <div class="empty-state">
-                        <i class="fas fa-search"></i>
-                        <h3>No Results Found</h3>
-                        <p>No students match your search criteria</p>
-                    </div>
-                `;
-                showToast('No students found', 'error');
-            }
-        }
-    } catch (error) {
-        showToast('Error searching student', 'error');
-        console.error(error);
+    // Results page in at the API's largest page size while scrolling
+    const store = new ColumnStore();
+    const source = new PagedSource(store, async page => {
+        page = page || 1;
+        const params = new URLSearchParams({
+            field: searchType,
+            q: searchValue,
+            page,
+            per_page: SEARCH_PAGE_SIZE
+        });
+        const result = await fetchJSON(`${API_BASE}/search?${params}`);
+        const next = page * SEARCH_PAGE_SIZE < result.total ? page + 1 : null;
+        return {rows: result.data, next, total: result.total};
+    });
+    
+    // Keep the server's ranking (best match first) until a header is clicked
+    new VirtualTable(document.getElementById('searchResults'), store, source, {
+        icon: 'fa-search',
+        title: 'No Results Found',
+        text: 'No students match your search criteria'
+    }, 'arrival');
+    
+    await source.loadMore(SEARCH_PAGE_SIZE);
+    if (store.size > 0) {
+        showToast(`Found ${source.total ?? store.size} student(s)`, 'success');
+    } else {
+        showToast('No students found', 'error');
     }
 }
 
@@ -609,26 +1054,55 @@ function showExportOptions() {
     `;
 }
 
-async function exportToExcel() {
+// Poll interval while a background export is rendering
+const EXPORT_POLL_MS = 1000;
+
+async function runExport(format, label) {
     try {
-        showToast('Generating Excel file...', 'info');
-        window.location.href = `${API_BASE}/export/excel`;
-        setTimeout(() => {
-            showToast('Excel file downloaded!', 'success');
-        }, 1000);
+        const response = await fetch(`${API_BASE}/exports`, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({format})
+        });
+        const result = await response.json();
+        
+        if (!result.success) {
+            showToast(result.message, 'error');
+            return;
+        }
+        
+        showToast(`Generating ${label} file...`, 'info');
+        let job = result.job;
+        
+        while (job.status === 'queued' || job.status === 'running') {
+            await new Promise(resolve => setTimeout(resolve, EXPORT_POLL_MS));
+            const statusResponse = await fetch(`${API_BASE}/exports/${job.id}`);
+            const status = await statusResponse.json();
+            if (!status.success) {
+                showToast(status.message, 'error');
+                return;
+            }
+            job = status.job;
+            if (job.status === 'running' && job.rows > 0) {
+                showToast(`Generating ${label} file... ${job.rows} rows`, 'info');
+            }
+        }
+        
+        if (job.status === 'done') {
+            window.location.href = `${API_BASE}/exports/${job.id}/download`;
+            showToast(`${label} file downloaded!`, 'success');
+        } else {
+            showToast(job.error || `Error exporting to ${label}`, 'error');
+        }
     } catch (error) {
-        showToast('Error exporting to Excel', 'error');
+        showToast(`Error exporting to ${label}`, 'error');
     }
 }
 
+async function exportToExcel() {
+    await runExport('excel', 'Excel');
+}
+
 async function exportToPDF() {
-    try {
-        showToast('Generating PDF file...', 'info');
-        window.location.href = `${API_BASE}/export/pdf`;
-        setTimeout(() => {
-            showToast('PDF file downloaded!', 'success');
-        }, 1000);
-    } catch (error) {
-        showToast('Error exporting to PDF', 'error');
-    }
+    await runExport('pdf', 'PDF');
 }
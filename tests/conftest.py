@@ -0,0 +1,82 @@
+"""
+Shared fixtures: every test runs against a fresh SQLite database
+"""
+import os
+
+# Select the embedded backend before the models import config.database
+os.environ["DB_BACKEND"] = "sqlite"
+
+import pytest
+from config.backends.sqlite_backend import SQLiteBackend
+from config.database import db
+from models.student import Student
+from models.marks import Marks
+from models.rank_index import RankIndex
+from models.search_index import student_index
+from models.stats import ClassStats
+from models.version import data_version
+
+
+def _record(rollno, name=None, father=None, password="pw", marks=50.0):
+    """An import-style record; marks is one value for every subject or a dict"""
+    if not isinstance(marks, dict):
+        marks = {subject: marks for subject in Marks.SUBJECTS}
+    return {
+        "rollno": rollno,
+        "name": name or f"Student {rollno}",
+        "father": father or f"Father {rollno}",
+        "password": password,
+        **marks
+    }
+
+
+@pytest.fixture(autouse=True)
+def backend(tmp_path, monkeypatch):
+    """A fresh database plus empty caches and indexes for each test"""
+    backend = SQLiteBackend(str(tmp_path / "students.db"))
+    monkeypatch.setattr(db, "_backend", backend)
+    data_version.reset()
+
+    Student._cache.clear()
+    Marks._cache.clear()
+    student_index.reset()
+    monkeypatch.setattr(Marks, "_ranks", RankIndex(Marks.SUBJECTS))
+    monkeypatch.setattr(ClassStats, "_version", None)
+    monkeypatch.setattr(ClassStats, "_result", None)
+
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def make_record():
+    """Build import-style records: make_record(rollno, name=..., marks=...)"""
+    return _record
+
+
+@pytest.fixture
+def seed():
+    """Insert students with marks; pass roll numbers or full records"""
+    def insert(*items):
+        records = [item if isinstance(item, dict) else _record(item) for item in items]
+        Student.create_many_with_marks(records)
+        return records
+    return insert
+
+
+@pytest.fixture
+def fail_after(monkeypatch):
+    """Make a model's fetch_page raise on its nth call"""
+    def install(model, n, error=RuntimeError("connection reset")):
+        original = model.fetch_page
+        calls = {"count": 0}
+
+        def fetch_page(limit=100, after=None, columns=None):
+            calls["count"] += 1
+            if calls["count"] >= n:
+                raise error
+            return original(limit, after, columns)
+
+        monkeypatch.setattr(model, "fetch_page", staticmethod(fetch_page))
+        return calls
+    return install
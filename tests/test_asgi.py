@@ -0,0 +1,107 @@
+"""
+Tests for the ASGI app: native async read routes and the async read paths
+"""
+import asyncio
+import pytest
+from prometheus_client import REGISTRY
+from starlette.testclient import TestClient
+from config.database import adb
+from models import aio
+
+
+@pytest.fixture(autouse=True)
+def fresh_async_backend(monkeypatch):
+    """Build the async backend over each test's database"""
+    monkeypatch.setattr(adb, "_backend", None)
+    monkeypatch.setattr(adb, "_lock", None)
+
+
+@pytest.fixture
+def client():
+    from asgi import app
+    with TestClient(app) as client:
+        yield client
+
+
+def test_pages_are_served_natively_by_cursor(seed, client):
+    seed(*range(1, 6))
+
+    first = client.get("/api/students?limit=2").json()
+    second = client.get(f"/api/students?limit=2&after={first['next_cursor']}").json()
+
+    assert [s["rollno"] for s in first["data"]] == [1, 2]
+    assert [s["rollno"] for s in second["data"]] == [3, 4]
+    assert set(first["data"][0]) == {"rollno", "name", "father"}
+
+
+def test_student_lookup_and_not_found(seed, client):
+    seed(1)
+
+    body = client.get("/api/students/1").json()
+
+    assert body["student"]["name"] == "STUDENT 1"
+    assert body["marks"]["dsp"] == 50.0
+    assert client.get("/api/students/9").status_code == 404
+
+
+def test_native_routes_answer_304_for_a_matching_etag(seed, client):
+    seed(1)
+    etag = client.get("/api/marks").headers["etag"]
+
+    assert client.get("/api/marks", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_search_and_bad_arguments(seed, client):
+    seed(1, 2, 12)
+
+    body = client.get("/api/search?q=student 1&field=name").json()
+
+    assert sorted(row["rollno"] for row in body["data"]) == [1, 12]
+    assert body["total"] == 2
+    assert client.get("/api/search?field=password&q=x").status_code == 400
+    assert client.get("/api/students?limit=abc").status_code == 400
+
+
+def test_native_routes_are_timed_under_the_flask_rule(seed, client):
+    seed(1)
+    labels = {"method": "GET", "route": "/api/students/<int:rollno>", "status": "200"}
+    before = REGISTRY.get_sample_value("studentdb_http_request_duration_seconds_count", labels) or 0
+
+    client.get("/api/students/1")
+
+    assert REGISTRY.get_sample_value("studentdb_http_request_duration_seconds_count", labels) == before + 1
+
+
+def test_other_routes_fall_through_to_flask(client):
+    record = {"rollno": 1, "name": "Asha", "father": "Ravi", "password": "pw",
+              "dsp": 80, "iot": 75, "android": 90, "compiler": 85, "minor": 88}
+
+    assert client.post("/api/students", json=record).json()["success"]
+    assert client.get("/api/stats").json()["success"]
+    assert client.get("/api/students/1").json()["student"]["name"] == "ASHA"
+
+
+def test_full_details_pages_merge_both_tables(seed):
+    seed(1, 2, 3)
+
+    rows, cursor = asyncio.run(aio.get_full_details_page(limit=2))
+
+    assert [row["rollno"] for row in rows] == [1, 2]
+    assert rows[0]["name"] == "STUDENT 1" and rows[0]["dsp"] == 50.0
+    assert cursor == 2
+
+
+def test_async_reads_follow_writes_from_elsewhere(seed, monkeypatch):
+    from config.database import db
+    from models.version import data_version
+
+    monkeypatch.setattr(data_version, "ttl", 0)
+    seed(1)
+    assert asyncio.run(aio.get_student(1))["name"] == "STUDENT 1"
+
+    conn = db.backend.connection()
+    with conn:
+        conn.execute("UPDATE students SET name = 'ASHA' WHERE rollno = 1")
+
+    assert asyncio.run(aio.get_student(1))["name"] == "ASHA"
+    assert asyncio.run(aio.search("asha")) == ([1], 1)
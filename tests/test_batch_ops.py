@@ -0,0 +1,114 @@
+"""
+Tests for the non-interactive batch commands
+"""
+import io
+import json
+import pytest
+from config.database import db
+from models.marks import Marks
+from models.student import Student
+from operations.batch_ops import read_objects, read_rollnos, run
+
+
+def lines(text):
+    return [json.loads(line) for line in text.splitlines() if line.startswith("{")]
+
+
+@pytest.fixture
+def stdin(monkeypatch):
+    def feed(text):
+        monkeypatch.setattr("sys.stdin", io.StringIO(text))
+    return feed
+
+
+def test_read_rollnos_accepts_bare_and_object_lines():
+    assert read_rollnos([], io.StringIO('3\n\n{"rollno": 5}\n 7 \n')) == [3, 5, 7]
+    assert read_rollnos(["1", "2"], io.StringIO("9\n")) == [1, 2]
+
+
+@pytest.mark.parametrize("text, message", [
+    ('1\n{"name": "x"}\n', "line 2: missing rollno"),
+    ('{"rollno": \n', "line 1: invalid JSON"),
+    ("1\nabc\n", "line 2: invalid roll number 'abc'"),
+    ('{"rollno": true}\n', "line 1: invalid roll number True"),
+])
+def test_read_rollnos_reports_the_bad_line(text, message):
+    with pytest.raises(ValueError, match=message):
+        read_rollnos([], io.StringIO(text))
+
+
+def test_read_objects_requires_objects():
+    with pytest.raises(ValueError, match="line 2: expected a JSON object"):
+        list(read_objects(io.StringIO('{"rollno": 1}\n[1]\n')))
+
+
+def test_add_get_and_delete(stdin, capsys):
+    stdin('{"rollno": 1, "name": "Asha", "father": "Ravi", "password": "pw", '
+          '"dsp": 80, "iot": 75, "android": 90, "compiler": 85, "minor": 88}\n')
+    assert run(["add"]) == 0
+    assert lines(capsys.readouterr().out)[0]["inserted"] == 1
+
+    assert run(["get", "1", "2"]) == 1
+    captured = capsys.readouterr()
+    assert lines(captured.out)[0]["name"] == "ASHA"
+    assert lines(captured.err) == [{"rollno": 2, "error": "Student not found"}]
+
+    assert run(["delete", "1"]) == 0
+    assert Student.fetch_by_rollno(1) is None
+    assert Marks.fetch_by_rollno(1) is None
+
+
+def test_update_reports_bad_rows_and_applies_the_rest(seed, stdin, capsys):
+    seed(1, 2)
+    stdin('{"rollno": 1, "name": 123}\n{"rollno": 2, "dsp": 99}\n{"rollno": 3, "dsp": 10}\n')
+
+    assert run(["update", "--jobs", "2"]) == 1
+
+    captured = capsys.readouterr()
+    assert [row["dsp"] for row in lines(captured.out)] == [99.0]
+    errors = lines(captured.err)
+    assert {"rollno": 1, "error": "Invalid change: name must be a string"} in errors
+    assert {"rollno": 3, "error": "Student not found or update failed"} in errors
+
+
+def test_update_rejects_field_flags_without_a_roll_number(seed, stdin, capsys):
+    seed(1)
+    stdin('{"rollno": 1, "dsp": 99}\n')
+
+    assert run(["update", "--name", "X", "--dsp", "10"]) == 1
+
+    assert lines(capsys.readouterr().err) == [{"error": "--name, --dsp given without a roll number"}]
+    assert Marks.fetch_by_rollno(1)["dsp"] == 50.0
+
+
+def test_get_fails_on_database_errors_instead_of_reporting_not_found(seed, monkeypatch, capsys):
+    seed(1)
+
+    def broken(name):
+        raise RuntimeError("connection reset")
+    monkeypatch.setattr(db.backend, "table", broken)
+
+    assert run(["get", "1"]) == 1
+    assert lines(capsys.readouterr().err) == [{"error": "Database error: connection reset"}]
+
+
+def test_list_fails_when_a_page_fails(seed, fail_after, capsys):
+    seed(1, 2)
+    fail_after(Marks, 1)
+
+    assert run(["list", "--json"]) == 1
+    assert lines(capsys.readouterr().err) == [{"error": "Database error: connection reset"}]
+
+
+def test_stats_fails_on_database_errors(seed, fail_after, capsys):
+    seed(1)
+    fail_after(Marks, 1)
+
+    assert run(["stats"]) == 1
+    assert lines(capsys.readouterr().err) == [{"error": "Database error: connection reset"}]
+
+
+def test_bad_usage_exits_with_status_2():
+    with pytest.raises(SystemExit) as exit_:
+        run(["frobnicate"])
+    assert exit_.value.code == 2
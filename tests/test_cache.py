@@ -0,0 +1,92 @@
+"""
+Tests for the per-rollno LRU/TTL cache and its use by the models
+"""
+from concurrent.futures import ThreadPoolExecutor
+from models.cache import LRUCache
+from models.student import Student
+
+
+def test_hits_misses_and_lru_eviction():
+    cache = LRUCache(maxsize=2, ttl=60)
+
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("b", lambda: 2)
+    assert cache.get_or_load("a", lambda: "reloaded") == 1
+    cache.get_or_load("c", lambda: 3)
+
+    # "b" was least recently used when "c" was added
+    assert cache.get_or_load("b", lambda: "reloaded") == "reloaded"
+    assert cache.stats()["hits"] == 1
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = {"now": 100.0}
+    monkeypatch.setattr("models.cache.time.monotonic", lambda: clock["now"])
+    cache = LRUCache(maxsize=10, ttl=5)
+
+    cache.get_or_load("a", lambda: 1)
+    clock["now"] += 4
+    assert cache.get_or_load("a", lambda: 2) == 1
+
+    clock["now"] += 2
+    assert cache.get_or_load("a", lambda: 2) == 2
+
+
+def test_fill_is_skipped_when_invalidated_during_the_load():
+    cache = LRUCache(maxsize=10, ttl=60)
+
+    def load_racing_a_write():
+        cache.invalidate("a")
+        return "stale"
+
+    assert cache.get_or_load("a", load_racing_a_write) == "stale"
+    assert cache.get_or_load("a", lambda: "fresh") == "fresh"
+
+
+def test_counters_add_up_under_concurrent_lookups():
+    cache = LRUCache(maxsize=8, ttl=60)
+
+    def lookups(worker):
+        for i in range(2000):
+            cache.get_or_load(i % 16, lambda: worker)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lookups, range(8)))
+
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 16000
+
+
+def test_clear_drops_everything():
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.get_or_load("a", lambda: 1)
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get_or_load("a", lambda: 2) == 2
+
+
+def test_errors_are_not_cached():
+    cache = LRUCache(maxsize=10, ttl=60)
+
+    def broken():
+        raise RuntimeError("connection reset")
+
+    try:
+        cache.get_or_load("a", broken)
+    except RuntimeError:
+        pass
+
+    assert len(cache) == 0
+    assert cache.get_or_load("a", lambda: 1) == 1
+
+
+def test_model_writes_invalidate_cached_rows(seed):
+    seed(1)
+    assert Student.get_by_rollno(1)["name"] == "STUDENT 1"
+
+    Student.update(1, name="Renamed")
+
+    assert Student.get_by_rollno(1)["name"] == "RENAMED"
@@ -0,0 +1,63 @@
+"""
+Tests for the streamed terminal tables and the interactive pager
+"""
+from utils.display import (
+    FULL_DETAILS_COLUMNS, MARK_COLUMNS, STUDENT_COLUMNS, WIDTH_SAMPLE_ROWS,
+    page_table, stream_table
+)
+
+
+def full_row(rollno, name="ASHA", marks=(55.55, 100, 0, 72.3, 60)):
+    return dict(zip(("rollno", "name", "father", "dsp", "iot", "android", "compiler", "minor"),
+                    (rollno, name, "RAVI", *marks)))
+
+
+def body_lines(output):
+    return [line for line in output.splitlines() if line.startswith("│")][1:]
+
+
+def test_marks_total_and_percentage_keep_two_decimals(capsys):
+    stream_table([full_row(1)], FULL_DETAILS_COLUMNS, "", "empty")
+
+    cells = [c.strip() for c in body_lines(capsys.readouterr().out)[0].strip("│").split("│")]
+    assert cells[3:] == ["55.55", "100.00", "0.00", "72.30", "60.00", "287.85", "57.57%"]
+
+
+def test_roll_numbers_after_the_sample_are_not_cut(capsys):
+    rows = [full_row(r) for r in range(1, WIDTH_SAMPLE_ROWS + 1)] + [full_row(2147483647)]
+
+    assert stream_table(rows, MARK_COLUMNS, "", "empty") == WIDTH_SAMPLE_ROWS + 1
+
+    lines = body_lines(capsys.readouterr().out)
+    assert "2147483647" in lines[-1]
+    assert len({len(line) for line in lines}) == 1
+
+
+def test_long_names_are_cut_with_an_ellipsis(capsys):
+    stream_table([{"rollno": 1, "name": "N" * 80, "father": "F"}], STUDENT_COLUMNS, "", "empty")
+
+    assert "…" in body_lines(capsys.readouterr().out)[0]
+
+
+def test_empty_streams_print_the_message(capsys):
+    assert stream_table(iter([]), STUDENT_COLUMNS, "title", "nothing here") == 0
+    assert "nothing here" in capsys.readouterr().out
+
+
+def test_pager_moves_by_cursor(monkeypatch, capsys):
+    data = [{"rollno": r, "name": f"S{r}", "father": "F"} for r in range(1, 8)]
+    requested = []
+
+    def fetch_page(limit, after):
+        requested.append(after)
+        rows = [r for r in data if after is None or r["rollno"] > after][:limit]
+        more = rows and rows[-1]["rollno"] < data[-1]["rollno"]
+        return rows, rows[-1]["rollno"] if more else None
+
+    commands = iter(["", "p", "j 6", "q"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(commands))
+
+    page_table(fetch_page, STUDENT_COLUMNS, "title", "empty", page_size=3)
+
+    assert requested == [None, 3, None, 5]
+    assert "Roll No. 6-7 (end)" in capsys.readouterr().out
@@ -0,0 +1,125 @@
+"""
+Tests for the change feed and how writes from elsewhere reach it
+"""
+import pytest
+from config.database import db
+from models import version
+from models.events import ChangeFeed, Subscription, change_feed, format_sse, RESET, UPDATE, DELETE
+from models.student import Student
+from models.version import data_version
+
+
+def write_elsewhere(sql, *params):
+    """Write straight to the database, as the CLI or another worker would"""
+    conn = db.backend.connection()
+    with conn:
+        conn.execute(sql, params)
+
+
+@pytest.fixture
+def subscription(monkeypatch):
+    monkeypatch.setattr(data_version, "ttl", 0)
+    with change_feed.subscribe() as subscription:
+        yield subscription
+
+
+def test_publish_without_subscribers_is_a_no_op():
+    feed = ChangeFeed()
+
+    feed.publish(UPDATE, 1)
+
+    assert feed._last_id == 0
+
+
+def test_events_are_numbered_and_reach_every_subscriber():
+    feed = ChangeFeed()
+    first, second = feed.subscribe(), feed.subscribe()
+
+    feed.publish(UPDATE, 1, {"rollno": 1, "name": "ASHA"})
+    feed.publish(DELETE, 2)
+
+    expected = [{"id": 1, "op": UPDATE, "rollno": 1, "row": {"rollno": 1, "name": "ASHA"}},
+                {"id": 2, "op": DELETE, "rollno": 2}]
+    assert first.drain() == expected
+    assert second.drain() == expected
+
+
+def test_a_subscriber_that_falls_behind_is_told_to_reset():
+    feed = ChangeFeed()
+    subscription = Subscription(feed, max_pending=3)
+    feed._subscribers.add(subscription)
+
+    for rollno in range(1, 6):
+        feed.publish(UPDATE, rollno)
+
+    assert subscription.drain() == [{"id": 4, "op": RESET}, {"id": 5, "op": UPDATE, "rollno": 5}]
+
+
+def test_a_broken_subscriber_is_dropped_without_failing_the_write():
+    feed = ChangeFeed()
+
+    def closed():
+        raise RuntimeError("event loop is closed")
+    feed.subscribe(notify=closed)
+    healthy = feed.subscribe()
+
+    feed.publish(UPDATE, 1)
+
+    assert feed.subscriber_count == 1
+    assert [event["rollno"] for event in healthy.drain()] == [1]
+
+
+def test_closed_subscriptions_stop_receiving():
+    feed = ChangeFeed()
+    with feed.subscribe() as subscription:
+        pass
+
+    feed.publish(UPDATE, 1)
+
+    assert feed.subscriber_count == 0
+    assert subscription.drain() == []
+
+
+def test_format_sse_names_reset_events():
+    assert format_sse({"id": 3, "op": RESET}) == 'id: 3\nevent: reset\ndata: {"id":3,"op":"reset"}\n\n'
+    assert format_sse({"id": 4, "op": DELETE, "rollno": 2}).startswith("id: 4\nevent: change\n")
+
+
+def test_writes_from_elsewhere_are_published_with_their_rows(seed, subscription):
+    seed(1, 2)
+    data_version.sync()
+    subscription.drain()
+
+    write_elsewhere("UPDATE students SET name = 'ASHA' WHERE rollno = 1")
+    write_elsewhere("UPDATE marks SET dsp = 99 WHERE rollno = 1")
+    write_elsewhere("DELETE FROM students WHERE rollno = 2")
+    data_version.sync()
+
+    events = subscription.drain()
+    assert [(e["op"], e["rollno"]) for e in events] == [(UPDATE, 1), (DELETE, 2)]
+    assert events[0]["row"]["name"] == "ASHA"
+    assert events[0]["row"]["dsp"] == 99
+    assert "password" not in events[0]["row"]
+
+
+def test_too_many_changes_from_elsewhere_reset_subscribers(seed, subscription, monkeypatch):
+    seed(1)
+    data_version.sync()
+    subscription.drain()
+    monkeypatch.setattr(version, "MAX_CHANGES_PER_SYNC", 1)
+
+    write_elsewhere("UPDATE students SET name = 'ASHA' WHERE rollno = 1")
+    write_elsewhere("UPDATE marks SET dsp = 99 WHERE rollno = 1")
+    data_version.sync()
+
+    assert [event["op"] for event in subscription.drain()] == [RESET]
+
+
+def test_own_writes_are_published_as_they_happen(seed, subscription):
+    seed(1)
+    data_version.sync()
+    subscription.drain()
+
+    Student.update(1, name="Asha")
+
+    assert (UPDATE, 1) in [(e["op"], e["rollno"]) for e in subscription.wait(0)]
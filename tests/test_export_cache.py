@@ -0,0 +1,99 @@
+"""
+Tests for the rendered export file cache
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.export_cache import ExportCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExportCache(str(tmp_path / "cache"), max_bytes=1024)
+
+
+def render_bytes(size, rows=1):
+    def render(path):
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        return rows
+    return render
+
+
+def test_clean_renders_are_cached(cache):
+    path = cache.get_or_render("pdf", "v1", render_bytes(10))
+
+    assert os.path.exists(path)
+    assert cache.get_or_render("pdf", "v1", render_bytes(20)) == path
+    assert cache.stats()["hits"] == 1
+
+
+def test_counters_add_up_under_concurrent_requests(cache):
+    cache.get_or_render("pdf", "v1", render_bytes(10))
+
+    def requests(_):
+        for _ in range(500):
+            cache.get_or_render("pdf", "v1", render_bytes(10))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(requests, range(8)))
+
+    assert cache.stats()["hits"] == 4000
+    assert cache.stats()["misses"] == 1
+
+
+def test_failed_render_leaves_no_file_behind(cache):
+    def broken(path):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_render("excel", "v1", broken)
+
+    assert os.listdir(cache.directory) == []
+    assert cache.get("excel", "v1") is None
+
+
+def test_empty_exports_are_not_cached(cache):
+    assert cache.get_or_render("pdf", "v1", render_bytes(10, rows=0)) is None
+    assert os.listdir(cache.directory) == []
+
+
+def test_least_recently_used_files_are_evicted(cache):
+    old = cache.get_or_render("pdf", "v1", render_bytes(600))
+    os.utime(old, (1, 1))
+
+    new = cache.get_or_render("pdf", "v2", render_bytes(600))
+
+    assert not os.path.exists(old)
+    assert os.path.exists(new)
+
+
+def test_unknown_format_is_rejected(cache):
+    with pytest.raises(ValueError):
+        cache.get_or_render("docx", "v1", render_bytes(1))
+
+
+def test_exports_are_rendered_again_after_writes_from_elsewhere(seed, tmp_path, monkeypatch):
+    from app import app
+    from config.database import db
+    from models.version import data_version
+    from utils.export_cache import export_cache
+
+    monkeypatch.setattr(export_cache, "directory", str(tmp_path / "exports"))
+    monkeypatch.setattr(data_version, "ttl", 0)
+    client = app.test_client()
+    seed(1)
+    before = export_cache.stats()
+
+    assert client.get("/api/export/pdf").status_code == 200
+    assert client.get("/api/export/pdf").status_code == 200
+    conn = db.backend.connection()
+    with conn:
+        conn.execute("UPDATE marks SET dsp = 99 WHERE rollno = 1")
+    assert client.get("/api/export/pdf").status_code == 200
+
+    after = export_cache.stats()
+    assert after["misses"] - before["misses"] == 2
+    assert after["hits"] - before["hits"] == 1
@@ -0,0 +1,122 @@
+"""
+Tests for the bounded export job pool and the routes that use it
+"""
+import threading
+import pytest
+from utils.export_cache import ExportCache
+from utils.export_jobs import ExportJobManager, ExportQueueFull, NO_DATA, export_jobs
+
+
+def rows(n):
+    return [{"rollno": i, "name": f"STUDENT {i}", "father": f"FATHER {i}",
+             "dsp": 50, "iot": 50, "android": 50, "compiler": 50, "minor": 50}
+            for i in range(1, n + 1)]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ExportJobManager(workers=1, max_pending=2, cache=ExportCache(str(tmp_path / "exports")))
+
+
+@pytest.fixture
+def gate():
+    """A row source that blocks until the gate is opened"""
+    opened = threading.Event()
+
+    def source():
+        assert opened.wait(10)
+        return rows(3)
+    source.open = opened.set
+    return source
+
+
+def test_jobs_beyond_the_workers_wait_in_the_queue(manager, gate):
+    first = manager.submit("excel", gate, "v1")
+    second = manager.submit("pdf", gate, "v1")
+
+    assert second.status == "queued"
+    gate.open()
+    assert first.wait(10) and second.wait(10)
+    assert (first.status, second.status) == ("done", "done")
+    assert first.rows == second.rows == 3
+
+
+def test_a_full_queue_refuses_new_jobs_until_one_finishes(manager, gate):
+    jobs = [manager.submit("excel", gate, "v1"), manager.submit("excel", gate, "v2")]
+
+    with pytest.raises(ExportQueueFull):
+        manager.submit("excel", gate, "v3")
+
+    gate.open()
+    for job in jobs:
+        assert job.wait(10)
+    assert manager.submit("excel", gate, "v3").wait(10)
+
+
+def test_cached_exports_finish_without_the_pool(manager):
+    manager.submit("pdf", lambda: rows(2), "v1").wait(10)
+    manager.max_pending = 0
+
+    job = manager.submit("pdf", lambda: rows(2), "v1")
+
+    assert job.ready
+    assert manager.cache.stats()["hits"] == 1
+
+
+def test_failed_and_empty_exports_report_an_error(manager):
+    def broken():
+        raise RuntimeError("connection reset")
+
+    failed = manager.submit("excel", broken, "v1")
+    empty = manager.submit("excel", lambda: [], "v2")
+
+    assert failed.wait(10) and empty.wait(10)
+    assert (failed.status, failed.error) == ("failed", "connection reset")
+    assert (empty.status, empty.error) == ("failed", NO_DATA)
+    assert manager.submit("excel", lambda: rows(1), "v3").wait(10)
+
+
+def test_unknown_formats_are_rejected(manager):
+    with pytest.raises(ValueError):
+        manager.submit("docx", lambda: rows(1), "v1")
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from app import app
+
+    monkeypatch.setattr(export_jobs, "cache", ExportCache(str(tmp_path / "exports")))
+    return app.test_client()
+
+
+def test_download_routes_render_on_the_pool(seed, client, monkeypatch):
+    seed(1, 2)
+    submitted = []
+    original = export_jobs.submit
+
+    def submit(*args):
+        job = original(*args)
+        submitted.append(job)
+        return job
+    monkeypatch.setattr(export_jobs, "submit", submit)
+
+    response = client.get("/api/export/excel")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"].endswith(".xlsx")
+    assert [job.rows for job in submitted] == [2]
+
+
+def test_download_routes_answer_429_when_the_pool_is_full(seed, client, monkeypatch):
+    seed(1)
+    monkeypatch.setattr(export_jobs, "max_pending", 0)
+
+    assert client.get("/api/export/pdf").status_code == 429
+    assert client.post("/api/exports", json={"format": "pdf"}).status_code == 429
+
+
+def test_download_routes_answer_404_without_data(client):
+    response = client.get("/api/export/pdf")
+
+    assert response.status_code == 404
+    assert response.get_json()["message"] == NO_DATA
@@ -0,0 +1,102 @@
+"""
+Tests for the streaming Excel and PDF writers
+"""
+from openpyxl import load_workbook
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from utils.export import (
+    EXCEL_HEADERS, PDF_CELL_PADDING, PDF_FONT_SIZE, _pdf_column_widths, _pdf_row,
+    write_excel, write_pdf
+)
+
+FRAME_WIDTH = A4[0] - inch
+
+
+def row(rollno, name="ASHA", father="RAVI", marks=(50, 50, 50, 50, 50)):
+    return dict(zip(("rollno", "name", "father", "dsp", "iot", "android", "compiler", "minor"),
+                    (rollno, name, father, *marks)))
+
+
+def read_excel(path):
+    workbook = load_workbook(str(path))
+    rows = list(workbook.active.iter_rows())
+    workbook.close()
+    return rows
+
+
+def test_write_excel_writes_a_bold_header_and_one_line_per_row(tmp_path):
+    path = tmp_path / "report.xlsx"
+
+    count = write_excel([row(1, marks=(85.5, 72, 60, 55.25, 91)), row(2)], str(path))
+
+    header, first, second = read_excel(path)
+    assert count == 2
+    assert [cell.value for cell in header] == EXCEL_HEADERS
+    assert all(cell.font.bold for cell in header)
+    assert [cell.value for cell in first] == [1, "ASHA", "RAVI", 85.5, 72, 60, 55.25, 91, 363.75]
+    assert second[-1].value == 250
+
+
+def test_write_excel_pulls_rows_lazily_and_reports_progress(tmp_path, monkeypatch):
+    from utils import export
+
+    monkeypatch.setattr(export, "EXCEL_PROGRESS_INTERVAL", 100)
+    pulled = []
+    seen = []
+
+    def rows():
+        for r in range(1, 251):
+            pulled.append(r)
+            yield row(r)
+
+    count = write_excel(rows(), str(tmp_path / "report.xlsx"),
+                        progress=lambda n: seen.append((n, len(pulled))))
+
+    assert count == 250
+    assert seen == [(100, 100), (200, 200)]
+    assert len(read_excel(tmp_path / "report.xlsx")) == 251
+
+
+def test_write_excel_with_no_rows_writes_only_the_header(tmp_path):
+    path = tmp_path / "report.xlsx"
+
+    assert write_excel(iter([]), str(path)) == 0
+    assert len(read_excel(path)) == 1
+
+
+def test_pdf_total_has_two_decimals():
+    assert _pdf_row(row(1, marks=(85.1, 72.3, 60.7, 55.55, 91.2)))[-1] == "364.85"
+
+
+def test_pdf_numeric_values_fit_their_columns():
+    widest = _pdf_row(row(2147483647, marks=(99.99, 99.99, 99.99, 99.99, 99.99)))
+    widths = _pdf_column_widths([widest], FRAME_WIDTH)
+
+    assert sum(widths) <= FRAME_WIDTH + 0.01
+    for i in (0, 3, 4, 5, 6, 7, 8):
+        assert stringWidth(widest[i], "Helvetica", PDF_FONT_SIZE) <= widths[i] - PDF_CELL_PADDING
+
+
+def test_pdf_widths_stay_inside_the_page_for_long_names():
+    rows = [_pdf_row(row(1, name="A" * 200, father="B" * 150))]
+
+    assert sum(_pdf_column_widths(rows, FRAME_WIDTH)) <= FRAME_WIDTH + 0.01
+
+
+def test_write_pdf_streams_every_row(tmp_path):
+    path = tmp_path / "report.pdf"
+    seen = []
+
+    count = write_pdf((row(r, name="N" * (r % 90)) for r in range(1, 301)), str(path), progress=seen.append)
+
+    assert count == 300
+    assert seen[-1] == 300
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def test_write_pdf_with_no_rows_writes_nothing(tmp_path):
+    path = tmp_path / "report.pdf"
+
+    assert write_pdf(iter([]), str(path)) == 0
+    assert not path.exists()
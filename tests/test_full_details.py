@@ -0,0 +1,46 @@
+"""
+Tests for the streamed merge join of students and marks
+"""
+import pytest
+from models.marks import Marks, merge_join
+
+
+def test_merge_join_keeps_matching_rollnos_in_order():
+    students = [{"rollno": r, "name": f"S{r}"} for r in (1, 2, 4, 6)]
+    marks = [{"rollno": r, "dsp": r * 10} for r in (2, 3, 4, 5)]
+
+    joined = list(merge_join(students, marks))
+
+    assert joined == [{"rollno": 2, "name": "S2", "dsp": 20}, {"rollno": 4, "name": "S4", "dsp": 40}]
+
+
+def test_merge_join_stops_when_either_side_runs_out():
+    assert list(merge_join([{"rollno": 1}], [])) == []
+    assert list(merge_join([], [{"rollno": 1}])) == []
+
+
+def test_iter_full_details_streams_combined_rows(seed):
+    seed(*range(1, 6))
+
+    rows = list(Marks.iter_full_details(batch_size=2, columns=Marks.DETAIL_COLUMNS))
+
+    assert [r["rollno"] for r in rows] == list(range(1, 6))
+    assert set(rows[0]) == set(Marks.DETAIL_COLUMNS)
+
+
+def test_iter_full_details_raises_instead_of_ending_early(seed, fail_after):
+    seed(*range(1, 6))
+    fail_after(Marks, 2)
+
+    with pytest.raises(RuntimeError):
+        list(Marks.iter_full_details(batch_size=2))
+
+
+def test_full_details_page_follows_the_students_cursor(seed):
+    seed(*range(1, 6))
+
+    page, cursor = Marks.fetch_full_details_page(2, 2, Marks.DETAIL_COLUMNS)
+
+    assert [r["rollno"] for r in page] == [3, 4]
+    assert cursor == 4
+    assert page[0]["dsp"] == 50.0
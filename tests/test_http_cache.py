@@ -0,0 +1,112 @@
+"""
+Tests for conditional GET (ETag / If-Modified-Since) and compression
+"""
+import time
+import pytest
+from werkzeug.http import http_date
+from config.database import db
+from models.version import data_version
+from utils import http_cache
+
+
+@pytest.fixture
+def client():
+    from app import app
+    return app.test_client()
+
+
+@pytest.fixture
+def settled(monkeypatch):
+    """Pretend the latest write happened a while ago"""
+    data_version.sync()
+    monkeypatch.setattr(data_version, "_modified", time.time() - 60)
+
+
+def test_matching_etag_is_answered_with_304(seed, client):
+    seed(1)
+    first = client.get("/api/marks")
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/marks", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+
+
+def test_a_write_changes_the_etag(seed, client):
+    seed(1)
+    etag = client.get("/api/marks").headers["ETag"]
+
+    seed(2)
+
+    response = client.get("/api/marks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_takes_precedence_over_if_modified_since(seed, client, settled):
+    seed(1)
+    data_version.sync()
+    data_version._modified = time.time() - 60
+
+    response = client.get("/api/marks", headers={
+        "If-None-Match": '"some-other-version"',
+        "If-Modified-Since": http_date(time.time())
+    })
+
+    assert response.status_code == 200
+
+
+def test_if_modified_since_matches_only_strictly_older_writes(settled):
+    token, modified = data_version.token, data_version.last_modified
+    stable = http_date(http_cache.stable_since(modified))
+
+    assert http_cache.revalidate(None, stable, token, modified, None) is not None
+    # The write's own second could also hold a later write
+    assert http_cache.revalidate(None, http_date(int(modified)), token, modified, None) is None
+
+
+def test_last_modified_is_withheld_during_the_write_second(client, monkeypatch):
+    data_version.bump()
+    monkeypatch.setattr(http_cache.time, "time", lambda: data_version.last_modified)
+
+    response = client.get("/api/marks")
+
+    assert "ETag" in response.headers
+    assert "Last-Modified" not in response.headers
+
+
+def test_last_modified_round_trips_once_settled(seed, client, settled):
+    last_modified = client.get("/api/marks").headers["Last-Modified"]
+
+    assert client.get("/api/marks", headers={"If-Modified-Since": last_modified}).status_code == 304
+    seed(1)
+    assert client.get("/api/marks", headers={"If-Modified-Since": last_modified}).status_code == 200
+
+
+@pytest.mark.parametrize("url", [
+    "/api/students", "/api/students/1", "/api/marks", "/api/full-details",
+    "/api/search?field=name&q=student", "/api/search?field=rollno&q=1"
+])
+def test_database_errors_are_500_and_never_tagged(seed, client, monkeypatch, url):
+    seed(1)
+
+    def broken(name):
+        raise RuntimeError("connection reset")
+    monkeypatch.setattr(db.backend, "table", broken)
+
+    response = client.get(url)
+
+    assert response.status_code == 500
+    assert "ETag" not in response.headers
+    assert "Last-Modified" not in response.headers
+
+
+def test_large_bodies_are_compressed(seed, client):
+    seed(*range(1, 60))
+
+    response = client.get("/api/marks?limit=50", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"].endswith('-gzip"')
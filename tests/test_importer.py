@@ -0,0 +1,119 @@
+"""
+Tests for import validation and batched bulk import
+"""
+import io
+import pandas as pd
+import pytest
+from config.database import db
+from models.marks import Marks
+from models.student import Student
+from operations.bulk_ops import bulk_import
+from utils.importer import detect_format, read_import_file, validate_import_frame
+
+
+def frame(*rows):
+    columns = ["rollno", "name", "father", "password", "dsp", "iot", "android", "compiler", "minor"]
+    return pd.DataFrame([dict(zip(columns, row)) for row in rows])
+
+
+def test_detect_format():
+    assert detect_format("students.CSV") == "csv"
+    assert detect_format("students.xlsx") == "xlsx"
+    with pytest.raises(ValueError, match="Legacy .xls"):
+        detect_format("students.xls")
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        detect_format("students.txt")
+
+
+def test_valid_rows_are_normalised():
+    records, errors = validate_import_frame(frame(("7", " Asha ", "Ravi", "pw", "80", "75", "90", "85", "88")))
+
+    assert errors == []
+    assert records == [{
+        "row": 1, "rollno": 7, "name": "Asha", "father": "Ravi", "password": "pw",
+        "dsp": 80.0, "iot": 75.0, "android": 90.0, "compiler": 85.0, "minor": 88.0
+    }]
+
+
+def test_every_problem_of_a_row_is_reported():
+    records, errors = validate_import_frame(frame(
+        ("1", "A", "F", "pw", 50, 50, 50, 50, 50),
+        ("x", "", "F", "pw", 101, 50, 50, 50, 50),
+        ("3", "C", "F", "pw", 50, 50, 50, 50, 50),
+        ("3", "D", "F", "pw", 50, 50, 50, 50, "-1"),
+    ))
+
+    assert [r["rollno"] for r in records] == [1]
+    assert errors[0] == {
+        "row": 2, "rollno": None,
+        "message": "invalid roll number; name is required; dsp must be a number between 0 and 100"
+    }
+    assert [e["row"] for e in errors] == [2, 3, 4]
+    assert "duplicate roll number in file" in errors[1]["message"]
+    assert "minor must be a number between 0 and 100" in errors[2]["message"]
+
+
+def test_missing_columns_are_rejected():
+    with pytest.raises(ValueError, match="Missing required columns: minor"):
+        validate_import_frame(frame(("1", "A", "F", "pw", 50, 50, 50, 50)))
+
+
+def test_read_csv_from_a_stream():
+    source = io.StringIO("rollno,name,father,password,dsp,iot,android,compiler,minor\n"
+                         "1,A,F,pw,50,50,50,50,50\n")
+
+    records, errors = validate_import_frame(read_import_file(source, "csv"))
+
+    assert len(records) == 1 and errors == []
+
+
+def test_bulk_import_reports_existing_and_invalid_rows(seed, make_record):
+    seed(2)
+    records = [dict(make_record(r), row=i) for i, r in enumerate((1, 2, 3), 1)]
+    invalid = [{"row": 4, "rollno": None, "message": "invalid roll number"}]
+
+    report = bulk_import(records, invalid, batch_size=2)
+
+    assert report["total"] == 4
+    assert report["inserted"] == 2
+    assert [(e["row"], e["rollno"]) for e in report["errors"]] == [(2, 2), (4, None)]
+    assert sorted(Student.existing_rollnos([1, 2, 3])) == [1, 2, 3]
+
+
+def test_a_failing_row_never_leaves_a_student_without_marks(make_record):
+    conn = db.backend.connection()
+    conn.execute(
+        "CREATE TRIGGER reject_rollno_3 BEFORE INSERT ON marks WHEN NEW.rollno = 3 "
+        "BEGIN SELECT RAISE(ABORT, 'marks rejected'); END"
+    )
+    records = [dict(make_record(r), row=r) for r in (1, 2, 3, 4)]
+
+    report = bulk_import(records, batch_size=4)
+
+    assert report["inserted"] == 3
+    assert [e["rollno"] for e in report["errors"]] == [3]
+    assert Student.existing_rollnos([1, 2, 3, 4]) == {1, 2, 4}
+    assert sorted(r["rollno"] for r in Marks.fetch_by_rollnos([1, 2, 3, 4])) == [1, 2, 4]
+
+
+def test_a_failed_batch_is_bisected_instead_of_retried_row_by_row(make_record, monkeypatch):
+    conn = db.backend.connection()
+    conn.execute(
+        "CREATE TRIGGER reject_rollno_5 BEFORE INSERT ON marks WHEN NEW.rollno = 5 "
+        "BEGIN SELECT RAISE(ABORT, 'marks rejected'); END"
+    )
+    original = Student.create_many_with_marks
+    sizes = []
+
+    def counting(records):
+        sizes.append(len(records))
+        return original(records)
+    monkeypatch.setattr(Student, "create_many_with_marks", staticmethod(counting))
+    records = [dict(make_record(r), row=r) for r in range(1, 17)]
+
+    report = bulk_import(records, batch_size=16)
+
+    assert report["inserted"] == 15
+    assert [e["rollno"] for e in report["errors"]] == [5]
+    assert "marks rejected" in report["errors"][0]["message"]
+    assert len(sizes) == 9
@@ -0,0 +1,127 @@
+"""
+Tests for the Prometheus metrics and the metered backends
+"""
+import asyncio
+import pytest
+from prometheus_client import REGISTRY
+from config.backends.aio import ThreadedAsyncBackend
+from config.backends.metered import AsyncMeteredBackend, MeteredBackend
+from config.database import db
+from utils import metrics
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def client():
+    from app import app
+    return app.test_client()
+
+
+@pytest.fixture
+def calls():
+    """Observer that records (table, operation, ok) of each database call"""
+    recorded = []
+
+    def observe(table, operation, seconds, ok):
+        assert seconds >= 0
+        recorded.append((table, operation, ok))
+    observe.calls = recorded
+    return observe
+
+
+def test_requests_are_timed_by_route(seed, client):
+    seed(1)
+    labels = {"method": "GET", "route": "/api/students/<int:rollno>", "status": "200"}
+    before = sample("studentdb_http_request_duration_seconds_count", **labels)
+
+    client.get("/api/students/1")
+    client.get("/api/students/1")
+
+    assert sample("studentdb_http_request_duration_seconds_count", **labels) == before + 2
+
+
+def test_metrics_endpoint_reports_database_calls_and_caches(seed, client):
+    db.instrument(metrics.observe_db_call)
+    seed(1)
+    before = sample("studentdb_db_query_duration_seconds_count", table="students", operation="select")
+
+    client.get("/api/students/1")
+    body = client.get("/metrics").get_data(as_text=True)
+
+    assert sample("studentdb_db_query_duration_seconds_count", table="students", operation="select") > before
+    assert 'studentdb_cache_hits_total{cache="students"}' in body
+    assert 'studentdb_cache_hit_ratio{cache="exports"}' in body
+    assert 'route="/metrics"' not in body
+
+
+def test_metered_queries_name_their_operation_and_report_errors(seed, calls):
+    seed(1)
+    backend = MeteredBackend(db.backend, calls)
+
+    backend.table("students").select("*").eq("rollno", 1).execute()
+    backend.table("marks").update({"dsp": 1}).eq("rollno", 1).execute()
+    with pytest.raises(Exception):
+        backend.table("students").insert({"rollno": 1, "name": "X", "father": "Y", "password": "pw"}).execute()
+
+    assert calls.calls == [("students", "select", True), ("marks", "update", True), ("students", "insert", False)]
+
+
+def test_async_metered_queries_are_timed_when_awaited(seed, calls):
+    seed(1)
+    backend = AsyncMeteredBackend(ThreadedAsyncBackend(db.backend), calls)
+
+    async def read():
+        query = backend.table("students").select("rollno").eq("rollno", 1)
+        assert calls.calls == []
+        return await query.execute()
+
+    assert asyncio.run(read()).data == [{"rollno": 1}]
+    assert calls.calls == [("students", "select", True)]
+
+
+class NativeBackend:
+    """Stands in for an async driver such as the async Supabase client"""
+
+    name = "native"
+
+    def __init__(self, sync_backend):
+        self.threaded = ThreadedAsyncBackend(sync_backend)
+
+    def table(self, name):
+        return self.threaded.table(name)
+
+    async def close(self):
+        pass
+
+
+def test_native_async_backends_are_metered(seed, monkeypatch, calls):
+    from config import database
+    from config.backends import aio
+
+    async def create(sync_backend):
+        return NativeBackend(sync_backend)
+    monkeypatch.setattr(aio, "create_async_backend", create)
+    monkeypatch.setattr(db, "_observer", calls)
+    adb = database.AsyncDatabase(db)
+    seed(1)
+
+    async def read():
+        backend = await adb.backend()
+        return backend, await backend.table("marks").select("rollno").execute()
+
+    backend, result = asyncio.run(read())
+    assert isinstance(backend, AsyncMeteredBackend)
+    assert result.data == [{"rollno": 1}]
+    assert calls.calls == [("marks", "select", True)]
+
+
+def test_threaded_async_backends_are_not_metered_twice(monkeypatch, calls):
+    from config import database
+
+    monkeypatch.setattr(db, "_observer", calls)
+    adb = database.AsyncDatabase(db)
+
+    assert isinstance(asyncio.run(adb.backend()), ThreadedAsyncBackend)
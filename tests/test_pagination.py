@@ -0,0 +1,69 @@
+"""
+Tests for keyset pagination and page streaming
+"""
+import pytest
+from config.database import db
+from models.marks import Marks, iter_pages
+from models.student import Student
+
+
+def test_fetch_page_walks_the_table_by_cursor(seed):
+    seed(*range(1, 6))
+
+    rows, cursor = Student.fetch_page(2, columns=Student.PUBLIC_COLUMNS)
+    assert [r["rollno"] for r in rows] == [1, 2]
+    assert cursor == 2
+    assert set(rows[0]) == set(Student.PUBLIC_COLUMNS)
+
+    rows, cursor = Student.fetch_page(2, cursor)
+    assert [r["rollno"] for r in rows] == [3, 4]
+
+    rows, cursor = Student.fetch_page(2, cursor)
+    assert [r["rollno"] for r in rows] == [5]
+    assert cursor is None
+
+
+def test_exact_multiple_ends_with_no_cursor(seed):
+    seed(1, 2)
+
+    assert Student.fetch_page(2)[1] is None
+
+
+def test_get_page_masks_errors_but_fetch_page_raises(monkeypatch):
+    def broken(name):
+        raise RuntimeError("connection reset")
+    monkeypatch.setattr(db.backend, "table", broken)
+
+    assert Student.get_page(10) == ([], None)
+    assert Marks.get_page(10) == ([], None)
+    with pytest.raises(RuntimeError):
+        Student.fetch_page(10)
+    with pytest.raises(RuntimeError):
+        Marks.fetch_page(10)
+
+
+def test_iter_pages_reads_every_page(seed):
+    seed(*range(1, 8))
+
+    rows = list(iter_pages(Student.fetch_page, batch_size=3, columns=("rollno",)))
+
+    assert [r["rollno"] for r in rows] == list(range(1, 8))
+
+
+def test_iter_pages_raises_on_a_failed_page(seed, fail_after):
+    seed(*range(1, 8))
+    fail_after(Student, 2)
+
+    with pytest.raises(RuntimeError):
+        list(iter_pages(Student.fetch_page, batch_size=3))
+
+
+def test_lookups_by_rollno(seed):
+    seed(1, 2, 3)
+
+    assert Student.fetch_by_rollno(2, Student.PUBLIC_COLUMNS) == {
+        "rollno": 2, "name": "STUDENT 2", "father": "FATHER 2"
+    }
+    assert Student.fetch_by_rollno(9) is None
+    assert sorted(r["rollno"] for r in Marks.fetch_by_rollnos([1, 3, 9])) == [1, 3]
+    assert Marks.fetch_by_rollnos([]) == []
@@ -0,0 +1,98 @@
+"""
+Tests for StudentPatch, the single-transaction student + marks update
+"""
+import pytest
+from config.database import db
+from models.marks import Marks
+from models.patch import StudentPatch
+from models.student import Student
+from models.version import data_version
+
+
+def test_set_stages_changes_per_table():
+    patch = StudentPatch(1).set(name="asha", password="pw2", dsp="75")
+
+    assert patch.student_changes == {"name": "ASHA", "password": "pw2"}
+    assert patch.marks_changes == {"dsp": 75.0}
+    assert len(patch) == 3
+
+
+@pytest.mark.parametrize("fields", [{"rollno": 2}, {"name": 123}, {"father": None}, {"dsp": "abc"}])
+def test_set_rejects_unknown_fields_and_bad_values(fields):
+    patch = StudentPatch(1)
+
+    with pytest.raises(ValueError):
+        patch.set(**fields)
+    assert not patch.pending
+
+
+def test_flush_writes_both_tables_and_refreshes_derived_state(seed):
+    seed(1, 2)
+    assert Student.search("student 1") == ([1], 1)
+    assert Marks.leaderboard()[0]["score"] == 250.0
+    before = data_version.token
+
+    row = StudentPatch(1).set(name="Asha", dsp=100).flush()
+
+    assert row["name"] == "ASHA"
+    assert row["dsp"] == 100.0
+    assert data_version.token != before
+    assert Student.get_by_rollno(1)["name"] == "ASHA"
+    assert Student.search("asha") == ([1], 1)
+    assert Marks.leaderboard()[0]["rollno"] == 1
+
+
+def test_empty_flush_does_nothing(seed):
+    seed(1)
+    before = data_version.token
+
+    assert StudentPatch(1).flush() is None
+    assert data_version.token == before
+
+
+def test_missing_student_returns_none():
+    assert StudentPatch(9).set(name="X").flush() is None
+
+
+def test_failed_flush_keeps_the_changes_for_a_retry(seed, monkeypatch):
+    seed(1)
+    patch = StudentPatch(1).set(name="Asha")
+    original = db.backend.rpc
+    failing = {"on": True}
+
+    def rpc(name, params):
+        if failing["on"]:
+            raise RuntimeError("connection reset")
+        return original(name, params)
+    monkeypatch.setattr(db.backend, "rpc", rpc)
+
+    assert patch.flush() is None
+    assert patch.pending
+
+    failing["on"] = False
+    assert patch.flush()["name"] == "ASHA"
+
+
+def test_a_student_without_marks_is_still_updated(seed):
+    seed(1)
+    db.backend.connection().execute("DELETE FROM marks WHERE rollno = 1")
+    assert Student.search("student 1") == ([1], 1)
+
+    row = StudentPatch(1).set(name="Asha", dsp=90).flush()
+
+    assert row["name"] == "ASHA"
+    assert row["dsp"] is None
+    assert Student.search("asha") == ([1], 1)
+    assert Marks.leaderboard() == []
+
+
+def test_put_returns_200_for_a_student_without_marks(seed):
+    from app import app
+
+    seed(1)
+    db.backend.connection().execute("DELETE FROM marks WHERE rollno = 1")
+
+    response = app.test_client().put("/api/students/1", json={"password": "pw", "new_name": "Asha"})
+
+    assert response.status_code == 200
+    assert response.get_json()["data"]["name"] == "ASHA"
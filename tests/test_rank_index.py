@@ -0,0 +1,150 @@
+"""
+Tests for the rank/percentile index and the leaderboard
+"""
+import threading
+import pytest
+from config.database import db
+from models import version
+from models.marks import Marks
+from models.rank_index import RankIndex, TOTAL
+from models.version import data_version
+
+SUBJECTS = ("a", "b")
+
+
+def build(*rows):
+    index = RankIndex(SUBJECTS)
+    index.build({"rollno": r, "a": a, "b": b} for r, a, b in rows)
+    return index
+
+
+def test_ties_share_a_rank_and_are_listed_by_rollno():
+    index = build((1, 90, 0), (2, 80, 0), (3, 80, 0), (4, 70, 0))
+
+    assert [(e["rollno"], e["rank"]) for e in index.top("a")] == [(1, 1), (2, 2), (3, 2), (4, 4)]
+    assert [e["rollno"] for e in index.top("a", limit=2, offset=1)] == [2, 3]
+
+
+def test_rank_and_percentile_per_ranking():
+    index = build((1, 90, 10), (2, 80, 30), (3, 70, 20), (4, 60, 40))
+
+    ranks = index.rank(3)
+
+    assert ranks["a"] == {"score": 70.0, "rank": 3, "percentile": 25.0, "out_of": 4}
+    assert ranks["b"]["rank"] == 3
+    assert ranks[TOTAL]["score"] == 90.0
+    assert ranks[TOTAL]["rank"] == 4
+    assert index.rank(99) is None
+
+
+def test_writes_rekey_single_students():
+    index = build((1, 90, 0), (2, 80, 0))
+
+    index.update(2, a=95)
+    index.add({"rollno": 3, "a": 99, "b": 0})
+    index.remove(1)
+
+    assert [e["rollno"] for e in index.top("a")] == [3, 2]
+    assert index.rank(2)["a"]["rank"] == 2
+
+
+def test_unknown_ranking_is_rejected():
+    with pytest.raises(ValueError):
+        build().top("c")
+
+
+def test_a_write_made_during_a_build_is_applied_after_it():
+    index = RankIndex(SUBJECTS)
+    writer = threading.Thread(target=index.add, args=({"rollno": 2, "a": 100, "b": 100},))
+
+    def load():
+        yield {"rollno": 1, "a": 50, "b": 50}
+        # The write commits after this row set was read, so the load misses it
+        writer.start()
+        writer.join(0.1)
+
+    index.ensure_built(load)
+    writer.join()
+
+    assert [e["rollno"] for e in index.top(TOTAL)] == [2, 1]
+
+
+def test_failed_load_leaves_the_index_unbuilt_and_retries():
+    index = RankIndex(SUBJECTS)
+
+    def broken():
+        yield {"rollno": 1, "a": 1, "b": 1}
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        index.ensure_built(broken)
+    assert not index.built
+    assert index.top("a") == []
+
+    index.ensure_built(lambda: [{"rollno": 1, "a": 1, "b": 1}])
+    assert index.built
+    assert len(index.top("a")) == 1
+
+
+def test_failed_rebuild_keeps_the_previous_rankings():
+    index = build((1, 90, 0))
+
+    def broken():
+        yield {"rollno": 2, "a": 99, "b": 0}
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        index.build(broken())
+
+    assert [e["rollno"] for e in index.top("a")] == [1]
+    assert index.rank(2) is None
+
+
+def test_leaderboard_over_the_database(seed, make_record):
+    seed(make_record(1, marks=60), make_record(2, marks=90), make_record(3, marks=75))
+
+    leaders = Marks.leaderboard(TOTAL, limit=2)
+
+    assert [(e["rollno"], e["score"], e["rank"]) for e in leaders] == [(2, 450.0, 1), (3, 375.0, 2)]
+    assert Marks.rank(1)["dsp"]["rank"] == 3
+
+
+def test_leaderboard_raises_and_stays_unbuilt_after_a_failed_page(seed, fail_after):
+    seed(1, 2)
+    calls = fail_after(Marks, 1)
+
+    with pytest.raises(RuntimeError):
+        Marks.leaderboard()
+    assert not Marks._ranks.built
+
+    calls["count"] = -10
+    assert len(Marks.leaderboard()) == 2
+
+
+def write_elsewhere(sql):
+    conn = db.backend.connection()
+    with conn:
+        conn.execute(sql)
+
+
+def test_leaderboard_follows_writes_from_elsewhere(seed, make_record, monkeypatch):
+    monkeypatch.setattr(data_version, "ttl", 0)
+    seed(make_record(1, marks=60), make_record(2, marks=90))
+    assert Marks.leaderboard()[0]["rollno"] == 2
+
+    write_elsewhere("UPDATE marks SET dsp = 100, iot = 100 WHERE rollno = 1")
+    write_elsewhere("DELETE FROM students WHERE rollno = 2")
+
+    assert [(e["rollno"], e["score"]) for e in Marks.leaderboard()] == [(1, 380.0)]
+
+
+def test_leaderboard_is_rebuilt_when_too_much_changed_elsewhere(seed, make_record, monkeypatch):
+    monkeypatch.setattr(data_version, "ttl", 0)
+    monkeypatch.setattr(version, "MAX_CHANGES_PER_SYNC", 1)
+    seed(make_record(1, marks=60))
+    assert len(Marks.leaderboard()) == 1
+
+    write_elsewhere("UPDATE marks SET dsp = 0, iot = 0")
+    seed(make_record(2, marks=90))
+
+    assert [(e["rollno"], e["score"]) for e in Marks.leaderboard()] == [(2, 450.0), (1, 180.0)]
@@ -0,0 +1,176 @@
+"""
+Tests for the trigram/prefix student search index
+"""
+import threading
+import pytest
+from config.database import db
+from models import version
+from models.search_index import StudentSearchIndex
+from models.student import Student
+from models.version import data_version
+
+
+def build(*students):
+    index = StudentSearchIndex()
+    index.build(students)
+    return index
+
+
+def test_substring_search_ranks_exact_then_prefix_then_word_then_substring():
+    index = build(
+        {"rollno": 1, "name": "ALI KHAN", "father": "X"},
+        {"rollno": 2, "name": "KHAN", "father": "X"},
+        {"rollno": 3, "name": "KHANDELWAL", "father": "X"},
+        {"rollno": 4, "name": "SHAKHAN", "father": "X"},
+        {"rollno": 5, "name": "RAVI", "father": "X"},
+    )
+
+    rollnos, total = index.search("khan")
+
+    assert rollnos == [2, 3, 1, 4]
+    assert total == 4
+
+
+def test_short_queries_match_word_prefixes():
+    index = build(
+        {"rollno": 1, "name": "ALI KARIM", "father": "X"},
+        {"rollno": 2, "name": "KAMAL", "father": "X"},
+        {"rollno": 3, "name": "MAKA", "father": "X"},
+    )
+
+    rollnos, total = index.search("ka")
+
+    assert sorted(rollnos) == [1, 2]
+    assert total == 2
+
+
+def test_trigram_hits_are_verified_as_substrings():
+    # Every trigram of "ABCD" is present in "ABC BCD" but the substring is not
+    index = build({"rollno": 1, "name": "ABC BCD", "father": "X"})
+
+    assert index.search("abcd") == ([], 0)
+
+
+def test_paging_and_father_field():
+    index = build(*({"rollno": r, "name": "SAME", "father": f"RAVI {r}"} for r in range(1, 6)))
+
+    assert index.search("ravi", "father", offset=2, limit=2) == ([3, 4], 5)
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError):
+        build().search("abc", "password")
+
+
+def test_updates_keep_the_index_in_step():
+    index = build({"rollno": 1, "name": "ALI", "father": "X"})
+
+    index.add({"rollno": 2, "name": "ALINA", "father": "X"})
+    index.update(1, name="ZED")
+    index.remove(2)
+
+    assert index.search("ali") == ([], 0)
+    assert index.search("zed") == ([1], 1)
+
+
+def test_writes_before_the_first_build_are_ignored():
+    index = StudentSearchIndex()
+
+    index.add({"rollno": 1, "name": "ALI", "father": "X"})
+
+    assert len(index) == 0
+    assert not index.built
+
+
+def test_a_write_made_during_a_build_is_applied_after_it():
+    index = StudentSearchIndex()
+    writer = threading.Thread(target=index.add, args=({"rollno": 2, "name": "ZED", "father": "X"},))
+
+    def load():
+        yield {"rollno": 1, "name": "ALI", "father": "X"}
+        # The write commits after this row set was read, so the load misses it
+        writer.start()
+        writer.join(0.1)
+
+    index.ensure_built(load)
+    writer.join()
+
+    assert index.search("zed") == ([2], 1)
+
+
+def test_failed_load_leaves_the_index_unbuilt_and_retries():
+    index = StudentSearchIndex()
+
+    def broken():
+        yield {"rollno": 1, "name": "ALI", "father": "X"}
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        index.ensure_built(broken)
+    assert not index.built
+    assert len(index) == 0
+
+    index.ensure_built(lambda: [{"rollno": 1, "name": "ALI", "father": "X"},
+                                {"rollno": 2, "name": "ALINA", "father": "X"}])
+    assert index.search("ali") == ([1, 2], 2)
+
+
+def test_failed_rebuild_keeps_the_previous_contents():
+    index = build({"rollno": 1, "name": "ALI", "father": "X"})
+
+    def broken():
+        yield {"rollno": 2, "name": "ZED", "father": "X"}
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        index.build(broken())
+
+    assert index.search("ali") == ([1], 1)
+    assert index.search("zed") == ([], 0)
+
+
+def test_student_search_surfaces_a_failed_page(seed, fail_after):
+    seed(*range(1, 6))
+    fail_after(Student, 1)
+
+    with pytest.raises(RuntimeError):
+        Student.search("student")
+
+
+def test_student_search_indexes_new_students(seed):
+    seed(1, 2)
+    assert Student.search("student 2") == ([2], 1)
+
+    seed(3)
+
+    assert Student.search("student 3") == ([3], 1)
+
+
+def write_elsewhere(sql):
+    conn = db.backend.connection()
+    with conn:
+        conn.execute(sql)
+
+
+def test_student_search_follows_writes_from_elsewhere(seed, monkeypatch):
+    monkeypatch.setattr(data_version, "ttl", 0)
+    seed(1, 2)
+    assert Student.search("student") == ([1, 2], 2)
+
+    write_elsewhere("UPDATE students SET name = 'ASHA' WHERE rollno = 1")
+    write_elsewhere("DELETE FROM students WHERE rollno = 2")
+
+    assert Student.search("asha") == ([1], 1)
+    assert Student.search("student") == ([], 0)
+
+
+def test_student_search_is_rebuilt_when_too_much_changed_elsewhere(seed, monkeypatch):
+    monkeypatch.setattr(data_version, "ttl", 0)
+    monkeypatch.setattr(version, "MAX_CHANGES_PER_SYNC", 1)
+    seed(1)
+    assert Student.search("student") == ([1], 1)
+
+    write_elsewhere("INSERT INTO students (rollno, name, father, password) "
+                    "VALUES (2, 'STUDENT 2', 'F', 'pw'), (3, 'STUDENT 3', 'F', 'pw')")
+
+    assert Student.search("student") == ([1, 2, 3], 3)
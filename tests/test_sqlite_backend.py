@@ -0,0 +1,146 @@
+"""
+Tests for the SQLite backend: query compiler, error mapping, RPCs and connections
+"""
+import gc
+import threading
+import pytest
+from config.backends import BackendError
+from config.backends.sqlite_backend import (
+    SQLiteBackend, UNIQUE_VIOLATION, FOREIGN_KEY_VIOLATION, CHECK_VIOLATION
+)
+
+MARKS = {"dsp": 50, "iot": 60, "android": 70, "compiler": 80, "minor": 90}
+
+
+def add(backend, rollno, **marks):
+    backend.rpc("create_student_with_marks", {
+        "p_rollno": rollno, "p_name": f"S{rollno}", "p_father": "F", "p_password": "pw",
+        **{f"p_{k}": v for k, v in {**MARKS, **marks}.items()}
+    }).execute()
+
+
+def test_select_compiles_filters_order_and_limit(backend):
+    query = (backend.table("students").select("rollno, name")
+             .gt("rollno", 1).lte("rollno", 9).order("rollno", desc=True).limit(3))
+
+    sql, params = query._compile()
+
+    assert sql == ("SELECT rollno, name FROM students WHERE rollno > ? AND rollno <= ? "
+                   "ORDER BY rollno DESC LIMIT 3")
+    assert params == [1, 9]
+
+
+def test_filters_select_the_right_rows(backend):
+    for rollno in range(1, 6):
+        add(backend, rollno)
+    students = backend.table("students")
+
+    assert [r["rollno"] for r in students.select("rollno").gte("rollno", 4).execute().data] == [4, 5]
+    assert [r["rollno"] for r in backend.table("students").select("rollno")
+            .in_("rollno", [2, 5, 7]).order("rollno").execute().data] == [2, 5]
+    assert backend.table("students").select("*").in_("rollno", []).execute().data == []
+
+
+def test_unknown_tables_and_columns_are_rejected(backend):
+    with pytest.raises(BackendError):
+        backend.table("teachers")
+    with pytest.raises(BackendError):
+        backend.table("students").select("rollno; DROP TABLE students")
+    with pytest.raises(BackendError):
+        backend.table("students").select("*").eq("1=1 OR rollno", 1)
+
+
+def test_writes_return_the_affected_rows(backend):
+    inserted = backend.table("students").insert(
+        [{"rollno": 1, "name": "A", "father": "F", "password": "pw"},
+         {"rollno": 2, "name": "B", "father": "F", "password": "pw"}]
+    ).execute().data
+    updated = backend.table("students").update({"name": "Z"}).eq("rollno", 2).execute().data
+    deleted = backend.table("students").delete().eq("rollno", 1).execute().data
+
+    assert [r["rollno"] for r in inserted] == [1, 2]
+    assert updated[0]["name"] == "Z"
+    assert [r["rollno"] for r in deleted] == [1]
+    assert backend.table("students").insert([]).execute().data == []
+
+
+def test_constraint_errors_carry_postgres_codes(backend):
+    add(backend, 1)
+
+    with pytest.raises(BackendError) as duplicate:
+        add(backend, 1)
+    with pytest.raises(BackendError) as orphan:
+        backend.table("marks").insert({"rollno": 9, **MARKS}).execute()
+    with pytest.raises(BackendError) as out_of_range:
+        backend.table("marks").update({"dsp": 101}).eq("rollno", 1).execute()
+
+    assert duplicate.value.code == UNIQUE_VIOLATION
+    assert "duplicate key" in str(duplicate.value)
+    assert orphan.value.code == FOREIGN_KEY_VIOLATION
+    assert out_of_range.value.code == CHECK_VIOLATION
+
+
+def test_create_student_with_marks_is_atomic(backend):
+    with pytest.raises(BackendError):
+        add(backend, 1, dsp=150)
+
+    assert backend.table("students").select("*").execute().data == []
+
+
+def test_create_students_with_marks_rolls_back_the_whole_batch(backend):
+    rows = [{"rollno": r, "name": f"S{r}", "father": "F", "password": "pw", **MARKS} for r in (1, 2, 3)]
+    rows[2]["dsp"] = -1
+
+    with pytest.raises(BackendError):
+        backend.rpc("create_students_with_marks", {"p_rows": rows}).execute()
+    assert backend.table("students").select("*").execute().data == []
+
+    backend.rpc("create_students_with_marks", {"p_rows": rows[:2]}).execute()
+    assert len(backend.table("marks").select("*").execute().data) == 2
+
+
+def test_update_student_with_marks_returns_the_combined_row(backend):
+    add(backend, 1)
+
+    row = backend.rpc("update_student_with_marks", {
+        "p_rollno": 1, "p_student": {"name": "NEW"}, "p_marks": {"iot": 99}
+    }).execute().data
+
+    assert row["name"] == "NEW"
+    assert row["iot"] == 99
+    assert row["dsp"] == MARKS["dsp"]
+    assert backend.rpc("update_student_with_marks", {
+        "p_rollno": 9, "p_student": {"name": "X"}, "p_marks": {}
+    }).execute().data is None
+
+
+def test_unknown_rpc_is_rejected(backend):
+    with pytest.raises(BackendError):
+        backend.rpc("drop_everything", {})
+
+
+def test_deleting_a_student_cascades_to_marks(backend):
+    add(backend, 1)
+
+    backend.table("students").delete().eq("rollno", 1).execute()
+
+    assert backend.table("marks").select("*").execute().data == []
+
+
+def test_thread_connections_are_closed_when_threads_exit(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "threads.db"))
+
+    def work():
+        backend.table("students").select("*").execute()
+
+    threads = [threading.Thread(target=work) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    gc.collect()
+
+    # Only the connection of this thread, opened by the constructor, remains
+    assert backend.open_connections == 1
+    backend.close()
+    assert backend.open_connections == 0
@@ -0,0 +1,56 @@
+"""
+Tests for class statistics and their per-version cache
+"""
+import numpy as np
+import pytest
+from models.marks import Marks
+from models.stats import ClassStats, compute_stats
+
+
+def test_compute_stats_per_subject_and_total():
+    marks = np.array([[30, 50, 50, 50, 50], [90, 50, 50, 50, 50]], dtype=float)
+
+    stats = compute_stats(marks, pass_mark=40)
+
+    assert stats["count"] == 2
+    assert stats["subjects"]["dsp"]["mean"] == 60.0
+    assert stats["subjects"]["dsp"]["pass_rate"] == 50.0
+    assert stats["total"]["mean"] == 260.0
+    # Failing one subject fails the student overall
+    assert stats["total"]["pass_rate"] == 50.0
+
+
+def test_empty_class():
+    assert compute_stats(np.empty((0, 5)))["total"] is None
+
+
+def test_results_are_cached_until_the_next_write(seed, make_record):
+    seed(make_record(1, marks=40))
+    first = ClassStats.compute()
+    assert ClassStats.compute() is first
+
+    seed(make_record(2, marks=80))
+
+    assert ClassStats.compute()["count"] == 2
+
+
+def test_a_failed_read_is_raised_and_never_cached(seed, fail_after):
+    seed(1, 2)
+    calls = fail_after(Marks, 1)
+
+    with pytest.raises(RuntimeError):
+        ClassStats.compute()
+    assert ClassStats.get() is None
+    assert ClassStats._result is None
+
+    calls["count"] = -10
+    assert ClassStats.get()["count"] == 2
+
+
+def test_stats_route_returns_500_on_errors(seed, fail_after):
+    from app import app
+
+    seed(1)
+    fail_after(Marks, 1)
+
+    assert app.test_client().get("/api/stats").status_code == 500
@@ -0,0 +1,127 @@
+"""
+Tests for the database-backed data version and how processes catch up on it
+"""
+import pytest
+from config.database import db
+from models import version
+from models.student import Student
+from models.version import DataVersion, data_version
+
+
+def write_elsewhere(sql, *params):
+    """Write straight to the database, as the CLI or another worker would"""
+    conn = db.backend.connection()
+    with conn:
+        conn.execute(sql, params)
+
+
+@pytest.fixture
+def no_ttl(monkeypatch):
+    monkeypatch.setattr(data_version, "ttl", 0)
+
+
+@pytest.fixture
+def listener():
+    calls = []
+    data_version.subscribe(calls.append)
+    yield calls
+    data_version._listeners.remove(calls.append)
+
+
+def test_processes_sharing_a_database_agree_on_the_token(seed):
+    seed(1)
+    other = DataVersion()
+
+    assert other.token == data_version.token
+    assert not data_version.token.startswith("unverified")
+
+
+def test_writes_from_elsewhere_change_the_token(seed, no_ttl):
+    seed(1)
+    before = data_version.token
+
+    write_elsewhere("UPDATE marks SET dsp = 99 WHERE rollno = 1")
+
+    assert data_version.token != before
+
+
+def test_the_version_is_trusted_for_the_ttl_except_after_own_writes(seed, monkeypatch):
+    monkeypatch.setattr(data_version, "ttl", 60)
+    seed(1)
+    before = data_version.token
+
+    write_elsewhere("UPDATE marks SET dsp = 99 WHERE rollno = 1")
+    assert data_version.token == before
+
+    seed(2)
+    assert data_version.token != before
+
+
+def test_listeners_get_the_roll_numbers_written(seed, no_ttl, listener):
+    seed(1, 2, 3)
+    data_version.sync()
+    listener.clear()
+
+    write_elsewhere("UPDATE students SET name = 'X' WHERE rollno = 2")
+    write_elsewhere("DELETE FROM students WHERE rollno = 3")
+    data_version.sync()
+
+    assert listener == [{2, 3}]
+
+
+def test_listeners_start_over_when_the_log_does_not_cover_the_gap(seed, no_ttl, listener, monkeypatch):
+    seed(1)
+    data_version.sync()
+    listener.clear()
+    monkeypatch.setattr(version, "MAX_CHANGES_PER_SYNC", 3)
+
+    seed(*range(2, 6))
+    data_version.sync()
+
+    assert listener == [None]
+
+
+def test_a_recreated_database_never_repeats_a_token(seed, no_ttl, tmp_path, monkeypatch):
+    from config.backends.sqlite_backend import SQLiteBackend
+
+    seed(1)
+    before = data_version.token
+    other = SQLiteBackend(str(tmp_path / "other.db"))
+    monkeypatch.setattr(db, "_backend", other)
+    seed(1)
+
+    assert data_version.token != before
+    other.close()
+
+
+def test_cached_rows_follow_writes_from_elsewhere(seed, no_ttl):
+    seed(1)
+    assert Student.fetch_by_rollno(1)["name"] == "STUDENT 1"
+
+    write_elsewhere("UPDATE students SET name = 'ASHA' WHERE rollno = 1")
+
+    assert Student.fetch_by_rollno(1)["name"] == "ASHA"
+
+
+def test_an_unreadable_version_disables_caching(seed, monkeypatch, capsys):
+    seed(1)
+    write_elsewhere("DROP TABLE data_version")
+
+    first, second = data_version.token, data_version.token
+
+    assert first.startswith("unverified") and first != second
+    assert "Error reading data version" in capsys.readouterr().out
+
+
+def test_a_poll_after_a_write_from_elsewhere_is_not_answered_304(seed, no_ttl):
+    from app import app
+
+    client = app.test_client()
+    seed(1)
+    etag = client.get("/api/marks").headers["ETag"]
+
+    write_elsewhere("UPDATE marks SET dsp = 99 WHERE rollno = 1")
+    response = client.get("/api/marks", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.get_json()["data"][0]["dsp"] == 99
@@ -5,9 +5,31 @@ from .display import (
     display_students,
     display_marks,
     display_full_details,
-    display_student_detail
+    page_students,
+    page_marks,
+    page_full_details,
+    display_student_detail,
+    display_stats
 )
-from .export import export_to_excel, export_to_pdf
+
+# Export and import helpers pull in heavy libraries, so they are resolved
+# on first attribute access instead of when the package is imported
+_LAZY = {
+    'export_to_excel': '.export',
+    'export_to_pdf': '.export',
+    'read_import_file': '.importer',
+    'validate_import_frame': '.importer'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'print_header',
@@ -15,7 +37,13 @@ __all__ = [
     'display_students',
     'display_marks',
     'display_full_details',
+    'page_students',
+    'page_marks',
+    'page_full_details',
     'display_student_detail',
+    'display_stats',
     'export_to_excel',
-    'export_to_pdf'
+    'export_to_pdf',
+    'read_import_file',
+    'validate_import_frame'
 ]
@@ -1,8 +1,19 @@
 """
 Display utilities for formatting output
 """
+from itertools import chain, islice
 from tabulate import tabulate
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Callable, Optional, Tuple, Sequence
+
+# Rows read ahead to size the text columns before the first line is printed
+WIDTH_SAMPLE_ROWS = 100
+# Longer names are cut with an ellipsis so the grid stays aligned
+MAX_TEXT_WIDTH = 32
+# Rows per screen in the interactive pager
+PAGER_PAGE_SIZE = 20
+
+# get_page(limit, after) -> (rows, next_cursor), as implemented by the models
+PageFetcher = Callable[[int, Optional[int]], Tuple[List[Dict[str, Any]], Optional[int]]]
 
 
 def print_header(title: str, width: int = 80):
@@ -17,71 +28,213 @@ def print_separator(char: str = "-", width: int = 100):
     print(char * width)
 
 
-def display_students(students: List[Dict[str, Any]]):
-    """Display student details in table format"""
-    if not students:
-        print_separator()
-        print("❌ No students found in database")
-        print_separator()
-        return
+class Column:
+    """One column of a streamed table
     
-    # Prepare data for display
-    data = [[s['rollno'], s['name'], s['father']] for s in students]
-    headers = ["Roll No.", "Name", "Father's Name"]
+    width is a fixed bound known from the schema (marks never print wider
+    than "100.00", roll numbers than the 10 digits of an INTEGER); None
+    sizes the column from the sampled rows instead.
+    """
     
-    print("\n📋 Student Details:\n")
-    print(tabulate(data, headers=headers, tablefmt="fancy_grid"))
+    def __init__(self, header: str, value: Callable[[Dict[str, Any]], Any],
+                 width: Optional[int] = None, align: str = "<"):
+        self.header = header
+        self.value = value
+        self.width = width
+        self.align = align
 
 
-def display_marks(marks_list: List[Dict[str, Any]]):
-    """Display marks details in table format"""
-    if not marks_list:
-        print_separator()
-        print("❌ No marks found in database")
-        print_separator()
-        return
+def _mark(value: Any) -> str:
+    return f"{float(value):.2f}"
+
+
+# Widest values allowed by the schema: INTEGER roll numbers, DECIMAL(5,2) marks
+ROLLNO_WIDTH = 10
+MARK_WIDTH = 6
+TOTAL_WIDTH = 6
+
+
+def _total(row: Dict[str, Any]) -> float:
+    return row['dsp'] + row['iot'] + row['android'] + row['compiler'] + row['minor']
+
+
+STUDENT_COLUMNS = [
+    Column("Roll No.", lambda r: r['rollno'], width=ROLLNO_WIDTH, align=">"),
+    Column("Name", lambda r: r['name']),
+    Column("Father's Name", lambda r: r['father'])
+]
+
+MARK_COLUMNS = [Column("Roll No.", lambda r: r['rollno'], width=ROLLNO_WIDTH, align=">")] + [
+    Column(header, lambda r, key=key: _mark(r[key]), width=MARK_WIDTH, align=">")
+    for header, key in (("DSP", "dsp"), ("IOT", "iot"), ("Android", "android"),
+                        ("Compiler", "compiler"), ("Minor", "minor"))
+]
+
+FULL_DETAILS_COLUMNS = STUDENT_COLUMNS + MARK_COLUMNS[1:] + [
+    Column("Total", lambda r: _mark(_total(r)), width=TOTAL_WIDTH, align=">"),
+    Column("Percentage", lambda r: f"{_total(r) / 5:.2f}%", width=7, align=">")
+]
+
+
+class StreamingTable:
+    """Prints a fancy_grid style table one row at a time
     
-    # Prepare data for display
-    data = [[m['rollno'], m['dsp'], m['iot'], m['android'], m['compiler'], m['minor']] 
-            for m in marks_list]
-    headers = ["Roll No.", "DSP", "IOT", "Android", "Compiler", "Minor"]
+    Column widths are fixed up front from the schema bounds or a sample of
+    rows, so nothing after the sample has to be held before it is printed.
+    """
     
-    print("\n📊 Marks Details:\n")
-    print(tabulate(data, headers=headers, tablefmt="fancy_grid"))
+    def __init__(self, columns: Sequence[Column], sample: Iterable[Dict[str, Any]]):
+        self.columns = columns
+        self.widths = [len(c.header) if c.width is None else max(len(c.header), c.width)
+                       for c in columns]
+        for row in sample:
+            for i, column in enumerate(columns):
+                if column.width is None:
+                    self.widths[i] = max(self.widths[i], len(str(column.value(row))))
+        self.widths = [min(w, max(MAX_TEXT_WIDTH, len(c.header))) for w, c in zip(self.widths, columns)]
+    
+    def _rule(self, left: str, fill: str, middle: str, right: str) -> str:
+        return left + middle.join(fill * (w + 2) for w in self.widths) + right
+    
+    def _line(self, cells: Sequence[Any], aligns: Sequence[str]) -> str:
+        parts = []
+        for text, width, align in zip(map(str, cells), self.widths, aligns):
+            if len(text) > width:
+                text = text[:width - 1] + "…"
+            parts.append(f"{text:{align}{width}}")
+        return "│ " + " │ ".join(parts) + " │"
+    
+    def print_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Print the whole grid for rows as they arrive, returning the row count"""
+        print(self._rule("╒", "═", "╤", "╕"))
+        print(self._line([c.header for c in self.columns], [c.align for c in self.columns]))
+        count = 0
+        for row in rows:
+            print(self._rule("╞", "═", "╪", "╡") if count == 0 else self._rule("├", "─", "┼", "┤"))
+            print(self._line([c.value(row) for c in self.columns], [c.align for c in self.columns]))
+            count += 1
+        print(self._rule("╘", "═", "╧", "╛"))
+        return count
 
 
-def display_full_details(full_data: List[Dict[str, Any]]):
-    """Display combined student and marks details"""
-    if not full_data:
+def stream_table(rows: Iterable[Dict[str, Any]], columns: Sequence[Column],
+                 title: str, empty_message: str) -> int:
+    """Print a table from a list or row generator without materializing it"""
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    if not sample:
         print_separator()
-        print("❌ No complete data found")
+        print(empty_message)
         print_separator()
-        return
+        return 0
     
-    # Prepare data for display with calculated totals
-    data = []
-    for item in full_data:
-        total = item['dsp'] + item['iot'] + item['android'] + item['compiler'] + item['minor']
-        percentage = (total / 500) * 100
-        
-        data.append([
-            item['rollno'],
-            item['name'],
-            item['father'],
-            item['dsp'],
-            item['iot'],
-            item['android'],
-            item['compiler'],
-            item['minor'],
-            f"{total:.1f}",
-            f"{percentage:.2f}%"
-        ])
+    print(title)
+    return StreamingTable(columns, sample).print_rows(chain(sample, rows))
+
+
+def page_table(fetch_page: PageFetcher, columns: Sequence[Column], title: str,
+               empty_message: str, page_size: int = PAGER_PAGE_SIZE):
+    """Show a keyset-paginated table one screen at a time
     
-    headers = ["Roll No.", "Name", "Father's Name", "DSP", "IOT", 
-               "Android", "Compiler", "Minor", "Total", "Percentage"]
+    fetch_page(limit, after) returns (rows, next_cursor) like the models'
+    get_page(). Only the current page is held: going back re-reads a page
+    from the cursor it started at, and a jump starts a page at the roll number.
+    """
+    cursors = [None]
+    table = None
     
-    print("\n📋 Full Student + Marks Details:\n")
-    print(tabulate(data, headers=headers, tablefmt="fancy_grid"))
+    while True:
+        rows, next_cursor = fetch_page(page_size, cursors[-1])
+        if not rows:
+            if len(cursors) == 1:
+                print_separator()
+                print(empty_message)
+                print_separator()
+                return
+            print("❌ No records from that roll number on")
+            cursors.pop()
+            continue
+        
+        if table is None:
+            print(title)
+            table = StreamingTable(columns, rows)
+        table.print_rows(rows)
+        
+        last = next_cursor is None
+        print(f"Roll No. {rows[0]['rollno']}-{rows[-1]['rollno']}" + (" (end)" if last else ""))
+        cursor = _read_pager_command(cursors, next_cursor)
+        if cursor is _QUIT:
+            return
+        if cursor is _BACK:
+            cursors.pop()
+        else:
+            cursors.append(cursor)
+
+
+# Pager commands that do not start a new page
+_QUIT = object()
+_BACK = object()
+
+
+def _read_pager_command(cursors: List[Optional[int]], next_cursor: Optional[int]) -> Any:
+    """Prompt until a valid command; returns a cursor to open, _BACK or _QUIT"""
+    while True:
+        try:
+            command = input("[Enter] next, p previous, j <roll no.> jump, q quit: ").strip().lower()
+        except EOFError:
+            return _QUIT
+        
+        if command == "q" or (command == "" and next_cursor is None):
+            return _QUIT
+        if command == "":
+            return next_cursor
+        if command == "p":
+            if len(cursors) > 1:
+                return _BACK
+            print("❌ Already at the first page")
+        elif command.startswith("j"):
+            try:
+                return int(command[1:]) - 1
+            except ValueError:
+                print("❌ Enter a roll number after j, e.g. j 42")
+        else:
+            print("❌ Invalid command")
+
+
+def display_students(students: Iterable[Dict[str, Any]]):
+    """Display student details in table format (a list or a row generator)"""
+    stream_table(students, STUDENT_COLUMNS, "\n📋 Student Details:\n",
+                 "❌ No students found in database")
+
+
+def display_marks(marks_list: Iterable[Dict[str, Any]]):
+    """Display marks details in table format (a list or a row generator)"""
+    stream_table(marks_list, MARK_COLUMNS, "\n📊 Marks Details:\n",
+                 "❌ No marks found in database")
+
+
+def display_full_details(full_data: Iterable[Dict[str, Any]]):
+    """Display combined student and marks details (a list or a row generator)"""
+    stream_table(full_data, FULL_DETAILS_COLUMNS, "\n📋 Full Student + Marks Details:\n",
+                 "❌ No complete data found")
+
+
+def page_students(fetch_page: PageFetcher):
+    """Page through student details interactively"""
+    page_table(fetch_page, STUDENT_COLUMNS, "\n📋 Student Details:\n",
+               "❌ No students found in database")
+
+
+def page_marks(fetch_page: PageFetcher):
+    """Page through marks details interactively"""
+    page_table(fetch_page, MARK_COLUMNS, "\n📊 Marks Details:\n",
+               "❌ No marks found in database")
+
+
+def page_full_details(fetch_page: PageFetcher):
+    """Page through combined student and marks details interactively"""
+    page_table(fetch_page, FULL_DETAILS_COLUMNS, "\n📋 Full Student + Marks Details:\n",
+               "❌ No complete data found")
 
 
 def display_student_detail(student: Dict[str, Any], marks: Dict[str, Any]):
@@ -103,3 +256,30 @@ def display_student_detail(student: Dict[str, Any], marks: Dict[str, Any]):
     print(f"📈 Total: {total:.1f} / 500")
     print(f"📊 Percentage: {percentage:.2f}%")
     print_separator()
+
+
+def display_stats(stats: Dict[str, Any]):
+    """Display class statistics per subject with mark distributions"""
+    if not stats or not stats['count']:
+        print_separator()
+        print("❌ No marks found in database")
+        print_separator()
+        return
+    
+    rows = [(name.upper(), s) for name, s in stats['subjects'].items()]
+    rows.append(("TOTAL", stats['total']))
+    
+    data = [[name, s['mean'], s['median'], s['std'], s['min'], s['max'], f"{s['pass_rate']:.2f}%"]
+            for name, s in rows]
+    headers = ["Subject", "Mean", "Median", "Std Dev", "Min", "Max", "Pass Rate"]
+    
+    print(f"\n📈 Class Statistics ({stats['count']} students, pass mark {stats['pass_mark']:g}):\n")
+    print(tabulate(data, headers=headers, tablefmt="fancy_grid"))
+    
+    # Distribution of marks in ten equal bands per subject
+    bins = next(iter(stats['subjects'].values()))['histogram']['bins']
+    bands = [f"{bins[i]:g}-{bins[i + 1]:g}" for i in range(len(bins) - 1)]
+    data = [[name.upper()] + s['histogram']['counts'] for name, s in stats['subjects'].items()]
+    
+    print("\n📊 Marks Distribution:\n")
+    print(tabulate(data, headers=["Subject"] + bands, tablefmt="fancy_grid"))
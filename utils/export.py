@@ -2,43 +2,68 @@
 Export utilities for generating Excel and PDF reports
 """
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
-from typing import List, Dict, Any
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+from itertools import chain, islice
+from typing import Iterable, Dict, Any, List, Callable
 
+# openpyxl and ReportLab are imported inside the writers so that importing
+# this module (and everything that depends on it) stays cheap at startup
 
-def export_to_excel(data: List[Dict[str, Any]], filename: str = None) -> bool:
-    """Export data to Excel file"""
+EXCEL_HEADERS = ["Roll No.", "Name", "Father's Name", "DSP", "IOT",
+                 "Android", "Compiler", "Minor", "Total (out of 350)"]
+EXCEL_PROGRESS_INTERVAL = 1000
+
+# Rows sampled from the head of the stream to size the PDF name columns
+PDF_WIDTH_SAMPLE = 100
+
+
+def write_excel(data: Iterable[Dict[str, Any]], filepath: str,
+                progress: Callable[[int], None] = None) -> int:
+    """Write rows to an XLSX file with a write-only worksheet
+    
+    Rows are appended as they are pulled from data, so memory stays flat
+    regardless of the number of students. Returns the number of data rows.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    
+    header_font = Font(bold=True)
+    header = []
+    for title in EXCEL_HEADERS:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = header_font
+        header.append(cell)
+    ws.append(header)
+    
+    count = 0
+    for item in data:
+        total = item['dsp'] + item['iot'] + item['android'] + item['compiler'] + item['minor']
+        ws.append([
+            item['rollno'],
+            item['name'],
+            item['father'],
+            item['dsp'],
+            item['iot'],
+            item['android'],
+            item['compiler'],
+            item['minor'],
+            total
+        ])
+        count += 1
+        if progress and count % EXCEL_PROGRESS_INTERVAL == 0:
+            progress(count)
+    
+    wb.save(filepath)
+    return count
+
+
+def export_to_excel(data: Iterable[Dict[str, Any]], filename: str = None) -> bool:
+    """Export data (a list or a row generator) to Excel file"""
     try:
-        if not data:
-            print("❌ No data available to export")
-            return False
-        
-        # Prepare DataFrame
-        df_data = []
-        for item in data:
-            total = item['dsp'] + item['iot'] + item['android'] + item['compiler'] + item['minor']
-            
-            df_data.append({
-                "Roll No.": item['rollno'],
-                "Name": item['name'],
-                "Father's Name": item['father'],
-                "DSP": item['dsp'],
-                "IOT": item['iot'],
-                "Android": item['android'],
-                "Compiler": item['compiler'],
-                "Minor": item['minor'],
-                "Total (out of 350)": total
-            })
-        
-        df = pd.DataFrame(df_data)
-        
         # Generate filename with timestamp if not provided
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -48,8 +73,11 @@ def export_to_excel(data: List[Dict[str, Any]], filename: str = None) -> bool:
         os.makedirs("exports", exist_ok=True)
         filepath = os.path.join("exports", filename)
         
-        # Export to Excel
-        df.to_excel(filepath, index=False, engine='openpyxl')
+        # Export to Excel, streaming rows straight into the worksheet
+        if write_excel(data, filepath) == 0:
+            os.remove(filepath)
+            print("❌ No data available to export")
+            return False
         
         print(f"\n✅ Data successfully exported to Excel: {filepath}")
         
@@ -69,89 +97,221 @@ def export_to_excel(data: List[Dict[str, Any]], filename: str = None) -> bool:
         return False
 
 
-def export_to_pdf(data: List[Dict[str, Any]], filename: str = None) -> bool:
-    """Export data to PDF file using ReportLab"""
-    try:
-        if not data:
-            print("❌ No data available to export")
-            return False
-        
-        # Generate filename with timestamp if not provided
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"Student_Report_{timestamp}.pdf"
-        
-        # Ensure exports directory exists
-        os.makedirs("exports", exist_ok=True)
-        filepath = os.path.join("exports", filename)
+PDF_HEADERS = ["Roll No.", "Name", "Father's Name", "DSP", "IOT",
+               "Android", "Compiler", "Minor", "Total\n(out of 350)"]
+
+# Widest value each numeric column can hold, from the schema: INTEGER roll
+# numbers and DECIMAL(5,2) marks out of 100. None marks the name columns,
+# which share the rest of the page and wrap values that do not fit.
+PDF_VALUE_BOUNDS = ["2147483647", None, None, "100.00", "100.00",
+                    "100.00", "100.00", "100.00", "500.00"]
+
+PDF_CELL_PADDING = 12  # default left + right cell padding
+PDF_FONT_SIZE = 8
+PDF_HEADER_FONT_SIZE = 10
+_pdf_table_style = None
+
+
+def _pdf_style():
+    """Table style shared by every per-page table, built on first use"""
+    global _pdf_table_style
+    if _pdf_table_style is None:
+        from reportlab.lib import colors
+        from reportlab.platypus import TableStyle
         
-        # Create PDF
-        doc = SimpleDocTemplate(filepath, pagesize=A4)
-        elements = []
-        
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        
-        # Title
-        title = Paragraph("Student Marks Report", title_style)
-        elements.append(title)
-        elements.append(Spacer(1, 0.3 * inch))
-        
-        # Prepare table data
-        table_data = [["Roll No.", "Name", "Father's Name", "DSP", "IOT", 
-                      "Android", "Compiler", "Minor", "Total (out of 350)"]]
-        
-        for item in data:
-            total = item['dsp'] + item['iot'] + item['android'] + item['compiler'] + item['minor']
-            
-            table_data.append([
-                str(item['rollno']),
-                item['name'],
-                item['father'],
-                str(item['dsp']),
-                str(item['iot']),
-                str(item['android']),
-                str(item['compiler']),
-                str(item['minor']),
-                str(total)
-            ])
-        
-        # Create table
-        table = Table(table_data, repeatRows=1)
-        
-        # Table style
-        table.setStyle(TableStyle([
+        _pdf_table_style = TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 0), (-1, 0), PDF_HEADER_FONT_SIZE),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
             ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
             ('GRID', (0, 0), (-1, -1), 1, colors.black),
             ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('FONTSIZE', (0, 1), (-1, -1), PDF_FONT_SIZE),
             ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ]))
+        ])
+    return _pdf_table_style
+
+
+def _pdf_row(item: Dict[str, Any]) -> List[str]:
+    """Format one combined record as a PDF table row"""
+    total = item['dsp'] + item['iot'] + item['android'] + item['compiler'] + item['minor']
+    return [
+        str(item['rollno']),
+        item['name'],
+        item['father'],
+        str(item['dsp']),
+        str(item['iot']),
+        str(item['android']),
+        str(item['compiler']),
+        str(item['minor']),
+        f"{total:.2f}"
+    ]
+
+
+def _pdf_column_widths(rows: List[List[str]], frame_width: float) -> List[float]:
+    """Size columns so the table always fits the page
+    
+    Numeric columns are as wide as their schema bound (or their header,
+    whichever is wider). The name columns share the rest of the frame,
+    weighted by their widest sampled values; longer values are wrapped
+    when the row is laid out.
+    """
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    
+    headers = [max(stringWidth(line, 'Helvetica-Bold', PDF_HEADER_FONT_SIZE) for line in h.split("\n"))
+               for h in PDF_HEADERS]
+    widths = []
+    for i, bound in enumerate(PDF_VALUE_BOUNDS):
+        if bound is None:
+            values = [stringWidth(row[i], 'Helvetica', PDF_FONT_SIZE) for row in rows]
+        else:
+            values = [stringWidth(bound, 'Helvetica', PDF_FONT_SIZE)]
+        widths.append(max([headers[i]] + values) + PDF_CELL_PADDING)
+    
+    # Name columns keep room for their header and split the rest by how much
+    # wider than it their sampled values are
+    text_columns = [i for i, bound in enumerate(PDF_VALUE_BOUNDS) if bound is None]
+    minimums = {i: headers[i] + PDF_CELL_PADDING for i in text_columns}
+    room = frame_width - sum(w for i, w in enumerate(widths) if i not in text_columns)
+    spare = room - sum(minimums.values())
+    excess = {i: widths[i] - minimums[i] for i in text_columns}
+    total_excess = sum(excess.values())
+    for i in text_columns:
+        share = excess[i] / total_excess if total_excess else 1 / len(text_columns)
+        widths[i] = minimums[i] + spare * share
+    return widths
+
+
+def write_pdf(data: Iterable[Dict[str, Any]], filepath: str,
+              progress: Callable[[int], None] = None) -> int:
+    """Write rows to a PDF file one page-sized table at a time
+    
+    Rows are pulled from data as each page is laid out, every page gets its
+    own small Table sharing one TableStyle, and finished pages are flushed
+    to the canvas, so nothing ever lays out (or re-splits) the full dataset.
+    Column widths are fixed by _pdf_column_widths; a name too long for its
+    column wraps onto extra lines and its row grows to match. Returns the
+    number of data rows.
+    """
+    from xml.sax.saxutils import escape
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.pdfgen import canvas
+    from reportlab.platypus import Table, Paragraph
+    
+    rows = (_pdf_row(item) for item in data)
+    first_page = list(islice(rows, PDF_WIDTH_SAMPLE))
+    if not first_page:
+        return 0
+    rows = chain(first_page, rows)
+    
+    page_width, page_height = A4
+    margin = inch / 2
+    frame_width = page_width - 2 * margin
+    col_widths = _pdf_column_widths(first_page, frame_width)
+    table_style = _pdf_style()
+    
+    cell_style = ParagraphStyle('PdfCell', fontName='Helvetica', fontSize=PDF_FONT_SIZE,
+                                leading=PDF_FONT_SIZE + 2, alignment=1)
+    header = PDF_HEADERS
+    text_columns = [i for i, bound in enumerate(PDF_VALUE_BOUNDS) if bound is None]
+    inner_widths = [w - PDF_CELL_PADDING for w in col_widths]
+    
+    # Single-line rows all have the same height; measure it once
+    header_height = Table([header], colWidths=col_widths, style=table_style).wrap(0, 0)[1]
+    row_height = Table([header, first_page[0]], colWidths=col_widths,
+                       style=table_style).wrap(0, 0)[1] - header_height
+    
+    def layout(row: List[str]):
+        """Wrap names that overflow their column; return (cells, row height)"""
+        extra = 0
+        for i in text_columns:
+            value = row[i]
+            if stringWidth(value, 'Helvetica', PDF_FONT_SIZE) > inner_widths[i]:
+                cell = Paragraph(escape(value), cell_style)
+                extra = max(extra, cell.wrap(inner_widths[i], page_height)[1] - cell_style.leading)
+                row[i] = cell
+        return row, row_height + extra
+    
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=30,
+        alignment=1  # Center
+    )
+    
+    c = canvas.Canvas(filepath, pagesize=A4)
+    
+    # Title
+    title = Paragraph("Student Marks Report", title_style)
+    title_height = title.wrap(frame_width, page_height)[1]
+    title.drawOn(c, margin, page_height - margin - title_height)
+    top = page_height - margin - title_height - title_style.spaceAfter - 0.3 * inch
+    
+    laid_out = (layout(row) for row in rows)
+    pending = next(laid_out, None)
+    count = 0
+    while pending is not None:
+        # Fill the page while rows fit (at least one row per page)
+        room = top - margin - header_height
+        chunk = []
+        while pending is not None and (not chunk or pending[1] <= room):
+            chunk.append(pending[0])
+            room -= pending[1]
+            pending = next(laid_out, None)
         
-        elements.append(table)
+        table = Table([header] + chunk, colWidths=col_widths, style=table_style)
+        table_width, table_height = table.wrap(frame_width, top - margin)
+        table.drawOn(c, margin + (frame_width - table_width) / 2, top - table_height)
+        top -= table_height
         
-        # Add footer
-        elements.append(Spacer(1, 0.5 * inch))
-        footer_text = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        footer = Paragraph(footer_text, styles['Normal'])
-        elements.append(footer)
+        count += len(chunk)
+        if progress:
+            progress(count)
         
-        # Build PDF
-        doc.build(elements)
+        if pending is not None:
+            c.showPage()
+            top = page_height - margin
+    
+    # Footer
+    footer_text = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    footer = Paragraph(footer_text, styles['Normal'])
+    footer_height = footer.wrap(frame_width, page_height)[1]
+    if top - 0.5 * inch - footer_height < margin:
+        c.showPage()
+        top = page_height - margin
+    footer.drawOn(c, margin, top - 0.5 * inch - footer_height)
+    
+    c.save()
+    return count
+
+
+def export_to_pdf(data: Iterable[Dict[str, Any]], filename: str = None) -> bool:
+    """Export data (a list or a row generator) to PDF file using ReportLab"""
+    try:
+        # Generate filename with timestamp if not provided
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"Student_Report_{timestamp}.pdf"
+        
+        # Ensure exports directory exists
+        os.makedirs("exports", exist_ok=True)
+        filepath = os.path.join("exports", filename)
+        
+        # Build PDF page by page from the row stream
+        if write_pdf(data, filepath) == 0:
+            print("❌ No data available to export")
+            return False
         
         print(f"\n✅ Data successfully exported to PDF: {filepath}")
         
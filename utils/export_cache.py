@@ -0,0 +1,159 @@
+"""
+Content-addressed, size-capped cache of rendered export files
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Cache location and byte cap, overridable from .env
+EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR", os.path.join("exports", "cache"))
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+EXTENSIONS = {"excel": ".xlsx", "pdf": ".pdf"}
+
+
+class ExportCache:
+    """Keeps one rendered file per (format, data version) with LRU eviction
+
+    Files are named by a hash of their key; a file's mtime records its last
+    use, and the least recently used files are deleted once the directory
+    exceeds max_bytes.
+    """
+
+    def __init__(self, directory: str = EXPORT_CACHE_DIR, max_bytes: int = EXPORT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        # Optional hook called as on_render(fmt, seconds, rows) after each render
+        self.on_render: Optional[Callable[[str, float, int], None]] = None
+
+    @staticmethod
+    def key(fmt: str, version: str) -> str:
+        """Cache key for an export of the given data version"""
+        return hashlib.sha256(f"{fmt}:{version}".encode()).hexdigest()
+
+    def path(self, fmt: str, version: str) -> str:
+        """Location of the cached file for a key"""
+        return os.path.join(self.directory, self.key(fmt, version) + EXTENSIONS[fmt])
+
+    def get(self, fmt: str, version: str) -> Optional[str]:
+        """Return the cached file path, marking it recently used, or None"""
+        path = self.path(fmt, version)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def lookup(self, fmt: str, version: str) -> Optional[str]:
+        """Like get, but counted as a cache hit when the file exists"""
+        path = self.get(fmt, version)
+        if path:
+            self._count(hit=True)
+        return path
+
+    def get_or_render(self, fmt: str, version: str, render: Callable[[str], int]) -> Optional[str]:
+        """Return the cached file, calling render(path) to create it on a miss
+
+        render must write the file and return the number of rows, and must
+        raise if its row stream fails part-way (as the models' streams do).
+        A file is only cached once render has returned cleanly: on an error
+        the partial file is deleted and the error raised, and when no rows
+        were written nothing is cached and None is returned.
+        """
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        path = self.lookup(fmt, version)
+        if path:
+            return path
+
+        # One render per key; concurrent requests for the same export wait for it
+        with self._lock:
+            key_lock = self._key_locks.setdefault(self.key(fmt, version), threading.Lock())
+
+        with key_lock:
+            path = self.lookup(fmt, version)
+            if path:
+                return path
+
+            self._count(hit=False)
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=EXTENSIONS[fmt] + ".tmp", dir=self.directory)
+            os.close(fd)
+            path = None
+            try:
+                started = time.perf_counter()
+                rows = render(tmp_path)
+                if self.on_render:
+                    self.on_render(fmt, time.perf_counter() - started, rows)
+                if rows == 0:
+                    return None
+                os.replace(tmp_path, self.path(fmt, version))
+                path = self.path(fmt, version)
+            finally:
+                # Anything short of a clean, non-empty render (including
+                # KeyboardInterrupt) leaves no file behind
+                if path is None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                with self._lock:
+                    self._key_locks.pop(self.key(fmt, version), None)
+
+        self.evict(keep=path)
+        return path
+
+    def _count(self, hit: bool):
+        """Record a lookup; request threads share the counters"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def evict(self, keep: str = None):
+        """Delete least recently used files until the cache fits max_bytes"""
+        with self._lock:
+            try:
+                names = os.listdir(self.directory)
+            except OSError:
+                return
+
+            entries = []
+            total = 0
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                full = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(full)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, full))
+                total += stat.st_size
+
+            entries.sort()
+            for _, size, full in entries:
+                if total <= self.max_bytes:
+                    break
+                if full == keep:
+                    continue
+                try:
+                    os.remove(full)
+                    total -= size
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "max_bytes": self.max_bytes}
+
+
+# Global export cache instance
+export_cache = ExportCache()
@@ -0,0 +1,162 @@
+"""
+Background export jobs rendered on a bounded worker pool
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from utils.export import write_excel, write_pdf
+from utils.export_cache import ExportCache, export_cache
+
+# Pool sizing, overridable from .env
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "2"))
+EXPORT_MAX_PENDING = int(os.getenv("EXPORT_MAX_PENDING", "8"))
+EXPORT_JOB_TTL_SECONDS = int(os.getenv("EXPORT_JOB_TTL_SECONDS", "3600"))
+
+# Error of a job whose export had no rows to render
+NO_DATA = "No data available to export"
+
+EXPORT_FORMATS = {
+    "excel": (".xlsx", write_excel),
+    "pdf": (".pdf", write_pdf)
+}
+
+
+class ExportQueueFull(Exception):
+    """Raised when the export pool already has its maximum number of jobs"""
+
+
+class ExportJob:
+    """State of one export job"""
+
+    def __init__(self, fmt: str, version: str):
+        self.id = uuid.uuid4().hex
+        self.version = version
+        self.format = fmt
+        self.status = "queued"
+        self.rows = 0
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self._done = threading.Event()
+
+        extension = EXPORT_FORMATS[fmt][0]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.filename = f"Student_Report_{timestamp}{extension}"
+        self.filepath = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "done" and os.path.exists(self.filepath)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job has finished; False if it is still running after timeout"""
+        return self._done.wait(timeout)
+
+    def finish(self, status: str, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+        self.finished = time.time()
+        self._done.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job state to a JSON-friendly dictionary"""
+        return {
+            "id": self.id,
+            "format": self.format,
+            "status": self.status,
+            "rows": self.rows,
+            "error": self.error,
+            "filename": self.filename,
+            "created": datetime.fromtimestamp(self.created).isoformat(),
+            "finished": datetime.fromtimestamp(self.finished).isoformat() if self.finished else None
+        }
+
+
+class ExportJobManager:
+    """Runs exports on a fixed-size thread pool with a cap on queued jobs
+
+    Rendered files live in the export cache, so a job for data that has
+    already been exported completes immediately without touching the pool.
+    """
+
+    def __init__(self, workers: int = EXPORT_WORKERS, max_pending: int = EXPORT_MAX_PENDING,
+                 ttl: int = EXPORT_JOB_TTL_SECONDS, cache: ExportCache = export_cache):
+        self.cache = cache
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._workers = workers
+        self._executor = None
+        self._jobs: Dict[str, ExportJob] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fmt: str, source: Callable[[], Iterable[Dict[str, Any]]],
+               version: str) -> ExportJob:
+        """Queue an export of the rows produced by source() at a data version"""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        self._prune()
+
+        cached = self.cache.lookup(fmt, version)
+        if cached:
+            job = ExportJob(fmt, version)
+            job.filepath = cached
+            job.finish("done")
+            with self._lock:
+                self._jobs[job.id] = job
+            return job
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ExportQueueFull("Too many exports in progress, please try again shortly")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers,
+                                                    thread_name_prefix="export")
+            job = ExportJob(fmt, version)
+            self._jobs[job.id] = job
+            self._pending += 1
+
+        self._executor.submit(self._run, job, source)
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """Look up a job by id"""
+        return self._jobs.get(job_id)
+
+    def _run(self, job: ExportJob, source: Callable[[], Iterable[Dict[str, Any]]]):
+        job.status = "running"
+        status, error = "done", None
+        try:
+            writer = EXPORT_FORMATS[job.format][1]
+
+            def render(path: str) -> int:
+                job.rows = writer(source(), path, progress=lambda n: setattr(job, "rows", n))
+                return job.rows
+
+            job.filepath = self.cache.get_or_render(job.format, job.version, render)
+            if job.filepath is None:
+                status, error = "failed", NO_DATA
+        except Exception as e:
+            status, error = "failed", str(e)
+        finally:
+            with self._lock:
+                self._pending -= 1
+            job.finish(status, error)
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL (their files stay in the cache)"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [j for j in self._jobs.values() if j.finished and j.finished < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+
+
+# Global export job manager
+export_jobs = ExportJobManager()
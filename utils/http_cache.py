@@ -0,0 +1,132 @@
+"""
+Conditional GET and response compression for the read API
+
+Responses are tagged with the data version kept in the database, so a
+poll that finds nothing changed is answered with 304 after one small
+version read (at most one per DATA_VERSION_TTL_SECONDS) instead of the
+full query. Bodies that do change are gzip- or, when the brotli package
+is installed, brotli-compressed for clients that accept it.
+"""
+import gzip
+import math
+import os
+import time
+from functools import wraps
+from typing import Dict, Optional, Tuple
+from flask import make_response, request
+from werkzeug.http import http_date, parse_accept_header, parse_date, parse_etags, quote_etag
+from models.version import data_version
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Encodings offered to clients, most preferred first
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick a content coding from an Accept-Encoding header (None for identity)"""
+    accepted = parse_accept_header(accept_encoding)
+    for encoding in ENCODINGS:
+        if accepted.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def entity_tag(token: str, encoding: Optional[str]) -> str:
+    """Strong ETag of a representation; each content coding gets its own"""
+    return f"{token}-{encoding}" if encoding else token
+
+
+def stable_since(modified: float) -> float:
+    """First whole second at which data last written at `modified` is known unchanged"""
+    return math.floor(modified) + 1
+
+
+def cache_headers(token: str, modified: float, encoding: Optional[str]) -> Dict[str, str]:
+    """Validator headers; no-cache makes clients revalidate on every poll
+
+    HTTP dates have one-second resolution, so Last-Modified names the end of
+    the second of the latest write and is only sent once that second is
+    over; until then another write could land under the same date.
+    """
+    headers = {
+        "ETag": quote_etag(entity_tag(token, encoding)),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if time.time() >= stable_since(modified):
+        headers["Last-Modified"] = http_date(stable_since(modified))
+    return headers
+
+
+def revalidate(if_none_match: Optional[str], if_modified_since: Optional[str],
+               token: str, modified: float, encoding: Optional[str]) -> Optional[Dict[str, str]]:
+    """Headers for a 304 response if the client's copy is current, else None
+
+    If-None-Match takes precedence over If-Modified-Since, as in RFC 9110.
+    A date only matches when the latest write is strictly older than it.
+    """
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        # A body is identical for the same URL and data version, so
+        # whichever coding the client holds is still what we would send
+        for candidate in (encoding, None):
+            if etags.contains(entity_tag(token, candidate)):
+                return cache_headers(token, modified, candidate)
+        return None
+
+    since = parse_date(if_modified_since)
+    if since is not None and modified < since.timestamp():
+        headers = cache_headers(token, modified, encoding)
+        del headers["ETag"]
+        return headers
+    return None
+
+
+def encode(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress a body if it is large enough, returning it and the coding used"""
+    if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY), encoding
+    return gzip.compress(body, compresslevel=GZIP_LEVEL), encoding
+
+
+def conditional(view):
+    """Serve a read-only GET view with data-version validators and compression
+
+    The version is read before the view runs, so a write that lands while
+    the body is being built only makes the next poll refetch needlessly.
+    Only 200 responses are tagged, so the view must let database errors
+    surface as a 5xx rather than as an empty 200 that clients would keep.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token, modified = data_version.current()
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"))
+
+        headers = revalidate(request.headers.get("If-None-Match"),
+                             request.headers.get("If-Modified-Since"),
+                             token, modified, encoding)
+        if headers is not None:
+            return "", 304, headers
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200:
+            return response
+
+        body, encoding = encode(response.get_data(), encoding)
+        if encoding:
+            response.set_data(body)
+            response.headers["Content-Encoding"] = encoding
+        response.headers.update(cache_headers(token, modified, encoding))
+        return response
+    return wrapper
@@ -0,0 +1,100 @@
+"""
+Import utilities for reading and validating bulk student files
+"""
+import os
+from typing import Any, Dict, List, Tuple, Union, IO, TYPE_CHECKING
+
+# pandas is imported on first use to keep it out of application startup
+if TYPE_CHECKING:
+    import pandas as pd
+
+SUBJECTS = ["dsp", "iot", "android", "compiler", "minor"]
+TEXT_COLUMNS = ["name", "father", "password"]
+REQUIRED_COLUMNS = ["rollno"] + TEXT_COLUMNS + SUBJECTS
+
+SUPPORTED_FORMATS = ("csv", "xlsx", "json")
+
+
+def detect_format(filename: str) -> str:
+    """Infer the import format from a file name"""
+    ext = os.path.splitext(filename)[1].lower().lstrip(".")
+    if ext == "xls":
+        raise ValueError("Legacy .xls files are not supported. Save the sheet as .xlsx "
+                         "(File > Save As > Excel Workbook) and import that instead")
+    if ext not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file type '{ext}'. Use one of: {', '.join(SUPPORTED_FORMATS)}")
+    return ext
+
+
+def read_import_file(source: Union[str, IO], fmt: str = None) -> "pd.DataFrame":
+    """Read a CSV, XLSX or JSON file (path or file object) into a DataFrame"""
+    import pandas as pd
+
+    if fmt is None:
+        fmt = detect_format(source if isinstance(source, str) else getattr(source, "name", ""))
+
+    if fmt == "csv":
+        return pd.read_csv(source, dtype=str, keep_default_na=False)
+    if fmt == "xlsx":
+        return pd.read_excel(source, dtype=str, engine="openpyxl").fillna("")
+    if fmt == "json":
+        return pd.read_json(source, dtype=False)
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def validate_import_frame(df: "pd.DataFrame") -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Validate every row at once, returning (clean records, row errors)
+
+    Row numbers in errors are 1-based positions of the data rows.
+    """
+    import pandas as pd
+
+    df = df.rename(columns=lambda c: str(c).strip().lower())
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    df = df.reset_index(drop=True)
+    problems = pd.Series("", index=df.index)
+
+    rollno = pd.to_numeric(df["rollno"], errors="coerce")
+    bad_rollno = rollno.isna() | (rollno % 1 != 0) | (rollno <= 0)
+    problems[bad_rollno] += "invalid roll number; "
+
+    duplicated = rollno.duplicated(keep=False) & ~bad_rollno
+    problems[duplicated] += "duplicate roll number in file; "
+
+    text = {}
+    for column in TEXT_COLUMNS:
+        text[column] = df[column].fillna("").astype(str).str.strip()
+        problems[text[column] == ""] += f"{column} is required; "
+
+    marks = {}
+    for subject in SUBJECTS:
+        marks[subject] = pd.to_numeric(df[subject], errors="coerce")
+        out_of_range = marks[subject].isna() | (marks[subject] < 0) | (marks[subject] > 100)
+        problems[out_of_range] += f"{subject} must be a number between 0 and 100; "
+
+    invalid = problems != ""
+    errors = [
+        {
+            "row": int(i) + 1,
+            "rollno": None if pd.isna(rollno[i]) else int(rollno[i]),
+            "message": problems[i].rstrip("; ")
+        }
+        for i in df.index[invalid]
+    ]
+
+    valid = ~invalid
+    clean = pd.DataFrame({
+        "row": df.index[valid] + 1,
+        "rollno": rollno[valid].astype(int),
+        **{column: text[column][valid] for column in TEXT_COLUMNS},
+        **{subject: marks[subject][valid].astype(float) for subject in SUBJECTS}
+    })
+    records = clean.to_dict("records")
+    for record in records:
+        record["row"] = int(record["row"])
+        record["rollno"] = int(record["rollno"])
+
+    return records, errors
@@ -0,0 +1,107 @@
+"""
+Prometheus metrics for the web application
+"""
+import time
+from typing import Iterator
+from flask import Flask, Response, g, request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from config.database import db
+from models.student import Student
+from models.marks import Marks
+from utils.export_cache import export_cache
+
+REQUEST_DURATION = Histogram(
+    "studentdb_http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route", "status"]
+)
+DB_DURATION = Histogram(
+    "studentdb_db_query_duration_seconds",
+    "Time spent in database calls",
+    ["table", "operation"],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+)
+DB_ERRORS = Counter(
+    "studentdb_db_query_errors_total",
+    "Database calls that raised an error",
+    ["table", "operation"]
+)
+EXPORT_DURATION = Histogram(
+    "studentdb_export_render_duration_seconds",
+    "Time spent rendering export files (cache misses only)",
+    ["format"],
+    buckets=(.1, .25, .5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+EXPORT_ROWS = Counter(
+    "studentdb_export_rows_total",
+    "Rows written to rendered export files",
+    ["format"]
+)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    """Record one handled HTTP request"""
+    REQUEST_DURATION.labels(method, route, status).observe(seconds)
+
+
+def observe_db_call(table: str, operation: str, seconds: float, ok: bool):
+    """Record one database call"""
+    DB_DURATION.labels(table, operation).observe(seconds)
+    if not ok:
+        DB_ERRORS.labels(table, operation).inc()
+
+
+def observe_export(fmt: str, seconds: float, rows: int):
+    """Record one rendered export"""
+    EXPORT_DURATION.labels(fmt).observe(seconds)
+    EXPORT_ROWS.labels(fmt).inc(rows or 0)
+
+
+class CacheCollector:
+    """Reads cache counters at scrape time, so lookups pay nothing extra"""
+
+    def collect(self) -> Iterator:
+        caches = {
+            "students": Student.cache_stats(),
+            "marks": Marks.cache_stats(),
+            "exports": export_cache.stats()
+        }
+
+        hits = CounterMetricFamily("studentdb_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("studentdb_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("studentdb_cache_hit_ratio", "Share of lookups served from cache",
+                                  labels=["cache"])
+        for name, stats in caches.items():
+            lookups = stats["hits"] + stats["misses"]
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hits"] / lookups if lookups else 0.0)
+        yield hits
+        yield misses
+        yield ratio
+
+
+def init_app(app: Flask):
+    """Time every request, instrument the database and serve /metrics"""
+    db.instrument(observe_db_call)
+    export_cache.on_render = observe_export
+    REGISTRY.register(CacheCollector())
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("metrics_start", None)
+        if started is not None and request.endpoint != "metrics":
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            observe_request(request.method, route, response.status_code, time.perf_counter() - started)
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        """Prometheus scrape endpoint"""
+        return Response(generate_latest(REGISTRY), mimetype=CONTENT_TYPE_LATEST)